@@ -2,12 +2,17 @@ import requests
 import json
 import logging
 from django.conf import settings
-from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
 
+from estetica_frontend import backend
+from estetica_frontend.jsoncodec import JsonResponse
+from estetica_frontend.bootstrap import usuario_actual, con_usuario
+from estetica_frontend.precarga import precargar
+from estetica_frontend.ratelimit import rate_limit
+
 logger = logging.getLogger(__name__)
 
 def get_fastapi_url(endpoint):
@@ -19,6 +24,7 @@ def is_authenticated(request):
     return request.session.get('access_token') is not None
 
 # Vistas para páginas HTML
+@precargar('css/auth/login.css', 'js/auth/login.js')
 def login_page(request):
     """Página de login"""
     if is_authenticated(request):
@@ -43,15 +49,18 @@ def change_password_page(request):
         return redirect('authentication:login_page')
     return render(request, 'auth/change_password.html')
 
+@precargar('css/auth/dashboard.css', 'js/bootstrap.js', 'js/auth/dashboard.js')
 def dashboard_page(request):
     """Página principal del dashboard (requiere autenticación)"""
     if not is_authenticated(request):
         return redirect('authentication:login_page')
-    return render(request, 'auth/dashboard.html')
+    bootstrap = con_usuario({}, usuario_actual(request.session.get('access_token')))
+    return render(request, 'auth/dashboard.html', {'bootstrap': bootstrap})
 
 # Vistas para API (con URLs corregidas)
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limit('register')
 def register(request):
     """Registrar nuevo usuario"""
     try:
@@ -65,7 +74,7 @@ def register(request):
                     status=400
                 )
         
-        response = requests.post(
+        response = backend.post(
             get_fastapi_url('/register'),
             json=data, 
             timeout=10
@@ -83,6 +92,7 @@ def register(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limit('login')
 def login_view(request):
     """Iniciar sesión y obtener token"""
     try:
@@ -94,7 +104,7 @@ def login_view(request):
                 status=400
             )
         
-        response = requests.post(
+        response = backend.post(
             get_fastapi_url('/login'),
             json=data, 
             timeout=10
@@ -125,7 +135,7 @@ def logout_view(request):
         if not token:
             return JsonResponse({'detail': 'No autenticado'}, status=401)
         
-        response = requests.post(
+        response = backend.post(
             get_fastapi_url('/logout'),
             headers={'Authorization': f'Bearer {token}'},
             timeout=10
@@ -152,7 +162,7 @@ def get_current_user(request):
         if not token:
             return JsonResponse({'detail': 'No autenticado'}, status=401)
         
-        response = requests.get(
+        response = backend.get(
             get_fastapi_url('/me'),
             headers={'Authorization': f'Bearer {token}'},
             timeout=10
@@ -185,7 +195,7 @@ def change_password(request):
                     status=400
                 )
         
-        response = requests.put(
+        response = backend.put(
             get_fastapi_url('/change-password'),
             json=data,
             headers={'Authorization': f'Bearer {token}'},
@@ -204,6 +214,7 @@ def change_password(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limit('forgot_password')
 def forgot_password(request):
     """Solicitar código de recuperación de contraseña"""
     try:
@@ -213,7 +224,7 @@ def forgot_password(request):
             return JsonResponse({'detail': 'Email es requerido'}, status=400)
         
         # CORREGIDO: Usar guión en lugar de guión bajo
-        response = requests.post(
+        response = backend.post(
             get_fastapi_url('/forgot-password'),  # Cambiado de /forgot_password a /forgot-password
             json=data,
             timeout=10
@@ -231,6 +242,7 @@ def forgot_password(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limit('reset_password')
 def reset_password(request):
     """Restablecer contraseña usando código de recuperación"""
     try:
@@ -245,7 +257,7 @@ def reset_password(request):
                 )
         
         # Este endpoint SÍ espera JSON body (a diferencia de verify-reset-code)
-        response = requests.post(
+        response = backend.post(
             get_fastapi_url('/reset-password'),
             json=data,
             timeout=10
@@ -263,6 +275,7 @@ def reset_password(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limit('verify_reset_code')
 def verify_reset_code(request):
     """Verificar si un código de recuperación es válido"""
     try:
@@ -275,7 +288,7 @@ def verify_reset_code(request):
             )
         
         # Enviar como query parameters en lugar de JSON body
-        response = requests.post(
+        response = backend.post(
             get_fastapi_url('/verify-reset-code'),
             params={
                 'email': data['email'],
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class EsteticaFrontendConfig(AppConfig):
+    name = 'estetica_frontend'
+    verbose_name = 'Estética Frontend'
+
+    def ready(self):
+        # Con gunicorn/uvicorn el warmup lo lanzan wsgi.py/asgi.py
+        from estetica_frontend import warmup
+        if warmup.es_servidor_de_desarrollo():
+            warmup.iniciar()
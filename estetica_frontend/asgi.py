@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'estetica_frontend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# 103 Early Hints con los estáticos de la página si el servidor lo soporta, y
+# cancelación del trabajo pendiente cuando el cliente se desconecta
+from estetica_frontend.cancelacion import Desconexiones  # noqa: E402
+from estetica_frontend.precarga import EarlyHints  # noqa: E402
+
+application = EarlyHints(Desconexiones(django_application))
+
+# Calienta conexiones, templates y cachés antes de marcar el proceso como listo
+from estetica_frontend import warmup  # noqa: E402
+
+warmup.iniciar()
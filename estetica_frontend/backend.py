@@ -0,0 +1,330 @@
+"""Cliente HTTP compartido para hablar con FastAPI
+
+Reutiliza una sola sesión de requests (conexiones keep-alive) y permite
+lanzar varias llamadas al backend en paralelo desde una vista. Cada grupo
+de endpoints tiene además un límite de llamadas simultáneas (bulkhead), para
+que un endpoint lento no acapare todos los hilos del proceso.
+"""
+import contextvars
+import http.cookiejar
+import threading
+import time
+from urllib.parse import urlsplit
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from estetica_frontend import cancelacion, caos, grabacion, jsoncodec, metrics, upstreams
+
+_session = None
+_session_lock = threading.Lock()
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _crear_adapter(tamano):
+    """Transporte de la sesión: red normal, grabando o reproduciendo (ver grabacion)"""
+    replay = getattr(settings, 'BACKEND_REPLAY_FILE', None)
+    if replay:
+        return grabacion.ReplayAdapter(replay, getattr(settings, 'BACKEND_REPLAY_LATENCY_SCALE', 1.0))
+    grabar = getattr(settings, 'BACKEND_RECORD_FILE', None)
+    if grabar:
+        return grabacion.GrabadorAdapter(grabar, pool_connections=tamano, pool_maxsize=tamano)
+    return HTTPAdapter(pool_connections=tamano, pool_maxsize=tamano)
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                tamano = getattr(settings, 'BACKEND_POOL_SIZE', 20)
+                session = requests.Session()
+                # La sesión se comparte entre usuarios: nunca guardar cookies
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                adapter = _crear_adapter(tamano)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+class RespuestaBackend(requests.Response):
+    """Response cuyo .json() usa el codec rápido (ver jsoncodec)"""
+
+    def json(self, **kwargs):
+        if kwargs or not self.content:
+            return super().json(**kwargs)
+        try:
+            return jsoncodec.loads(self.content)
+        except ValueError:
+            # Cuerpos no UTF-8 o inválidos: mismo comportamiento y excepción que requests
+            return super().json()
+
+
+_observadores = []
+
+
+def observar(funcion):
+    """Registra funcion(method, url, response, segundos) para cada llamada
+
+    Lo usan los tests para contar llamadas (ver presupuestos); devuelve una
+    función que quita el observador.
+    """
+    _observadores.append(funcion)
+    return lambda: _observadores.remove(funcion)
+
+
+def _pedir(method, url, **kwargs):
+    response = get_session().request(method, url, **kwargs)
+    response.__class__ = RespuestaBackend
+    return response
+
+
+def _enviar(method, url, **kwargs):
+    cancelacion.comprobar('backend_llamadas_canceladas')
+    inicio = time.monotonic()
+    upstream, url = upstreams.resolver(method, url)
+    ok = None
+    try:
+        regla = caos.regla_para(method, urlsplit(url).path)
+        if regla is None:
+            response = _pedir(method, url, **kwargs)
+        else:
+            response = caos.aplicar(regla, method, url, kwargs.get('timeout'), lambda: _pedir(method, url, **kwargs))
+        ok = response.status_code < 500
+    except requests.exceptions.RequestException:
+        ok = False
+        raise
+    finally:
+        # Con cualquier otra excepción (Cancelada, un error propio) la instancia
+        # no tiene la culpa, pero la llamada deja de estar pendiente igualmente
+        upstreams.terminar(upstream, time.monotonic() - inicio, ok)
+    for observador in list(_observadores):
+        observador(method, url, response, time.monotonic() - inicio)
+    return response
+
+
+# ==================== BULKHEADS ====================
+
+class BackendSaturado(requests.exceptions.RequestException):
+    """El grupo de endpoints ya tiene todas sus llamadas ocupadas
+
+    Hereda de RequestException para que las vistas lo traten como cualquier
+    otro fallo de conexión con FastAPI.
+    """
+
+
+class _Compartimento:
+    def __init__(self, nombre, limite, espera):
+        self.nombre = nombre
+        self.limite = limite
+        self.espera = espera
+        self._semaforo = threading.BoundedSemaphore(limite)
+        self._lock = threading.Lock()
+        self.en_uso = 0
+        self.en_cola = 0
+
+    def _publicar(self):
+        metrics.set_gauge(f'bulkhead_{self.nombre}_en_uso', self.en_uso)
+        metrics.set_gauge(f'bulkhead_{self.nombre}_en_cola', self.en_cola)
+
+    def entrar(self):
+        inicio = time.monotonic()
+        if not self._semaforo.acquire(blocking=False):
+            if not self.espera:
+                self._rechazar()
+            with self._lock:
+                self.en_cola += 1
+                self._publicar()
+            try:
+                obtenido = self._semaforo.acquire(timeout=self.espera)
+            finally:
+                with self._lock:
+                    self.en_cola -= 1
+                    self._publicar()
+            if not obtenido:
+                self._rechazar()
+        metrics.observe(f'bulkhead_{self.nombre}_espera', time.monotonic() - inicio)
+        with self._lock:
+            self.en_uso += 1
+            self._publicar()
+
+    def salir(self):
+        with self._lock:
+            self.en_uso -= 1
+            self._publicar()
+        self._semaforo.release()
+
+    def _rechazar(self):
+        metrics.incr(f'bulkhead_{self.nombre}_rechazadas')
+        raise BackendSaturado(f'Backend saturado ({self.nombre}): {self.limite} llamadas en curso')
+
+
+_compartimentos = {}
+_compartimentos_lock = threading.Lock()
+
+
+def grupo_de(method, url):
+    """Grupo de endpoints al que pertenece una llamada (None si no tiene límite)"""
+    path = urlsplit(url).path
+    if '/auth/' in path:
+        return 'auth'
+    if method == 'POST' and (path.rstrip('/').endswith('/upload-images') or path.rstrip('/').endswith('/images')):
+        return 'subidas'
+    if '/products' in path:
+        return 'productos'
+    if '/trabajos' in path:
+        return 'trabajos_lectura' if method in ('GET', 'HEAD') else 'trabajos_escritura'
+    return None
+
+
+def get_compartimento(grupo):
+    if grupo is None:
+        return None
+    compartimento = _compartimentos.get(grupo)
+    if compartimento is None:
+        config = getattr(settings, 'BACKEND_BULKHEADS', {}).get(grupo)
+        if not config:
+            return None
+        with _compartimentos_lock:
+            compartimento = _compartimentos.setdefault(
+                grupo, _Compartimento(grupo, config['limite'], config.get('espera', 0))
+            )
+    return compartimento
+
+
+def request(method, url, **kwargs):
+    """Igual que requests.request pero sobre la sesión compartida
+
+    Raises:
+        BackendSaturado si el grupo del endpoint está lleno y no se libera
+        un hueco en el tiempo de espera configurado
+    """
+    method = method.upper()
+    if cancelacion.activa() and not getattr(_local, 'en_worker', False):
+        # Bajo ASGI la llamada va al pool para poder dejar de esperarla (ver cancelacion)
+        return cancelacion.esperar(submit(lambda: request(method, url, **kwargs)))
+    compartimento = get_compartimento(grupo_de(method, url))
+    if compartimento is None:
+        return _enviar(method, url, **kwargs)
+    compartimento.entrar()
+    try:
+        return _enviar(method, url, **kwargs)
+    finally:
+        compartimento.salir()
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request('PUT', url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request('PATCH', url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
+
+
+# ==================== LLAMADAS EN PARALELO ====================
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKEND_PARALLEL_WORKERS', 16),
+                    thread_name_prefix='backend',
+                )
+    return _executor
+
+
+def _ejecutar_en_worker(funcion):
+    _local.en_worker = True
+    try:
+        return funcion()
+    finally:
+        _local.en_worker = False
+
+
+def _lanzar(executor, funcion):
+    """Manda la función al pool con el contexto de la petición (ver caos y cancelacion)"""
+    futuro = executor.submit(contextvars.copy_context().run, _ejecutar_en_worker, funcion)
+    return cancelacion.registrar(futuro)
+
+
+def parallel(*funciones):
+    """Ejecuta las funciones en paralelo y devuelve sus resultados en orden
+
+    Si alguna lanza una excepción se propaga la primera, igual que si se
+    hubieran llamado una tras otra. Las llamadas anidadas (desde dentro de
+    otra llamada en paralelo) se ejecutan en serie para no agotar el pool.
+    """
+    if len(funciones) <= 1 or getattr(_local, 'en_worker', False):
+        return [funcion() for funcion in funciones]
+
+    executor = _get_executor()
+    futuros = [_lanzar(executor, f) for f in funciones[1:]]
+    primero = funciones[0]()
+    return [primero] + [cancelacion.esperar(futuro) for futuro in futuros]
+
+
+def submit(funcion):
+    """Lanza la función en segundo plano y devuelve su Future
+
+    Desde dentro de un worker se ejecuta en el acto (ver parallel).
+    """
+    if getattr(_local, 'en_worker', False):
+        futuro = Future()
+        try:
+            futuro.set_result(funcion())
+        except Exception as e:
+            futuro.set_exception(e)
+        return futuro
+    return _lanzar(_get_executor(), funcion)
+
+
+def map_bounded(funcion, items, limite=None):
+    """Aplica la función a cada item con como mucho ``limite`` llamadas a la vez
+
+    Pensado para operaciones masivas: usa el pool compartido pero sin ocuparlo
+    entero, para que las páginas públicas sigan teniendo workers libres.
+    Devuelve los resultados en el orden de ``items``; si alguna llamada lanza
+    una excepción se propaga, así que la función debe capturar sus errores
+    si se quiere un resultado por item.
+    """
+    items = list(items)
+    limite = limite or getattr(settings, 'BACKEND_BULK_CONCURRENCY', 4)
+    if len(items) <= 1 or getattr(_local, 'en_worker', False):
+        return [funcion(item) for item in items]
+
+    executor = _get_executor()
+    resultados = [None] * len(items)
+    en_curso = {}
+    siguiente = 0
+    while siguiente < len(items) or en_curso:
+        while siguiente < len(items) and len(en_curso) < limite:
+            item = items[siguiente]
+            futuro = _lanzar(executor, lambda item=item: funcion(item))
+            en_curso[futuro] = siguiente
+            siguiente += 1
+        terminados, _ = wait(en_curso, timeout=cancelacion.INTERVALO, return_when=FIRST_COMPLETED)
+        # Los items que faltan por lanzar también se ahorran
+        cancelacion.comprobar('backend_llamadas_canceladas', len(items) - siguiente)
+        for futuro in terminados:
+            resultados[en_curso.pop(futuro)] = futuro.result()
+    return resultados
@@ -0,0 +1,48 @@
+"""Datos iniciales incrustados en el HTML para evitar fetch al cargar la página
+
+Las vistas meten en el contexto un diccionario ``bootstrap`` que el template
+publica con ``json_script`` y que static/js/bootstrap.js expone al resto
+del JavaScript. Si una clave no está, el JS hace el fetch de siempre.
+"""
+import requests
+from django.conf import settings
+
+from estetica_frontend import backend
+
+# Campos del usuario que usa el JavaScript de las páginas
+CAMPOS_USUARIO = ('id', 'email', 'full_name', 'is_admin', 'role', 'created_at', 'updated_at')
+
+# El backend no respondió 200: el JS hace su fetch y maneja el error como antes
+SIN_RESOLVER = object()
+
+
+def usuario_actual(token):
+    """Resumen del usuario dueño del token de la sesión
+
+    Recibe el token y no el request para poder llamarse desde otro hilo
+    sin tocar la sesión fuera del hilo de la vista.
+
+    Returns:
+        dict con el usuario, None si no hay sesión, o SIN_RESOLVER
+    """
+    if not token:
+        return None
+    try:
+        response = backend.get(
+            f"{settings.FASTAPI_BASE_URL}/api/auth/me",
+            headers={'Authorization': f'Bearer {token}'},
+            timeout=10
+        )
+    except requests.exceptions.RequestException:
+        return SIN_RESOLVER
+    if response.status_code != 200:
+        return SIN_RESOLVER
+    datos = response.json()
+    return {campo: datos.get(campo) for campo in CAMPOS_USUARIO if campo in datos}
+
+
+def con_usuario(bootstrap, usuario):
+    """Agrega el usuario (o null si no hay sesión) salvo que no se haya resuelto"""
+    if usuario is not SIN_RESOLVER:
+        bootstrap['user'] = usuario
+    return bootstrap
@@ -0,0 +1,74 @@
+"""Espacios de nombres versionados sobre la caché compartida
+
+Cada espacio ('productos', 'trabajos'...) tiene un número de versión guardado
+en la propia caché y las claves llevan esa versión. Invalidar un espacio es
+subir su versión: todas sus claves dejan de encontrarse a la vez en todos los
+workers, sin tener que saber cuáles eran. Las entradas viejas caducan solas.
+
+Si la versión desaparece de la caché (expulsada al llenarse) se vuelve a crear
+a partir del reloj y no desde 1, para que nunca reaparezcan entradas viejas.
+"""
+import time
+
+from django.core.cache import cache
+
+from estetica_frontend import metrics
+
+
+def _clave_version(espacio):
+    return f'ns:{espacio}'
+
+
+def _version_nueva():
+    return time.time_ns() // 1000
+
+
+def version(espacio):
+    """Versión actual del espacio (la crea si no existe)"""
+    clave = _clave_version(espacio)
+    actual = cache.get(clave)
+    if actual is None:
+        # add() no pisa la versión si otro worker la creó a la vez
+        nueva = _version_nueva()
+        cache.add(clave, nueva, timeout=None)
+        actual = cache.get(clave, nueva)
+    return actual
+
+
+def clave(espacio, nombre, v=None):
+    return f'{espacio}:v{version(espacio) if v is None else v}:{nombre}'
+
+
+def get(espacio, nombre, default=None):
+    return cache.get(clave(espacio, nombre), default)
+
+
+def set(espacio, nombre, valor, timeout=None):
+    cache.set(clave(espacio, nombre), valor, timeout)
+
+
+def delete(espacio, nombre):
+    cache.delete(clave(espacio, nombre))
+
+
+def get_many(espacio, nombres):
+    """Devuelve {nombre: valor} con los que estén en caché"""
+    v = version(espacio)
+    claves = {clave(espacio, nombre, v): nombre for nombre in nombres}
+    return {claves[k]: valor for k, valor in cache.get_many(list(claves)).items()}
+
+
+def set_many(espacio, valores, timeout=None):
+    v = version(espacio)
+    cache.set_many({clave(espacio, nombre, v): valor for nombre, valor in valores.items()}, timeout)
+
+
+def invalidar(espacio):
+    """Descarta todas las claves del espacio en todos los workers"""
+    clave_version = _clave_version(espacio)
+    try:
+        cache.incr(clave_version)
+    except ValueError:
+        # La versión no estaba en caché: cualquier valor nuevo sirve
+        cache.add(clave_version, _version_nueva(), timeout=None)
+    metrics.incr(f'cache_invalidaciones_{espacio}')
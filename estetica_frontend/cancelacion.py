@@ -0,0 +1,130 @@
+"""Cancelación del trabajo de una petición cuando el cliente se desconecta
+
+Bajo ASGI, Django detecta el ``http.disconnect`` y cancela su tarea, pero
+una vista síncrona sigue en su hilo esperando a FastAPI y renderizando una
+respuesta que nadie va a leer. ``Desconexiones`` marca la petición como
+cancelada (en un contextvar, así lo ven también los hilos del pool de
+backend) y el resto del código lo consulta:
+
+- backend deja de esperar las llamadas en curso y cancela las que aún no
+  han empezado; una llamada ya enviada termina en su worker (con su
+  timeout) pero su respuesta se descarta.
+- streaming deja de renderizar las partes que faltan.
+
+En ese momento se lanza ``Cancelada``, que sube hasta Django sin pasar por
+los ``except Exception`` de las vistas. Con WSGI o runserver no hay
+petición registrada y nada cambia.
+"""
+import contextvars
+import threading
+from contextlib import contextmanager
+from concurrent.futures import wait
+
+from estetica_frontend import metrics
+
+# Cada cuánto se mira si el cliente sigue ahí mientras se espera a FastAPI
+INTERVALO = 0.05
+
+_actual = contextvars.ContextVar('peticion_cancelable', default=None)
+
+
+class Cancelada(BaseException):
+    """El cliente cerró la conexión; el trabajo pendiente se abandona
+
+    Hereda de BaseException, como asyncio.CancelledError, para que no la
+    atrapen los ``except Exception`` que convierten fallos del backend en
+    mensajes de error.
+    """
+
+
+class _Peticion:
+    def __init__(self):
+        self.desconectada = threading.Event()
+        # Futures lanzados al pool por esta petición (ver backend._lanzar)
+        self.futuros = []
+
+
+def activa():
+    """True si la petición actual puede cancelarse (va por ASGI)"""
+    return _actual.get() is not None
+
+
+@contextmanager
+def independiente():
+    """Lo que se lanza dentro sigue aunque el cliente se desconecte (prefetch)"""
+    token = _actual.set(None)
+    try:
+        yield
+    finally:
+        _actual.reset(token)
+
+
+def registrar(futuro):
+    peticion = _actual.get()
+    if peticion is not None:
+        peticion.futuros.append(futuro)
+    return futuro
+
+
+def _cancelar(peticion):
+    futuros, peticion.futuros = peticion.futuros, []
+    for futuro in futuros:
+        if futuro.cancel():
+            metrics.incr('backend_llamadas_canceladas')
+        elif not futuro.done():
+            metrics.incr('backend_respuestas_descartadas')
+    raise Cancelada()
+
+
+def comprobar(contador, cantidad=1):
+    """Si el cliente se fue, anota en ``contador`` el trabajo evitado y lanza Cancelada"""
+    peticion = _actual.get()
+    if peticion is not None and peticion.desconectada.is_set():
+        metrics.incr(contador, cantidad)
+        _cancelar(peticion)
+
+
+def esperar(futuro):
+    """Como ``futuro.result()``, pero deja de esperar si el cliente se desconecta"""
+    peticion = _actual.get()
+    if peticion is None:
+        return futuro.result()
+    # wait() y no result(timeout=...): un TimeoutError de la propia llamada no
+    # debe confundirse con que todavía no terminó
+    while not wait([futuro], timeout=INTERVALO).done:
+        if peticion.desconectada.is_set():
+            _cancelar(peticion)
+    return futuro.result()
+
+
+class Desconexiones:
+    """Envoltorio ASGI que marca la petición como cancelada al recibir http.disconnect"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        peticion = _Peticion()
+        terminada = False
+
+        async def recibir():
+            mensaje = await receive()
+            if mensaje['type'] == 'http.disconnect' and not terminada:
+                peticion.desconectada.set()
+                metrics.incr('desconexiones_cliente')
+            return mensaje
+
+        async def enviar(mensaje):
+            nonlocal terminada
+            if mensaje['type'] == 'http.response.body' and not mensaje.get('more_body'):
+                terminada = True
+            await send(mensaje)
+
+        token = _actual.set(peticion)
+        try:
+            await self.app(scope, recibir, enviar)
+        finally:
+            _actual.reset(token)
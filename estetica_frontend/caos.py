@@ -0,0 +1,135 @@
+"""Inyección de fallos y latencia en las llamadas a FastAPI
+
+Para ver en local cómo se comporta el frontend cuando FastAPI va lento o
+falla. Solo funciona con CHAOS_ENABLED y DEBUG a la vez, así que nunca se
+activa en producción aunque se cuele la variable de entorno.
+
+Las reglas son diccionarios; la primera cuyo ``patron`` (regex sobre la
+ruta) y ``metodo`` (opcional) encajen con la llamada se aplica:
+
+    {
+        'patron': r'/api/trabajos/',
+        'metodo': 'GET',
+        'latencia': {'mediana': 0.3, 'p99': 2.0},  # o 1.5, o [0.5, 2.0]
+        'error': 0.05,           # probabilidad de responder 'status'
+        'status': 500,
+        'desconexion': 0.05,     # probabilidad de ConnectionError
+        'truncar': 0.02,         # probabilidad de cortar el cuerpo a la mitad
+    }
+
+CHAOS_RULES son las reglas de siempre. Con la cabecera ``X-Chaos: <perfil>``
+una petición usa en su lugar CHAOS_PROFILES[perfil], también en las llamadas
+que hace en paralelo (ver backend.parallel).
+"""
+import contextvars
+import logging
+import math
+import random
+import re
+import time
+
+import requests
+from django.conf import settings
+
+from estetica_frontend import metrics
+
+logger = logging.getLogger(__name__)
+
+CABECERA = 'HTTP_X_CHAOS'
+# z de la normal estándar para el percentil 99
+Z_P99 = 2.326
+
+_perfil = contextvars.ContextVar('perfil_caos', default=None)
+
+
+def esta_activo():
+    return getattr(settings, 'CHAOS_ENABLED', False) and settings.DEBUG
+
+
+def usar_perfil(nombre):
+    """Fija el perfil de la petición actual; devuelve el token para restaurar"""
+    return _perfil.set(nombre)
+
+
+def restaurar(token):
+    _perfil.reset(token)
+
+
+def _reglas():
+    nombre = _perfil.get()
+    if nombre:
+        return getattr(settings, 'CHAOS_PROFILES', {}).get(nombre, [])
+    return getattr(settings, 'CHAOS_RULES', [])
+
+
+def regla_para(method, path):
+    """Primera regla que aplica a la llamada, o None"""
+    if not esta_activo():
+        return None
+    for regla in _reglas():
+        if regla.get('metodo') and regla['metodo'] != method:
+            continue
+        if re.search(regla.get('patron', ''), path):
+            return regla
+    return None
+
+
+def _latencia(valor):
+    """Segundos a esperar según la forma de la regla"""
+    if not valor:
+        return 0
+    if isinstance(valor, (int, float)):
+        return valor
+    if isinstance(valor, (list, tuple)):
+        return random.uniform(*valor)
+    # Log-normal: la mayoría cerca de la mediana y una cola larga hasta el p99
+    mediana = valor['mediana']
+    sigma = math.log(valor['p99'] / mediana) / Z_P99
+    return random.lognormvariate(math.log(mediana), sigma)
+
+
+def _timeout_lectura(timeout):
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+def _respuesta_error(method, url, status):
+    from estetica_frontend.backend import RespuestaBackend
+
+    response = RespuestaBackend()
+    response.status_code = status
+    response.headers['Content-Type'] = 'application/json'
+    response._content = b'{"detail": "Error inyectado (caos)"}'
+    response.encoding = 'utf-8'
+    response.url = url
+    response.request = requests.Request(method, url).prepare()
+    return response
+
+
+def aplicar(regla, method, url, timeout, enviar):
+    """Ejecuta la llamada real (``enviar``) con los fallos de la regla"""
+    espera = _latencia(regla.get('latencia'))
+    if espera:
+        limite = _timeout_lectura(timeout)
+        metrics.observe('caos_latencia', espera)
+        if limite is not None and espera >= limite:
+            # Se comporta como un FastAPI que no contesta a tiempo
+            time.sleep(limite)
+            metrics.incr('caos_timeouts')
+            raise requests.exceptions.ReadTimeout(f'Timeout inyectado (caos) en {method} {url}')
+        time.sleep(espera)
+
+    if random.random() < regla.get('desconexion', 0):
+        metrics.incr('caos_desconexiones')
+        raise requests.exceptions.ConnectionError(f'Desconexión inyectada (caos) en {method} {url}')
+
+    if random.random() < regla.get('error', 0):
+        metrics.incr('caos_errores')
+        return _respuesta_error(method, url, regla.get('status', 500))
+
+    response = enviar()
+    if random.random() < regla.get('truncar', 0):
+        metrics.incr('caos_truncados')
+        response._content = response.content[:len(response.content) // 2]
+    return response
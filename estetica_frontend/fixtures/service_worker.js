@@ -0,0 +1,88 @@
+// Ejecuta el /sw.js renderizado (por stdin) con caches y fetch simulados.
+// argv[2]: JSON con las peticiones a simular y las cabeceras de cada respuesta:
+//   {"peticiones": [{"url": "/products/api/", "cache": "default"}],
+//    "respuestas": {"/products/api/": {"Vary": "Cookie"}}}
+// Escribe por stdout, por petición, si el worker la atendió y cuántas veces
+// fue a la red, y al final el contenido de cada caché.
+const fs = require('fs');
+const vm = require('vm');
+
+const ORIGEN = 'http://localhost';
+const escenario = JSON.parse(process.argv[2]);
+const almacen = new Map();
+const listeners = {};
+let llamadasRed = 0;
+
+function abrir(nombre) {
+    if (!almacen.has(nombre)) {
+        almacen.set(nombre, new Map());
+    }
+    const cache = almacen.get(nombre);
+    return {
+        match: async request => cache.get(new URL(request.url).pathname),
+        put: async (request, response) => { cache.set(new URL(request.url).pathname, response); },
+        keys: async () => [...cache.keys()].map(ruta => new Request(ORIGEN + ruta)),
+        delete: async request => cache.delete(new URL(request.url).pathname),
+        addAll: async () => undefined,
+    };
+}
+
+const contexto = {
+    self: {
+        location: new URL(ORIGEN),
+        addEventListener: (tipo, funcion) => { listeners[tipo] = funcion; },
+    },
+    caches: {
+        open: async nombre => abrir(nombre),
+        keys: async () => [...almacen.keys()],
+        delete: async nombre => almacen.delete(nombre),
+        match: async request => {
+            for (const cache of almacen.values()) {
+                const guardada = cache.get(new URL(request.url).pathname);
+                if (guardada) {
+                    return guardada;
+                }
+            }
+            return undefined;
+        },
+    },
+    fetch: async request => {
+        llamadasRed++;
+        const ruta = new URL(request.url).pathname;
+        const response = new Response('{}', { headers: escenario.respuestas[ruta] || {} });
+        // En el navegador las respuestas del mismo origen son de tipo 'basic'
+        Object.defineProperty(response, 'type', { value: 'basic' });
+        const clone = response.clone.bind(response);
+        response.clone = () => Object.defineProperty(clone(), 'type', { value: 'basic' });
+        return response;
+    },
+    Request,
+    Response,
+    URL,
+    Promise,
+};
+vm.runInNewContext(fs.readFileSync(0, 'utf8'), contexto);
+
+(async () => {
+    const resultados = [];
+    for (const peticion of escenario.peticiones) {
+        const antes = llamadasRed;
+        const pendientes = [];
+        let respuesta = null;
+        listeners.fetch({
+            request: new Request(ORIGEN + peticion.url, { cache: peticion.cache || 'default' }),
+            respondWith: promesa => { respuesta = promesa; },
+            waitUntil: promesa => pendientes.push(promesa),
+        });
+        if (respuesta) {
+            await respuesta;
+        }
+        await Promise.all(pendientes);
+        resultados.push({ url: peticion.url, atendida: respuesta !== null, red: llamadasRed - antes });
+    }
+    const cachesFinales = {};
+    for (const [nombre, cache] of almacen) {
+        cachesFinales[nombre.split('-')[1]] = [...cache.keys()].sort();
+    }
+    console.log(JSON.stringify({ resultados, caches: cachesFinales }));
+})();
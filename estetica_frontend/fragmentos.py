@@ -0,0 +1,79 @@
+"""Caché de fragmentos renderizados (tarjetas de la galería, filas del panel)
+
+Cada tarjeta se guarda en la caché compartida con una clave que incluye el
+ID del trabajo, un hash de sus datos y un hash del template. Si el trabajo
+cambia en FastAPI, o el template en un despliegue, la clave es otra y la
+tarjeta se vuelve a renderizar; las que no cambiaron salen de la caché. Así
+el coste de render de una página depende de cuántos trabajos cambiaron y no
+de cuántos muestra.
+
+Las tarjetas se piden por lotes (un get_many por lote) para no tener todo
+el listado en memoria a la vez cuando la página va en streaming.
+"""
+import hashlib
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template.loader import get_template
+
+from estetica_frontend import metrics
+
+LOTE = 24
+
+
+def esta_activo():
+    return getattr(settings, 'FRAGMENT_CACHE_ENABLED', True)
+
+
+@lru_cache(maxsize=None)
+def _version_template(template_name):
+    fuente = get_template(template_name).template.source
+    return hashlib.blake2b(fuente.encode(), digest_size=6).hexdigest()
+
+
+def _clave(template_name, item):
+    datos = json.dumps(item, sort_keys=True, cls=DjangoJSONEncoder)
+    resumen = hashlib.blake2b(datos.encode(), digest_size=16).hexdigest()
+    identificador = item.get('id', '') if isinstance(item, dict) else ''
+    return f'fragmento:{template_name}:{_version_template(template_name)}:{identificador}:{resumen}'
+
+
+def _render_lote(template, template_name, nombre, lote):
+    claves = [_clave(template_name, item) for item in lote]
+    guardados = cache.get_many(claves)
+    nuevos = {}
+    for clave, item in zip(claves, lote):
+        html = guardados.get(clave)
+        if html is None:
+            html = nuevos[clave] = template.render({nombre: item})
+        yield html
+
+    metrics.incr('fragment_cache_hits', len(guardados))
+    if nuevos:
+        metrics.incr('fragment_cache_misses', len(nuevos))
+        cache.set_many(nuevos, getattr(settings, 'FRAGMENT_CACHE_TTL', 86400))
+
+
+def renderizar(template_name, nombre, items):
+    """Genera el HTML de cada item en orden, renderizando solo los que no están en caché
+
+    El template solo recibe el item (``nombre``), así que no puede depender
+    del request ni del usuario.
+    """
+    template = get_template(template_name)
+    if not esta_activo():
+        for item in items:
+            yield template.render({nombre: item})
+        return
+
+    lote = []
+    for item in items:
+        lote.append(item)
+        if len(lote) == LOTE:
+            yield from _render_lote(template, template_name, nombre, lote)
+            lote = []
+    if lote:
+        yield from _render_lote(template, template_name, nombre, lote)
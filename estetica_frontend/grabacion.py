@@ -0,0 +1,245 @@
+"""Grabación y reproducción del tráfico con FastAPI
+
+Para reproducir offline la forma real de los datos:
+
+- Grabar: con BACKEND_RECORD_FILE apuntando a un .jsonl, cada llamada del
+  cliente compartido (ver backend) se añade al archivo con su respuesta y su
+  latencia. Tokens, contraseñas y códigos se guardan como '<redactado>'.
+- Reproducir: con BACKEND_REPLAY_FILE las llamadas no salen a la red; se
+  responden desde la grabación esperando la latencia grabada multiplicada
+  por BACKEND_REPLAY_LATENCY_SCALE (0 = sin espera).
+
+En los tests se usan los context managers ``grabando`` y ``reproduciendo``.
+
+Las llamadas se emparejan por método, ruta y query (sin el host, para poder
+reproducir contra otro FASTAPI_BASE_URL). Si la misma llamada se grabó varias
+veces, las respuestas se devuelven en orden y vuelven a empezar al acabarse.
+"""
+import base64
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from estetica_frontend import metrics
+
+logger = logging.getLogger(__name__)
+
+REDACTADO = '<redactado>'
+CAMPOS_SENSIBLES = {
+    'access_token', 'refresh_token', 'token', 'password', 'new_password',
+    'current_password', 'code',
+}
+CABECERAS_SENSIBLES = {'authorization', 'cookie', 'set-cookie'}
+# Cabeceras de respuesta que no tiene sentido reproducir
+CABECERAS_IGNORADAS = {'content-length', 'content-encoding', 'transfer-encoding', 'connection', 'date'}
+
+
+def clave(method, url):
+    """(método, ruta, query ordenada) con la que se empareja una llamada"""
+    partes = urlsplit(url)
+    pares = sorted(parse_qsl(partes.query, keep_blank_values=True))
+    query = urlencode([(k, REDACTADO if k in CAMPOS_SENSIBLES else v) for k, v in pares])
+    return method.upper(), partes.path, query
+
+
+# ==================== REDACCIÓN ====================
+
+def redactar(valor):
+    """Copia de un JSON con los campos sensibles sustituidos"""
+    if isinstance(valor, dict):
+        return {
+            k: REDACTADO if k in CAMPOS_SENSIBLES and v else redactar(v)
+            for k, v in valor.items()
+        }
+    if isinstance(valor, list):
+        return [redactar(v) for v in valor]
+    return valor
+
+
+def _redactar_cabeceras(cabeceras, ignorar=()):
+    return {
+        k: REDACTADO if k.lower() in CABECERAS_SENSIBLES else v
+        for k, v in cabeceras.items()
+        if k.lower() not in ignorar
+    }
+
+
+def _cuerpo(contenido, content_type):
+    """Cuerpo como JSON o formulario redactados, texto o base64, según lo que sea"""
+    if not contenido:
+        return {}
+    if 'json' in content_type:
+        try:
+            return {'json': redactar(json.loads(contenido))}
+        except ValueError:
+            pass
+    if 'x-www-form-urlencoded' in content_type:
+        return {'form': redactar(dict(parse_qsl(contenido.decode('utf-8', 'replace'), keep_blank_values=True)))}
+    if content_type.startswith('text/'):
+        try:
+            return {'texto': contenido.decode('utf-8')}
+        except UnicodeDecodeError:
+            pass
+    return {'base64': base64.b64encode(contenido).decode('ascii')}
+
+
+def _contenido(guardado):
+    if 'json' in guardado:
+        return json.dumps(guardado['json']).encode()
+    if 'form' in guardado:
+        return urlencode(guardado['form']).encode()
+    if 'texto' in guardado:
+        return guardado['texto'].encode()
+    if 'base64' in guardado:
+        return base64.b64decode(guardado['base64'])
+    return b''
+
+
+# ==================== GRABACIÓN ====================
+
+class GrabadorAdapter(HTTPAdapter):
+    """HTTPAdapter normal que además añade cada llamada al archivo"""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        inicio = time.monotonic()
+        response = super().send(request, **kwargs)
+        # Se lee aquí para que la latencia incluya el cuerpo
+        contenido = response.content
+        latencia = time.monotonic() - inicio
+        try:
+            self._guardar(request, response, contenido, latencia)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"No se pudo grabar {request.method} {request.url}: {e}")
+        return response
+
+    def _guardar(self, request, response, contenido, latencia):
+        metodo, ruta, query = clave(request.method, request.url)
+        cuerpo_peticion = request.body.encode() if isinstance(request.body, str) else request.body
+        tipo_peticion = request.headers.get('Content-Type', '')
+        interaccion = {
+            'metodo': metodo,
+            'ruta': ruta,
+            'query': query,
+            'peticion': {
+                'headers': _redactar_cabeceras(request.headers),
+                # De los multipart (imágenes) solo interesa el tamaño
+                'cuerpo': {'bytes': len(cuerpo_peticion or b'')} if 'multipart' in tipo_peticion
+                          else _cuerpo(cuerpo_peticion, tipo_peticion),
+            },
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': _redactar_cabeceras(response.headers, CABECERAS_IGNORADAS),
+            'cuerpo': _cuerpo(contenido, response.headers.get('Content-Type', '')),
+            'latencia': round(latencia, 4),
+        }
+        linea = json.dumps(interaccion, ensure_ascii=False) + '\n'
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(linea)
+        metrics.incr('backend_grabadas')
+
+
+# ==================== REPRODUCCIÓN ====================
+
+def cargar(path):
+    """Interacciones de un archivo agrupadas por clave"""
+    interacciones = defaultdict(list)
+    with open(path, encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                i = json.loads(linea)
+                interacciones[(i['metodo'], i['ruta'], i['query'])].append(i)
+    return interacciones
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transporte que responde desde una grabación sin tocar la red"""
+
+    def __init__(self, path, escala=1.0):
+        super().__init__()
+        self.interacciones = cargar(path)
+        self.escala = escala
+        self._turnos = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        k = clave(request.method, request.url)
+        grabadas = self.interacciones.get(k)
+        if not grabadas:
+            metrics.incr('backend_replay_misses')
+            raise requests.exceptions.ConnectionError(
+                f'Sin grabación para {k[0]} {k[1]}?{k[2]}', request=request
+            )
+        with self._lock:
+            turno = self._turnos[k]
+            self._turnos[k] = turno + 1
+        interaccion = grabadas[turno % len(grabadas)]
+
+        if self.escala:
+            time.sleep(interaccion['latencia'] * self.escala)
+        metrics.incr('backend_replay_hits')
+        return self._respuesta(request, interaccion)
+
+    def _respuesta(self, request, interaccion):
+        response = requests.Response()
+        response.status_code = interaccion['status']
+        response.reason = interaccion.get('reason')
+        response.headers = CaseInsensitiveDict(interaccion.get('headers', {}))
+        response._content = _contenido(interaccion.get('cuerpo', {}))
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=interaccion['latencia'] * self.escala)
+        return response
+
+    def close(self):
+        pass
+
+
+# ==================== SESIÓN ====================
+
+@contextmanager
+def _montado(session, adapter):
+    anteriores = dict(session.adapters)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    try:
+        yield adapter
+    finally:
+        session.adapters.clear()
+        for prefijo, anterior in anteriores.items():
+            session.mount(prefijo, anterior)
+
+
+@contextmanager
+def grabando(path):
+    """Graba en ``path`` las llamadas hechas dentro del bloque"""
+    from estetica_frontend import backend
+
+    with _montado(backend.get_session(), GrabadorAdapter(path)) as adapter:
+        yield adapter
+
+
+@contextmanager
+def reproduciendo(path, escala=0):
+    """Responde desde ``path`` las llamadas hechas dentro del bloque"""
+    from estetica_frontend import backend
+
+    with _montado(backend.get_session(), ReplayAdapter(path, escala)) as adapter:
+        yield adapter
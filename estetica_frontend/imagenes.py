@@ -0,0 +1,160 @@
+"""Validación y normalización de imágenes antes de enviarlas a FastAPI
+
+Las fotos llegan tal cual salen del teléfono (varios MB, con EXIF y GPS) y
+FastAPI las guarda en base64. Aquí se rechazan los archivos que no son
+imágenes o son demasiado grandes, y las válidas se reducen a un tamaño
+máximo, se recodifican como JPEG y pierden los metadatos.
+"""
+import hashlib
+import io
+
+from django.conf import settings
+from django.core.cache import cache
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from estetica_frontend import metrics
+
+# Firmas de los formatos aceptados (los templates las muestran como JPEG)
+FIRMAS = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+class ImagenInvalida(ValueError):
+    """El archivo no es una imagen aceptada o excede el tamaño permitido"""
+
+
+def _tipo_por_firma(cabecera):
+    for firma, tipo in FIRMAS:
+        if cabecera.startswith(firma):
+            return tipo
+    if cabecera[:4] == b'RIFF' and cabecera[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def validar(archivo):
+    """Comprueba tamaño y tipo real de un UploadedFile sin leerlo entero
+
+    Raises:
+        ImagenInvalida
+    """
+    maximo = getattr(settings, 'IMAGE_MAX_UPLOAD_BYTES', 15 * 1024 * 1024)
+    if archivo.size > maximo:
+        raise ImagenInvalida(
+            f'{archivo.name}: pesa {archivo.size // 1024} KB, el máximo es {maximo // 1024} KB'
+        )
+
+    archivo.seek(0)
+    cabecera = archivo.read(16)
+    archivo.seek(0)
+    if _tipo_por_firma(cabecera) is None:
+        raise ImagenInvalida(f'{archivo.name}: no es una imagen JPEG, PNG, GIF o WebP')
+
+
+def validar_todas(archivos):
+    """Valida una lista y devuelve los mensajes de error (vacía si todas son válidas)"""
+    errores = []
+    for archivo in archivos:
+        try:
+            validar(archivo)
+        except ImagenInvalida as e:
+            errores.append(str(e))
+    if errores:
+        metrics.incr('images_rejected', len(errores))
+    return errores
+
+
+def hash_contenido(contenido):
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def normalizar(contenido, nombre='imagen'):
+    """Reduce, recodifica como JPEG y quita los metadatos
+
+    Returns:
+        dict con contenido, nombre, content_type, tamaños y sha256
+
+    Raises:
+        ImagenInvalida si Pillow no puede decodificar la imagen
+    """
+    lado_maximo = getattr(settings, 'IMAGE_MAX_DIMENSION', 1600)
+    calidad = getattr(settings, 'IMAGE_JPEG_QUALITY', 82)
+
+    try:
+        imagen = Image.open(io.BytesIO(contenido))
+        imagen.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ImagenInvalida(f'{nombre}: la imagen está dañada ({e})')
+
+    # Aplicar la orientación del EXIF antes de descartarlo
+    imagen = ImageOps.exif_transpose(imagen)
+    if imagen.mode in ('RGBA', 'LA', 'P'):
+        imagen = imagen.convert('RGBA')
+        fondo = Image.new('RGB', imagen.size, (255, 255, 255))
+        fondo.paste(imagen, mask=imagen.split()[-1])
+        imagen = fondo
+    elif imagen.mode != 'RGB':
+        imagen = imagen.convert('RGB')
+
+    dimensiones_originales = imagen.size
+    imagen.thumbnail((lado_maximo, lado_maximo), Image.LANCZOS)
+
+    salida = io.BytesIO()
+    # Sin exif= ni icc_profile= Pillow no copia ningún metadato
+    imagen.save(salida, format='JPEG', quality=calidad, optimize=True, progressive=True)
+    resultado = salida.getvalue()
+
+    base = nombre.rsplit('.', 1)[0] if '.' in nombre else nombre
+    info = {
+        'contenido': resultado,
+        'nombre': f'{base}.jpg',
+        'content_type': 'image/jpeg',
+        'tamano_original': len(contenido),
+        'tamano_final': len(resultado),
+        'dimensiones_originales': dimensiones_originales,
+        'dimensiones_finales': imagen.size,
+        'sha256': hash_contenido(resultado),
+    }
+
+    metrics.incr('images_normalized')
+    metrics.incr('images_bytes_original', info['tamano_original'])
+    metrics.incr('images_bytes_final', info['tamano_final'])
+    return info
+
+
+# ==================== DUPLICADOS ====================
+
+def _clave_subidas(destino):
+    return f'imagenes_subidas:{destino}'
+
+
+def ya_subidas(destino):
+    """Hashes de las imágenes subidas recientemente a un producto o trabajo"""
+    return set(cache.get(_clave_subidas(destino), ()))
+
+
+def registrar_subidas(destino, hashes):
+    vistos = ya_subidas(destino) | set(hashes)
+    cache.set(_clave_subidas(destino), vistos, getattr(settings, 'IMAGE_DEDUP_TTL', 86400))
+
+
+def olvidar_subidas(destino):
+    """Al borrar una imagen del destino ya no se puede saber cuál era: se olvidan todas"""
+    cache.delete(_clave_subidas(destino))
+
+
+def resumen(infos, duplicadas=0):
+    """Estadísticas de ahorro de una subida, para mostrar al admin"""
+    original = sum(i['tamano_original'] for i in infos)
+    final = sum(i['tamano_final'] for i in infos)
+    return {
+        'imagenes': len(infos),
+        'duplicadas_omitidas': duplicadas,
+        'bytes_originales': original,
+        'bytes_finales': final,
+        'ahorro_porcentaje': round(100 * (1 - final / original), 1) if original else 0,
+    }
@@ -0,0 +1,69 @@
+"""Codificación y decodificación de JSON con el codec más rápido disponible
+
+Las respuestas de FastAPI llevan las imágenes en base64 y pesan mucho; el
+módulo json de la librería estándar se nota en la CPU de los proxies. Si
+orjson está instalado se usa (es opcional, como brotli); si no, json.
+
+JSON_CODEC elige el codec: 'auto' (orjson si está), 'orjson' o 'json'.
+"""
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa json
+    orjson = None
+
+
+def nombre_codec():
+    elegido = getattr(settings, 'JSON_CODEC', 'auto')
+    if elegido == 'json' or orjson is None:
+        return 'json'
+    return 'orjson'
+
+
+def _default(obj):
+    """Tipos que orjson no conoce (Decimal, textos traducibles...)"""
+    return DjangoJSONEncoder().default(obj)
+
+
+def loads(datos):
+    """bytes o str -> objeto Python
+
+    Raises:
+        ValueError si no es JSON válido (orjson.JSONDecodeError hereda de él)
+    """
+    if nombre_codec() == 'orjson':
+        return orjson.loads(datos)
+    return json.loads(datos)
+
+
+def dumps(obj):
+    """Objeto Python -> bytes UTF-8"""
+    if nombre_codec() == 'orjson':
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, cls=DjangoJSONEncoder).encode('utf-8')
+
+
+class JsonResponse(HttpResponse):
+    """Igual que django.http.JsonResponse pero serializando con el codec rápido
+
+    Con ``encoder`` o ``json_dumps_params`` se serializa con json como hace
+    Django, porque el codec rápido no los admite.
+    """
+
+    def __init__(self, data, encoder=None, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set the '
+                'safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        if encoder is not None or json_dumps_params:
+            content = json.dumps(data, cls=encoder or DjangoJSONEncoder, **(json_dumps_params or {}))
+        else:
+            content = dumps(data)
+        super().__init__(content=content, **kwargs)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from estetica_frontend import warmup
+
+
+class Command(BaseCommand):
+    help = 'Calienta la caché compartida y las páginas pre-renderizadas antes de recibir tráfico'
+
+    def handle(self, *args, **options):
+        estado = warmup.ejecutar()
+        for error in estado['errores']:
+            self.stderr.write(self.style.WARNING(error))
+        if estado['errores']:
+            raise CommandError(f"Warmup con {len(estado['errores'])} errores")
+        self.stdout.write(self.style.SUCCESS(f"Warmup terminado en {estado['segundos']} s"))
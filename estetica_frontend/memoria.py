@@ -0,0 +1,137 @@
+"""Medición de memoria de las vistas con payloads grandes
+
+Con MEMORY_PROFILING_ENABLED, las vistas decoradas con ``medir_memoria``
+registran en cada petición el RSS del proceso antes y después, para ver si
+un worker crece sin volver a bajar. Una de cada MEMORY_PROFILING_SAMPLE_RATE
+peticiones se ejecuta además con tracemalloc encendido y se guarda:
+
+- el pico de memoria reservada por Python durante la vista, y
+- los puntos de código que más memoria siguen reteniendo al terminarla.
+
+Todo sale por /metrics/ (gauges ``memoria_*`` y detalles
+``memoria_<vista>_top``). tracemalloc es global: solo se toma una muestra a
+la vez por proceso y mientras dura cuenta también lo que reserven otros
+hilos, así que los picos de una muestra son una cota superior.
+"""
+import logging
+import os
+import random
+import threading
+import tracemalloc
+from functools import wraps
+
+from django.conf import settings
+
+from estetica_frontend import metrics
+
+logger = logging.getLogger(__name__)
+
+_muestreo = threading.Lock()
+_rss_inicial = None
+
+# Lo que reserva el propio tracemalloc no interesa en el top
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+)
+
+
+def esta_activo():
+    return getattr(settings, 'MEMORY_PROFILING_ENABLED', False)
+
+
+def rss_bytes():
+    """RSS actual del proceso, o None si no hay /proc"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def _toca_muestra():
+    tasa = getattr(settings, 'MEMORY_PROFILING_SAMPLE_RATE', 20)
+    return bool(tasa) and random.random() < 1 / tasa
+
+
+def _sitio(frame):
+    archivo = frame.filename
+    if archivo.startswith(str(settings.BASE_DIR)):
+        archivo = os.path.relpath(archivo, settings.BASE_DIR)
+    return f'{archivo}:{frame.lineno}'
+
+
+def _top(snapshot):
+    sitios = snapshot.filter_traces(_FILTROS).statistics('lineno')
+    return [
+        {
+            'sitio': _sitio(s.traceback[0]),
+            'bytes': s.size,
+            'bloques': s.count,
+        }
+        for s in sitios[:getattr(settings, 'MEMORY_PROFILING_TOP', 10)]
+    ]
+
+
+def _muestra(nombre, vista, request, *args, **kwargs):
+    """Ejecuta la vista con tracemalloc y publica el pico y el top"""
+    ya_activo = tracemalloc.is_tracing()
+    if ya_activo:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        response = vista(request, *args, **kwargs)
+        _, pico = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not ya_activo:
+            tracemalloc.stop()
+
+    metrics.incr(f'memoria_{nombre}_muestras')
+    metrics.set_gauge(f'memoria_{nombre}_pico_bytes', pico)
+    maximo = metrics.snapshot()['gauges'].get(f'memoria_{nombre}_pico_max_bytes', 0)
+    metrics.set_gauge(f'memoria_{nombre}_pico_max_bytes', max(maximo, pico))
+    metrics.set_detalle(f'memoria_{nombre}_top', _top(snapshot))
+    return response
+
+
+def _registrar_rss(nombre, antes):
+    global _rss_inicial
+    despues = rss_bytes()
+    if antes is None or despues is None:
+        return
+    if _rss_inicial is None:
+        _rss_inicial = antes
+    crecimiento = despues - antes
+    metrics.set_gauge('memoria_rss_bytes', despues)
+    metrics.set_gauge('memoria_rss_crecimiento_total_bytes', despues - _rss_inicial)
+    if crecimiento > 0:
+        metrics.incr(f'memoria_{nombre}_rss_crecimiento_bytes', crecimiento)
+
+    umbral = getattr(settings, 'MEMORY_PROFILING_RSS_WARN_MB', 50) * 1024 * 1024
+    if crecimiento > umbral:
+        logger.warning(f"{nombre}: el RSS creció {crecimiento // (1024 * 1024)} MB en una petición")
+
+
+def medir_memoria(nombre):
+    """Decorador para vistas: RSS en cada petición y tracemalloc por muestreo"""
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if not esta_activo():
+                return vista(request, *args, **kwargs)
+
+            antes = rss_bytes()
+            # Si ya hay otra muestra en curso esta petición va sin tracemalloc
+            if _toca_muestra() and _muestreo.acquire(blocking=False):
+                try:
+                    response = _muestra(nombre, vista, request, *args, **kwargs)
+                finally:
+                    _muestreo.release()
+            else:
+                response = vista(request, *args, **kwargs)
+            _registrar_rss(nombre, antes)
+            return response
+        return envoltura
+    return decorador
@@ -0,0 +1,93 @@
+"""Métricas internas del frontend (contadores, gauges, tiempos y detalles)
+
+Los valores viven en memoria de cada proceso y se exponen en /metrics/,
+solo para las redes de METRICS_ALLOWED_NETWORKS y los administradores:
+incluyen hosts de FastAPI y el estado de colas y límites.
+"""
+import ipaddress
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+from estetica_frontend.jsoncodec import JsonResponse
+
+_lock = threading.Lock()
+_contadores = defaultdict(int)
+_gauges = {}
+_tiempos = {}
+_detalles = {}
+
+
+def incr(nombre, valor=1):
+    """Suma valor a un contador"""
+    with _lock:
+        _contadores[nombre] += valor
+
+
+def set_gauge(nombre, valor):
+    """Fija el valor actual de un gauge"""
+    with _lock:
+        _gauges[nombre] = valor
+
+
+def observe(nombre, segundos):
+    """Registra una duración (cantidad, total y máximo)"""
+    with _lock:
+        t = _tiempos.setdefault(nombre, {'count': 0, 'total': 0.0, 'max': 0.0})
+        t['count'] += 1
+        t['total'] += segundos
+        t['max'] = max(t['max'], segundos)
+
+
+def set_detalle(nombre, valor):
+    """Guarda un valor estructurado (listas, dicts) que no es un número"""
+    with _lock:
+        _detalles[nombre] = valor
+
+
+def snapshot():
+    """Copia de todas las métricas actuales"""
+    with _lock:
+        return {
+            'counters': dict(_contadores),
+            'gauges': dict(_gauges),
+            'timers': {nombre: dict(t) for nombre, t in _tiempos.items()},
+            'details': dict(_detalles),
+        }
+
+
+def reset():
+    """Borra todas las métricas (útil en tests)"""
+    with _lock:
+        _contadores.clear()
+        _gauges.clear()
+        _tiempos.clear()
+        _detalles.clear()
+
+
+def _red_permitida(ip):
+    try:
+        direccion = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    redes = getattr(settings, 'METRICS_ALLOWED_NETWORKS', ('127.0.0.1/32', '::1/128'))
+    return any(direccion in ipaddress.ip_network(red, strict=False) for red in redes)
+
+
+def acceso_permitido(request):
+    """Scrapers desde redes internas, o un administrador con sesión"""
+    from estetica_frontend.bootstrap import usuario_actual
+    from estetica_frontend.ratelimit import ip_cliente
+
+    if _red_permitida(ip_cliente(request)):
+        return True
+    usuario = usuario_actual(request.session.get('access_token'))
+    return isinstance(usuario, dict) and bool(usuario.get('is_admin'))
+
+
+def metrics_view(request):
+    """Métricas del proceso en JSON"""
+    if not acceso_permitido(request):
+        return JsonResponse({'detail': 'No autorizado'}, status=403)
+    return JsonResponse(snapshot())
@@ -0,0 +1,263 @@
+import cProfile
+import gzip
+import hashlib
+import io
+import logging
+import secrets
+import string
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import has_vary_header, patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+from estetica_frontend import caos, metrics, profiling
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; sin él solo se usa gzip
+    brotli = None
+
+re_accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+re_accepts_br = _lazy_re_compile(r'\bbr\b')
+
+TIPOS_COMPRIMIBLES = (
+    'text/html',
+    'text/css',
+    'text/plain',
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+)
+
+
+class _GzipPorPartes:
+    """gzip de una respuesta en streaming, vaciando el compresor tras cada parte
+
+    Sin el Z_SYNC_FLUSH zlib retendría la cabecera de la página hasta juntar
+    bastantes datos y el streaming perdería su sentido. El nombre de archivo
+    aleatorio es la misma mitigación de BREACH que usa compress_string.
+    """
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        nombre = ''.join(secrets.choice(string.ascii_letters) for _ in range(secrets.randbelow(100) + 1))
+        self.archivo = gzip.GzipFile(filename=nombre, mode='wb', compresslevel=6, fileobj=self.buffer, mtime=0)
+
+    def parte(self, datos):
+        self.archivo.write(datos)
+        self.archivo.flush(zlib.Z_SYNC_FLUSH)
+        return self._vaciar()
+
+    def cerrar(self):
+        self.archivo.close()
+        return self._vaciar()
+
+    def _vaciar(self):
+        datos = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return datos
+
+
+def _comprimir_partes(partes):
+    gz = _GzipPorPartes()
+    for parte in partes:
+        yield gz.parte(parte)
+    yield gz.cerrar()
+
+
+async def _acomprimir_partes(partes):
+    """_comprimir_partes para los iteradores asíncronos (ASGI)"""
+    gz = _GzipPorPartes()
+    async for parte in partes:
+        yield gz.parte(parte)
+    yield gz.cerrar()
+
+
+def _comprimir(contenido, encoding):
+    if encoding == 'br':
+        return brotli.compress(contenido, quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5))
+    # Mismo relleno aleatorio que GZipMiddleware como mitigación de BREACH
+    return compress_string(contenido, max_random_bytes=100)
+
+
+class CompressionCacheMiddleware:
+    """Comprime respuestas con brotli o gzip según Accept-Encoding
+
+    Los cuerpos que se repiten entre clientes (JSON público, CSS/JS, páginas
+    pre-renderizadas) se guardan comprimidos en la caché bajo el hash del
+    contenido, así cada payload distinto se comprime una sola vez. El resto
+    del HTML lleva el token CSRF de cada petición y nunca se repetiría, y lo
+    que depende de la sesión (Vary: Cookie, Cache-Control: private) no debe
+    acabar en la caché compartida: se comprime sin pasar por ella. Las respuestas en streaming se envían
+    en gzip trozo a trozo, sin esperar al final de la página.
+    """
+
+    min_length = 200
+    # Los estáticos servidos por Django (FileResponse) hasta este tamaño se leen
+    # enteros para poder cachear su versión comprimida
+    max_archivo = 1024 * 1024
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def elegir_encoding(self, request):
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and re_accepts_br.search(ae):
+            return 'br'
+        if re_accepts_gzip.search(ae):
+            return 'gzip'
+        return None
+
+    def reutilizable(self, response, content_type):
+        if content_type == 'text/html':
+            return response.has_header('X-Prerendered')
+        if response.cookies or has_vary_header(response, 'Cookie') or has_vary_header(response, 'Authorization'):
+            return False
+        cache_control = response.get('Cache-Control', '').lower()
+        return 'private' not in cache_control and 'no-store' not in cache_control
+
+    def en_memoria(self, response):
+        nueva = HttpResponse(b''.join(response.streaming_content), status=response.status_code)
+        for cabecera, valor in response.items():
+            nueva[cabecera] = valor
+        nueva.cookies = response.cookies
+        response.close()
+        return nueva
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in TIPOS_COMPRIMIBLES:
+            return response
+        if isinstance(response, FileResponse) and 0 < int(response.get('Content-Length') or 0) <= self.max_archivo:
+            response = self.en_memoria(response)
+        if response.streaming:
+            return self.comprimir_streaming(request, response)
+        if len(response.content) < self.min_length:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = self.elegir_encoding(request)
+        if encoding is None:
+            return response
+
+        contenido = response.content
+        if self.reutilizable(response, content_type):
+            comprimido = self.comprimir_con_cache(contenido, encoding)
+        else:
+            metrics.incr('compression_uncached')
+            comprimido = self.comprimir(contenido, encoding)
+
+        if len(comprimido) >= len(contenido):
+            return response
+
+        metrics.incr(f'compression_responses_{encoding}')
+        metrics.incr('compression_bytes_original', len(contenido))
+        metrics.incr('compression_bytes_sent', len(comprimido))
+
+        response.content = comprimido
+        response['Content-Length'] = str(len(comprimido))
+        response['Content-Encoding'] = encoding
+
+        # Un ETag fuerte ya no corresponde al cuerpo comprimido
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        return response
+
+    def comprimir(self, contenido, encoding):
+        inicio = time.process_time()
+        comprimido = _comprimir(contenido, encoding)
+        metrics.observe('compression_cpu_seconds', time.process_time() - inicio)
+        return comprimido
+
+    def comprimir_con_cache(self, contenido, encoding):
+        clave = f"compresion:{encoding}:{hashlib.blake2b(contenido, digest_size=16).hexdigest()}"
+        comprimido = cache.get(clave)
+        if comprimido is None:
+            metrics.incr('compression_cache_misses')
+            comprimido = self.comprimir(contenido, encoding)
+            cache.set(clave, comprimido, getattr(settings, 'COMPRESSION_CACHE_TIMEOUT', 600))
+        else:
+            metrics.incr('compression_cache_hits')
+        return comprimido
+
+    def comprimir_streaming(self, request, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return response
+        metrics.incr('compression_responses_gzip_streaming')
+        if response.is_async:
+            response.streaming_content = _acomprimir_partes(response.streaming_content)
+        else:
+            response.streaming_content = _comprimir_partes(response.streaming_content)
+        del response['Content-Length']
+        response['Content-Encoding'] = 'gzip'
+        return response
+
+
+class ProfilingMiddleware:
+    """Perfila con cProfile las peticiones que elige profiling.motivo()
+
+    Va el último de MIDDLEWARE para medir la vista y no el resto de la
+    cadena. El ID del perfil guardado se devuelve en X-Profile-Id.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        razon = profiling.motivo(request)
+        if razon is None:
+            return self.get_response(request)
+
+        perfil = cProfile.Profile()
+        inicio = time.perf_counter()
+        perfil.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            perfil.disable()
+        duracion = time.perf_counter() - inicio
+
+        try:
+            response['X-Profile-Id'] = profiling.guardar(perfil, request, response, duracion, razon)
+        except OSError as e:
+            # Un disco lleno no debe romper la respuesta
+            logger.warning(f"No se pudo guardar el perfil: {e}")
+        return response
+
+
+class ChaosMiddleware:
+    """Aplica el perfil de caos de la cabecera X-Chaos a las llamadas a FastAPI
+
+    No hace nada salvo con CHAOS_ENABLED y DEBUG (ver caos).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        perfil = request.META.get(caos.CABECERA)
+        if not perfil or not caos.esta_activo():
+            return self.get_response(request)
+        token = caos.usar_perfil(perfil)
+        try:
+            return self.get_response(request)
+        finally:
+            caos.restaurar(token)
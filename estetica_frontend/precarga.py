@@ -0,0 +1,100 @@
+"""Cabeceras Link: rel=preload y 103 Early Hints para los estáticos críticos
+
+Cada vista pública declara con ``@precargar(...)`` el CSS y JS que su
+template necesita para pintar. La lista no depende de FastAPI, así que se
+anuncia antes de que lleguen los datos:
+
+- En la respuesta, como cabecera ``Link``. Con STREAMING_RENDER sale con la
+  primera parte de la página, mientras las llamadas al backend siguen en
+  curso.
+- Bajo ASGI, si el servidor anuncia la extensión
+  ``http.response.early_hint`` (Hypercorn, por ejemplo), ``EarlyHints``
+  envía un 103 con los mismos enlaces antes de ejecutar la vista.
+  runserver y WSGI no pueden enviar respuestas 1xx; ahí solo queda la
+  cabecera.
+
+Las imágenes de trabajos y productos van dentro del HTML como data URI, así
+que no hay petición que adelantar para ellas.
+"""
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.templatetags.static import static
+from django.urls import Resolver404, resolve
+
+from estetica_frontend import metrics
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_ASGI = 'http.response.early_hint'
+TIPOS = {'.css': 'style', '.js': 'script'}
+
+
+def esta_activo():
+    return getattr(settings, 'EARLY_HINTS_ENABLED', True)
+
+
+def enlaces(rutas):
+    """Valores ``<url>; rel=preload; as=...`` para las rutas de estáticos"""
+    resultado = []
+    for ruta in rutas:
+        tipo = next((t for ext, t in TIPOS.items() if ruta.endswith(ext)), None)
+        try:
+            url = static(ruta)
+        except ValueError:
+            # Falta en el manifest de collectstatic: el template tampoco podrá enlazarlo
+            logger.warning(f"Estático sin entrada en el manifest, no se precarga: {ruta}")
+            continue
+        resultado.append(f'<{url}>; rel=preload' + (f'; as={tipo}' if tipo else ''))
+    return resultado
+
+
+def precargar(*rutas):
+    """Decorador para vistas HTML: anuncia ``rutas`` (relativas a STATIC_URL)
+
+    Las rutas quedan en ``vista.precarga`` para que EarlyHints las encuentre
+    al resolver la URL.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            response = vista(request, *args, **kwargs)
+            if esta_activo() and response.status_code == 200 and not response.has_header('Link'):
+                valores = enlaces(rutas)
+                if valores:
+                    response['Link'] = ', '.join(valores)
+                    metrics.incr('preload_headers')
+            return response
+        envoltura.precarga = rutas
+        return envoltura
+    return decorador
+
+
+def rutas_para(path):
+    """Estáticos declarados por la vista que atiende ``path``, o ()"""
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return ()
+    return getattr(match.func, 'precarga', ())
+
+
+class EarlyHints:
+    """Envoltorio ASGI que envía 103 Early Hints antes de llamar a Django"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope['type'] == 'http'
+            and scope.get('method') == 'GET'
+            and EXTENSION_ASGI in (scope.get('extensions') or {})
+            and esta_activo()
+        ):
+            valores = enlaces(rutas_para(scope['path']))
+            if valores:
+                await send({'type': EXTENSION_ASGI, 'links': [valor.encode() for valor in valores]})
+                metrics.incr('early_hints_enviados')
+        await self.app(scope, receive, send)
@@ -0,0 +1,116 @@
+"""Prefetch especulativo de la siguiente página
+
+Después de servir una página con ``has_next`` la vista programa en segundo
+plano la petición de la siguiente y el resultado se guarda unos segundos en
+la caché compartida, dentro del espacio versionado de esos datos (ver
+cache_ns). Así, si el usuario pulsa "siguiente", la vista no espera a FastAPI.
+
+- Acotado: como mucho PREFETCH_MAX_EN_CURSO peticiones a la vez por proceso;
+  si no hay hueco no se programa nada.
+- Cancelable: cancelar(espacio) descarta las que aún no empezaron, y las que
+  ya están en curso guardan su resultado con la versión del espacio del
+  momento en que se programaron, así que tras invalidar nadie las ve.
+- Medido: prefetch_hits / prefetch_misses y el gauge prefetch_hit_rate.
+"""
+import hashlib
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from estetica_frontend import backend, cache_ns, cancelacion, metrics
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_en_curso = {}
+
+
+def esta_activo():
+    return getattr(settings, 'PREFETCH_ENABLED', True)
+
+
+def _clave(espacio, clave):
+    """Clave de caché de un prefetch; ``clave`` es cualquier valor serializable"""
+    resumen = hashlib.blake2b(json.dumps(clave, sort_keys=True).encode(), digest_size=16).hexdigest()
+    return cache_ns.clave(espacio, f'prefetch:{resumen}')
+
+
+def _publicar_tasa():
+    contadores = metrics.snapshot()['counters']
+    hits = contadores.get('prefetch_hits', 0)
+    total = hits + contadores.get('prefetch_misses', 0)
+    metrics.set_gauge('prefetch_hit_rate', round(hits / total, 3) if total else 0)
+
+
+def tomar(espacio, clave):
+    """Resultado prefetcheado para la clave, o None si no lo hay"""
+    if not esta_activo():
+        return None
+    valor = cache.get(_clave(espacio, clave))
+    metrics.incr('prefetch_hits' if valor is not None else 'prefetch_misses')
+    _publicar_tasa()
+    return valor
+
+
+def _ejecutar(clave_cache, funcion):
+    try:
+        resultado = funcion()
+    except Exception as e:
+        logger.warning(f"Prefetch fallido: {e}")
+        metrics.incr('prefetch_errors')
+        return
+    # None = la respuesta no era cacheable (error, 401...)
+    if resultado is not None:
+        cache.set(clave_cache, resultado, getattr(settings, 'PREFETCH_TTL', 30))
+        metrics.incr('prefetch_completed')
+
+
+def _terminar(clave_cache):
+    with _lock:
+        _en_curso.pop(clave_cache, None)
+
+
+def programar(espacio, clave, funcion):
+    """Lanza funcion() en segundo plano y guarda su resultado para tomar()
+
+    Returns:
+        True si se programó, False si ya estaba hecho, en curso o no había hueco
+    """
+    if not esta_activo():
+        return False
+
+    clave_cache = _clave(espacio, clave)
+    if cache.get(clave_cache) is not None:
+        return False
+
+    with _lock:
+        if clave_cache in _en_curso:
+            return False
+        if len(_en_curso) >= getattr(settings, 'PREFETCH_MAX_EN_CURSO', 4):
+            metrics.incr('prefetch_skipped')
+            return False
+        _en_curso[clave_cache] = None
+
+    # Es para la próxima página: no se cancela si el cliente deja esta
+    with cancelacion.independiente():
+        futuro = backend.submit(lambda: _ejecutar(clave_cache, funcion))
+    with _lock:
+        if clave_cache in _en_curso:
+            _en_curso[clave_cache] = futuro
+    futuro.add_done_callback(lambda f: _terminar(clave_cache))
+    metrics.incr('prefetch_scheduled')
+    return True
+
+
+def cancelar(espacio):
+    """Cancela los prefetch del espacio que todavía no empezaron"""
+    prefijo = f'{espacio}:'
+    with _lock:
+        futuros = [f for c, f in _en_curso.items() if c.startswith(prefijo) and f is not None]
+    cancelados = sum(1 for futuro in futuros if futuro.cancel())
+    if cancelados:
+        metrics.incr('prefetch_cancelled', cancelados)
+    return cancelados
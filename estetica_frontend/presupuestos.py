@@ -0,0 +1,129 @@
+"""Presupuestos de llamadas a FastAPI para los tests
+
+Igual que ``assertNumQueries`` para la base de datos: cuenta las llamadas
+del cliente compartido (ver backend), los bytes que mueven y el tiempo de
+la vista, y falla si alguna cifra supera lo permitido.
+
+    with self.assertLlamadasBackend(2):
+        self.client.get('/jobs/')
+
+Los presupuestos de las vistas principales están en presupuestos.json; cada
+caso indica la URL, la grabación con la que se reproduce (ver grabacion) y
+los límites. ``comprobar_presupuestos`` los recorre desde los tests de cada
+app.
+
+Las llamadas y los bytes son deterministas con las grabaciones y se comprueban
+siempre. ``max_segundos`` depende de la máquina (un CI compartido puede ir
+lento) y solo se comprueba con BACKEND_BUDGET_TIMES=True.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+
+from estetica_frontend import backend
+from estetica_frontend.grabacion import reproduciendo
+
+ARCHIVO = Path(__file__).resolve().parent / 'presupuestos.json'
+
+
+class Llamadas:
+    """Llamadas a FastAPI registradas dentro de un bloque"""
+
+    def __init__(self):
+        self.registro = []
+        self.segundos = 0.0
+        self._lock = threading.Lock()
+
+    def _anotar(self, method, url, response, segundos):
+        enviados = response.request.body if response.request is not None else None
+        with self._lock:
+            self.registro.append({
+                'metodo': method,
+                'ruta': urlsplit(url).path,
+                'bytes': len(enviados or b'') + len(response.content),
+                'segundos': segundos,
+            })
+
+    def __len__(self):
+        return len(self.registro)
+
+    @property
+    def bytes(self):
+        return sum(llamada['bytes'] for llamada in self.registro)
+
+    def resumen(self):
+        return '\n'.join(
+            f"{i}. {llamada['metodo']} {llamada['ruta']} ({llamada['bytes']} bytes)"
+            for i, llamada in enumerate(self.registro, 1)
+        )
+
+
+@contextmanager
+def contar_llamadas():
+    """Registra las llamadas a FastAPI del bloque, también las de otros hilos"""
+    llamadas = Llamadas()
+    quitar = backend.observar(llamadas._anotar)
+    inicio = time.monotonic()
+    try:
+        yield llamadas
+    finally:
+        llamadas.segundos = time.monotonic() - inicio
+        quitar()
+
+
+class PresupuestoBackendMixin:
+    """Asserts de presupuesto para un TestCase"""
+
+    @contextmanager
+    def assertLlamadasBackend(self, num, max_bytes=None, max_segundos=None):
+        with contar_llamadas() as llamadas:
+            yield llamadas
+        self.assertEqual(
+            len(llamadas), num,
+            f'{len(llamadas)} llamadas a FastAPI, se esperaban {num}:\n{llamadas.resumen()}'
+        )
+        if max_bytes is not None:
+            self.assertLessEqual(
+                llamadas.bytes, max_bytes,
+                f'{llamadas.bytes} bytes con FastAPI, el máximo es {max_bytes}:\n{llamadas.resumen()}'
+            )
+        if max_segundos is not None:
+            self.assertLessEqual(
+                llamadas.segundos, max_segundos,
+                f'La vista tardó {llamadas.segundos:.3f} s, el máximo es {max_segundos} s'
+            )
+
+
+def cargar_presupuestos():
+    with open(ARCHIVO, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comprobar_presupuestos(test, prefijo):
+    """Ejecuta cada caso de presupuestos.json cuya vista empieza por ``prefijo``"""
+    casos = {nombre: caso for nombre, caso in cargar_presupuestos().items() if caso['vista'].startswith(prefijo)}
+    test.assertTrue(casos, f'No hay presupuestos para {prefijo}')
+
+    for nombre, caso in casos.items():
+        with test.subTest(nombre):
+            # Cada caso parte de cachés vacías: se mide el peor caso
+            cache.clear()
+            sesion = test.client.session
+            sesion.clear()
+            sesion.update(caso.get('sesion', {}))
+            sesion.save()
+
+            with reproduciendo(Path(settings.BASE_DIR) / caso['grabacion']):
+                max_segundos = caso.get('max_segundos') if getattr(settings, 'BACKEND_BUDGET_TIMES', False) else None
+                with test.assertLlamadasBackend(caso['llamadas'], caso.get('max_bytes'), max_segundos):
+                    if caso.get('metodo', 'GET') == 'POST':
+                        response = test.client.post(caso['url'], caso.get('datos', {}))
+                    else:
+                        response = test.client.get(caso['url'])
+            test.assertEqual(response.status_code, caso.get('status', 200))
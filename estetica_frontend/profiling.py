@@ -0,0 +1,176 @@
+"""Perfilado con cProfile de peticiones concretas
+
+Desactivado salvo PROFILING_ENABLED. Con él activo, ProfilingMiddleware
+perfila una petición cuando:
+
+- trae en la cabecera X-Profile-Token el token que el panel /profiles/ da
+  al admin. Va firmado y atado a su sesión, vale PROFILING_TOKEN_MAX_AGE
+  segundos y no se acepta en la URL, donde acabaría en logs y Referer, o
+- cae en el muestreo de 1 de cada PROFILING_SAMPLE_RATE peticiones.
+
+Cada perfil se guarda en PROFILING_DIR como .prof (se abre con pstats o
+snakeviz) más un .json con la ruta, la duración y las funciones que más
+tiempo acumulan; solo se conservan los PROFILING_MAX_FILES más recientes.
+
+cProfile mide el hilo de la vista: las llamadas que backend.parallel manda
+a otros hilos aparecen como espera, y en las respuestas en streaming el
+render de las partes ocurre después y no entra en el perfil.
+"""
+import hashlib
+import io
+import json
+import pstats
+import random
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.shortcuts import redirect, render
+
+from estetica_frontend import metrics
+from estetica_frontend.bootstrap import usuario_actual
+from estetica_frontend.jsoncodec import JsonResponse
+
+ID_VALIDO = re.compile(r'^[\w-]+$')
+SALT = 'estetica_frontend.profiling'
+CABECERA = 'HTTP_X_PROFILE_TOKEN'
+TOP_FUNCIONES = 15
+
+
+def esta_activo():
+    return getattr(settings, 'PROFILING_ENABLED', False)
+
+
+def get_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def _sesion(request):
+    """Hash de la clave de sesión (el token firmado lleva el valor en claro)"""
+    clave = getattr(request, 'session', None) and request.session.session_key
+    return hashlib.sha256(clave.encode()).hexdigest() if clave else None
+
+
+def generar_token(request):
+    """Token para perfilar las peticiones de esta misma sesión"""
+    if not request.session.session_key:
+        request.session.save()
+    return signing.TimestampSigner(salt=SALT).sign(_sesion(request))
+
+
+def token_valido(token, request):
+    sesion = _sesion(request)
+    if sesion is None:
+        return False
+    try:
+        valor = signing.TimestampSigner(salt=SALT).unsign(
+            token, max_age=getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+        )
+    except signing.BadSignature:
+        return False
+    return valor == sesion
+
+
+def motivo(request):
+    """Por qué perfilar esta petición ('token' o 'muestreo'), o None"""
+    if not esta_activo():
+        return None
+    token = request.META.get(CABECERA)
+    if token and token_valido(token, request):
+        return 'token'
+    tasa = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+    if tasa and random.random() < 1 / tasa:
+        return 'muestreo'
+    return None
+
+
+def _resumen(perfil):
+    """Las funciones con más tiempo acumulado, para mostrarlas sin abrir el .prof"""
+    stats = pstats.Stats(perfil, stream=io.StringIO())
+    filas = []
+    for (archivo, linea, funcion), (_, llamadas, propio, acumulado, _) in stats.stats.items():
+        filas.append({
+            'funcion': f'{funcion} ({Path(archivo).name}:{linea})',
+            'llamadas': llamadas,
+            'propio': round(propio, 4),
+            'acumulado': round(acumulado, 4),
+        })
+    filas.sort(key=lambda f: f['acumulado'], reverse=True)
+    return filas[:TOP_FUNCIONES]
+
+
+def guardar(perfil, request, response, duracion, razon):
+    """Escribe el perfil y su resumen; devuelve el ID"""
+    directorio = get_dir()
+    directorio.mkdir(parents=True, exist_ok=True)
+    perfil_id = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{uuid.uuid4().hex[:4]}"
+
+    perfil.dump_stats(directorio / f'{perfil_id}.prof')
+    meta = {
+        'id': perfil_id,
+        'metodo': request.method,
+        'ruta': request.get_full_path(),
+        'status': response.status_code,
+        'streaming': response.streaming,
+        'duracion': round(duracion, 4),
+        'motivo': razon,
+        'creado': datetime.now().isoformat(timespec='seconds'),
+        'top': _resumen(perfil),
+    }
+    (directorio / f'{perfil_id}.json').write_text(json.dumps(meta))
+
+    _aplicar_retencion(directorio)
+    metrics.incr(f'profiles_{razon}')
+    return perfil_id
+
+
+def _aplicar_retencion(directorio):
+    maximo = getattr(settings, 'PROFILING_MAX_FILES', 50)
+    metas = sorted(directorio.glob('*.json'), reverse=True)
+    for meta in metas[maximo:]:
+        meta.unlink(missing_ok=True)
+        meta.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def listar():
+    perfiles = []
+    for meta in sorted(get_dir().glob('*.json'), reverse=True):
+        try:
+            perfiles.append(json.loads(meta.read_text()))
+        except (OSError, ValueError):
+            continue
+    return perfiles
+
+
+# ==================== VISTAS ====================
+
+def _es_admin(request):
+    usuario = usuario_actual(request.session.get('access_token'))
+    return isinstance(usuario, dict) and bool(usuario.get('is_admin'))
+
+
+def profiles_view(request):
+    """Panel de perfiles guardados (solo administradores)"""
+    if not _es_admin(request):
+        return redirect('authentication:login_page')
+    return render(request, 'profiling/lista.html', {
+        'perfiles': listar(),
+        'activo': esta_activo(),
+        'token': generar_token(request),
+        'tasa': getattr(settings, 'PROFILING_SAMPLE_RATE', 0),
+        'max_age': getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600),
+    })
+
+
+def profile_download(request, perfil_id):
+    """Descarga del .prof para abrirlo con pstats o snakeviz"""
+    if not _es_admin(request):
+        return JsonResponse({'detail': 'Permisos de administrador requeridos'}, status=403)
+    path = get_dir() / f'{perfil_id}.prof'
+    if not ID_VALIDO.match(perfil_id) or not path.is_file():
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
@@ -0,0 +1,186 @@
+"""Limitación de peticiones (token bucket) compartida entre procesos
+
+Los buckets viven en un archivo mapeado en memoria (por defecto en /dev/shm),
+así que todos los workers de la máquina ven los mismos contadores. Cada
+ranura guarda el hash de la clave, los tokens que quedan y la hora del
+último relleno; el acceso se serializa con flock entre procesos y con un
+lock entre hilos del mismo proceso.
+
+Los límites se configuran por ruta en RATE_LIMITS:
+
+    'login': {'cliente': '10/m', 'total': '300/m'}
+
+``cliente`` se aplica por IP y por sesión; ``total`` es opcional y limita la
+ruta entera para que un ataque repartido no llegue completo a FastAPI.
+"""
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+
+from estetica_frontend import metrics
+from estetica_frontend.jsoncodec import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+# hash de la clave, tokens disponibles, último relleno
+RANURA = struct.Struct('<Qdd')
+# Ranuras consecutivas que se miran antes de reemplazar la más antigua
+SONDEOS = 4
+
+UNIDADES = {'s': 1, 'm': 60, 'h': 3600}
+
+_lock = threading.Lock()
+_tabla = None
+
+
+def esta_activo():
+    return getattr(settings, 'RATE_LIMIT_ENABLED', True)
+
+
+def parse_limite(texto):
+    """'10/m' -> (capacidad 10, 10/60 tokens por segundo)"""
+    cantidad, unidad = texto.split('/')
+    capacidad = int(cantidad)
+    return capacidad, capacidad / UNIDADES[unidad]
+
+
+def _abrir():
+    """Mapea el archivo de buckets; se reabre tras un fork para que flock
+    distinga a cada proceso"""
+    global _tabla
+    if _tabla is None or _tabla['pid'] != os.getpid():
+        ruta = Path(getattr(settings, 'RATE_LIMIT_FILE', settings.BASE_DIR / 'ratelimit.bin'))
+        ranuras = getattr(settings, 'RATE_LIMIT_SLOTS', 4096)
+        tamano = ranuras * RANURA.size
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(fd).st_size < tamano:
+            os.ftruncate(fd, tamano)
+        _tabla = {'pid': os.getpid(), 'fd': fd, 'mapa': mmap.mmap(fd, tamano), 'ranuras': ranuras}
+    return _tabla
+
+
+def _hash(clave):
+    return int.from_bytes(hashlib.blake2b(clave.encode(), digest_size=8).digest(), 'little') or 1
+
+
+def consumir(clave, capacidad, por_segundo):
+    """Saca un token del bucket de la clave
+
+    Returns:
+        (permitido, segundos hasta que haya un token)
+    """
+    h = _hash(clave)
+    ahora = time.time()
+    with _lock:
+        tabla = _abrir()
+        mapa, ranuras = tabla['mapa'], tabla['ranuras']
+        fcntl.flock(tabla['fd'], fcntl.LOCK_EX)
+        try:
+            inicio = h % ranuras
+            indice = None
+            reemplazo, mas_antigua = inicio, math.inf
+            for i in range(SONDEOS):
+                posible = (inicio + i) % ranuras
+                guardada, tokens, ultimo = RANURA.unpack_from(mapa, posible * RANURA.size)
+                if guardada == h:
+                    indice = posible
+                    break
+                if ultimo < mas_antigua:
+                    reemplazo, mas_antigua = posible, ultimo
+
+            if indice is None:
+                # Clave nueva (o expulsada): empieza con el bucket lleno
+                indice, tokens = reemplazo, capacidad
+            else:
+                tokens = min(capacidad, tokens + (ahora - ultimo) * por_segundo)
+
+            if tokens >= 1:
+                tokens -= 1
+                resultado = (True, 0)
+            else:
+                resultado = (False, (1 - tokens) / por_segundo)
+            RANURA.pack_into(mapa, indice * RANURA.size, h, tokens, ahora)
+        finally:
+            fcntl.flock(tabla['fd'], fcntl.LOCK_UN)
+    return resultado
+
+
+def ip_cliente(request):
+    """IP del cliente; X-Forwarded-For solo si hay un proxy de confianza delante"""
+    if getattr(settings, 'RATE_LIMIT_TRUST_X_FORWARDED_FOR', False):
+        reenviada = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if reenviada:
+            # La última IP es la que añadió nuestro proxy; las anteriores las manda el cliente
+            return reenviada.split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def comprobar(request, nombre):
+    """Devuelve un 429 si la petición supera algún límite de la ruta, si no None"""
+    limites = getattr(settings, 'RATE_LIMITS', {}).get(nombre)
+    if not esta_activo() or not limites:
+        return None
+
+    claves = []
+    if limites.get('cliente'):
+        capacidad, por_segundo = parse_limite(limites['cliente'])
+        claves.append((f'{nombre}:ip:{ip_cliente(request)}', capacidad, por_segundo))
+        sesion = getattr(request, 'session', None)
+        if sesion is not None and sesion.session_key:
+            claves.append((f'{nombre}:sesion:{sesion.session_key}', capacidad, por_segundo))
+    if limites.get('total'):
+        capacidad, por_segundo = parse_limite(limites['total'])
+        claves.append((f'{nombre}:total', capacidad, por_segundo))
+
+    # En orden y parando en el primer rechazo: lo que ya frenó el límite del
+    # cliente no gasta tokens del total, así un cliente no deja sin servicio a los demás
+    espera = 0
+    for clave, capacidad, por_segundo in claves:
+        try:
+            permitido, segundos = consumir(clave, capacidad, por_segundo)
+        except OSError as e:
+            # Sin archivo de buckets no se limita: mejor dejar pasar que tumbar el login
+            logger.warning(f"Rate limit desactivado, no se pudo usar el archivo: {e}")
+            return None
+        if not permitido:
+            espera = segundos
+            if clave.endswith(':total'):
+                metrics.incr(f'ratelimit_shed_{nombre}')
+            break
+
+    if not espera:
+        return None
+
+    metrics.incr('ratelimit_rejected')
+    metrics.incr(f'ratelimit_rejected_{nombre}')
+    reintentar = max(1, math.ceil(espera))
+    response = JsonResponse(
+        {'detail': f'Demasiadas solicitudes, intenta de nuevo en {reintentar} segundos'},
+        status=429
+    )
+    response['Retry-After'] = str(reintentar)
+    return response
+
+
+def rate_limit(nombre):
+    """Decorador para vistas: aplica los límites de RATE_LIMITS[nombre]"""
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            rechazo = comprobar(request, nombre)
+            if rechazo is not None:
+                return rechazo
+            return vista(request, *args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,102 @@
+"""Service worker y manifest de precache
+
+/sw.js guarda en el navegador lo que un visitante que vuelve no necesita
+descargar otra vez:
+
+- CSS/JS del bundle (precacheados al instalar) e imágenes: cache-first.
+- El listado de /products/api/ (solo esa ruta, no el detalle) y las páginas
+  públicas de la galería: stale-while-revalidate. Una petición con
+  ``cache: 'no-store'`` o ``'reload'`` va a la red y refresca la copia; el
+  catálogo la usa tras crear, editar o borrar para ver su propio cambio.
+
+Nunca se guardan respuestas con ``Vary: Cookie`` (dependen de la sesión) ni
+las rutas de EXCLUIR. El manifest va incrustado en /sw.js, así que cualquier
+cambio de estáticos en un despliegue cambia la versión, el navegador instala
+el worker nuevo y éste borra las cachés de la versión anterior. Con
+SERVICE_WORKER_ENABLED=False /sw.js borra las cachés y se da de baja.
+"""
+import hashlib
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import HttpResponse
+from django.template.loader import get_template
+from django.templatetags.static import static
+from django.urls import reverse
+
+from estetica_frontend.jsoncodec import JsonResponse
+
+PREFIJOS_PRECACHE = ('css/', 'js/')
+# Herramientas internas: no merece la pena guardarlas en cada visitante
+NO_PRECACHEAR = ('css/jobs/admin/', 'js/jobs/admin/', 'css/profiling/')
+EXCLUIR = ('/jobs/admin/', '/auth/', '/profiles/', '/metrics/', '/health/', '/ready/', '/admin/')
+
+
+def esta_activo():
+    return getattr(settings, 'SERVICE_WORKER_ENABLED', True)
+
+
+def _archivos_estaticos():
+    """Rutas relativas del bundle: las del manifest de collectstatic o, sin él, las de los finders"""
+    hashed = getattr(staticfiles_storage, 'hashed_files', None)
+    if hashed:
+        return sorted(hashed)
+    rutas = set()
+    for finder in finders.get_finders():
+        for path, _ in finder.list(['*.map']):
+            rutas.add(path.replace('\\', '/'))
+    return sorted(rutas)
+
+
+@lru_cache(maxsize=1)
+def generar_manifest():
+    """Manifest del precache y reglas de caché; se calcula una vez por proceso"""
+    precache = [
+        static(path) for path in _archivos_estaticos()
+        if path.startswith(PREFIJOS_PRECACHE) and not path.startswith(NO_PRECACHEAR)
+    ]
+    manifest = {
+        'precache': precache,
+        'static_url': settings.STATIC_URL,
+        # Prefijos de ruta; las de 'stale_while_revalidate_exactas' tienen que coincidir enteras
+        'stale_while_revalidate': [
+            reverse('jobs:galeria'),
+        ],
+        'stale_while_revalidate_exactas': [
+            reverse('products:api_list'),
+        ],
+        'excluir': list(EXCLUIR),
+        'max_entradas': {
+            'estaticos': getattr(settings, 'SERVICE_WORKER_MAX_STATIC', 100),
+            'imagenes': getattr(settings, 'SERVICE_WORKER_MAX_IMAGES', 150),
+            'datos': getattr(settings, 'SERVICE_WORKER_MAX_DATA', 60),
+        },
+    }
+    # La versión depende también del código del worker
+    plantilla = get_template('service_worker.js').template.source
+    contenido = json.dumps(manifest, sort_keys=True) + plantilla
+    manifest['version'] = hashlib.blake2b(contenido.encode(), digest_size=6).hexdigest()
+    return manifest
+
+
+def service_worker_view(request):
+    """/sw.js: tiene que servirse desde la raíz para controlar todo el sitio"""
+    manifest = generar_manifest()
+    contenido = get_template('service_worker.js').render({
+        'activo': esta_activo(),
+        'manifest_json': json.dumps(manifest),
+    })
+    response = HttpResponse(contenido, content_type='application/javascript; charset=utf-8')
+    # El navegador comprueba si cambió en cada navegación; nunca de una caché intermedia
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def manifest_view(request):
+    """El mismo manifest que lleva /sw.js, para depurar"""
+    response = JsonResponse(generar_manifest())
+    response['Cache-Control'] = 'no-cache'
+    return response
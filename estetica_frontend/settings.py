@@ -40,16 +40,20 @@ INSTALLED_APPS = [
     'authentication',
     'products',
     'jobs',
+    'estetica_frontend',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'estetica_frontend.middleware.CompressionCacheMiddleware',
+    'estetica_frontend.middleware.ChaosMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'estetica_frontend.middleware.ProfilingMiddleware',
 ]
 
 # Configuración de sesiones (necesario para guardar tokens)
@@ -124,6 +128,16 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# CSS/JS minificados y con hash del contenido (requiere collectstatic)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'estetica_frontend.storage.MinifiedManifestStaticFilesStorage',
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -156,6 +170,154 @@ LOGGING = {
 # Configuración para conectar con FastAPI
 FASTAPI_BASE_URL = os.environ.get('FASTAPI_BASE_URL', 'http://localhost:8000')
 print(f"🔌 Conectando a FastAPI en: {FASTAPI_BASE_URL}")
+
+# Varias instancias de FastAPI (ver estetica_frontend.upstreams). Las URLs se
+# construyen con FASTAPI_BASE_URL y se reparten entre estas, con el mismo formato.
+FASTAPI_UPSTREAMS = [u for u in os.environ.get('FASTAPI_UPSTREAMS', '').split(',') if u.strip()]
+FASTAPI_UPSTREAMS_ESCRITURA = [u for u in os.environ.get('FASTAPI_UPSTREAMS_ESCRITURA', '').split(',') if u.strip()]
+UPSTREAM_BALANCEO = os.environ.get('UPSTREAM_BALANCEO', 'ewma')  # o 'menos_pendientes'
+UPSTREAM_FALLOS_EXPULSION = 3
+UPSTREAM_EXPULSION_SEGUNDOS = 30
+UPSTREAM_HEALTH_PATH = os.environ.get('UPSTREAM_HEALTH_PATH', '/health')
+UPSTREAM_HEALTH_INTERVALO = 10
+
+# Caché compartida por todos los workers. Con CACHE_REDIS_URL se usa Redis
+# (varios nodos; requiere el paquete redis), si no archivos en CACHE_DIR
+# (todos los procesos de la misma máquina). En tests se puede sustituir por
+# LocMemCache con override_settings.
+if os.environ.get('CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_REDIS_URL'],
+            'KEY_PREFIX': 'estetica',
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', str(BASE_DIR / 'cache')),
+            'TIMEOUT': 300,
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+PRODUCT_CACHE_TTL = 60
+GALERIA_CACHE_TTL = 300
+
+# Warmup al arrancar (ver /ready/ y python manage.py warmup)
+WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'True') == 'True'
+
+# Prefetch en segundo plano de la siguiente página de galería y panel
+PREFETCH_ENABLED = os.environ.get('PREFETCH_ENABLED', 'True') == 'True'
+PREFETCH_TTL = 30
+PREFETCH_MAX_EN_CURSO = 4
+
+# Perfilado con cProfile bajo demanda (token de /profiles/) o 1 de cada N peticiones
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SAMPLE_RATE = int(os.environ.get('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_MAX_FILES = 50
+PROFILING_TOKEN_MAX_AGE = 3600
+
+# Memoria de las vistas con payloads grandes: RSS siempre, tracemalloc 1 de cada N
+MEMORY_PROFILING_ENABLED = os.environ.get('MEMORY_PROFILING_ENABLED', 'False') == 'True'
+MEMORY_PROFILING_SAMPLE_RATE = int(os.environ.get('MEMORY_PROFILING_SAMPLE_RATE', '20'))
+MEMORY_PROFILING_TOP = 10
+MEMORY_PROFILING_RSS_WARN_MB = 50
+
+# Grabar el tráfico con FastAPI a un .jsonl o reproducirlo sin red (ver estetica_frontend.grabacion)
+BACKEND_RECORD_FILE = os.environ.get('BACKEND_RECORD_FILE') or None
+BACKEND_REPLAY_FILE = os.environ.get('BACKEND_REPLAY_FILE') or None
+BACKEND_REPLAY_LATENCY_SCALE = float(os.environ.get('BACKEND_REPLAY_LATENCY_SCALE', '1.0'))
+# Comprobar también los max_segundos de presupuestos.json (solo en máquinas con tiempos estables)
+BACKEND_BUDGET_TIMES = os.environ.get('BACKEND_BUDGET_TIMES', 'False') == 'True'
+
+# Tarjetas de trabajos renderizadas, por ID y hash de sus datos (ver estetica_frontend.fragmentos)
+FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'True') == 'True'
+FRAGMENT_CACHE_TTL = 86400
+
+# Cabeceras Link: rel=preload y 103 Early Hints (bajo ASGI) para el CSS/JS de cada página
+EARLY_HINTS_ENABLED = os.environ.get('EARLY_HINTS_ENABLED', 'True') == 'True'
+
+# Redes que pueden leer /metrics/ sin sesión de administrador (scraper de monitorización)
+METRICS_ALLOWED_NETWORKS = [
+    red.strip() for red in os.environ.get('METRICS_ALLOWED_NETWORKS', '127.0.0.1/32,::1/128').split(',') if red.strip()
+]
+
+# Service worker: caché en el navegador de estáticos, imágenes, catálogo y galería
+SERVICE_WORKER_ENABLED = os.environ.get('SERVICE_WORKER_ENABLED', 'True') == 'True'
+SERVICE_WORKER_MAX_STATIC = 100
+SERVICE_WORKER_MAX_IMAGES = 150
+SERVICE_WORKER_MAX_DATA = 60
+
+# Fallos y latencia inyectados en las llamadas a FastAPI; solo con DEBUG (ver estetica_frontend.caos)
+CHAOS_ENABLED = os.environ.get('CHAOS_ENABLED', 'False') == 'True'
+CHAOS_RULES = []
+CHAOS_PROFILES = {
+    'lento': [{'patron': r'/api/', 'latencia': {'mediana': 2.0, 'p99': 6.0}}],
+    'inestable': [{'patron': r'/api/', 'latencia': [0.05, 0.5], 'desconexion': 0.05, 'error': 0.05}],
+    'caido': [{'patron': r'/api/', 'desconexion': 1.0}],
+    'errores': [{'patron': r'/api/', 'error': 1.0, 'status': 500}],
+    'truncado': [{'patron': r'/api/', 'truncar': 1.0}],
+    'trabajos_lentos': [{'patron': r'/api/trabajos/', 'metodo': 'GET', 'latencia': 2.0}],
+}
+
+# Páginas públicas pre-renderizadas (python manage.py prerender_trabajos)
+PRERENDER_ENABLED = os.environ.get('PRERENDER_ENABLED', 'True') == 'True'
+PRERENDER_ROOT = BASE_DIR / 'prerendered'
+
+# Cola local de subidas de imágenes (python manage.py procesar_subidas)
+UPLOAD_QUEUE_DIR = BASE_DIR / 'upload_queue'
+UPLOAD_QUEUE_WORKERS = 2
+UPLOAD_QUEUE_MAX_ATTEMPTS = 5
+UPLOAD_QUEUE_POLL_SECONDS = 2
+
+# Normalización de imágenes antes de enviarlas a FastAPI
+IMAGE_MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+IMAGE_MAX_DIMENSION = 1600
+IMAGE_JPEG_QUALITY = 82
+IMAGE_DEDUP_TTL = 86400
+
+# Render en streaming de galería, panel de trabajos y catálogo
+STREAMING_RENDER = os.environ.get('STREAMING_RENDER', 'False') == 'True'
+
+# Compresión de respuestas (brotli se usa solo si el paquete está instalado)
+COMPRESSION_CACHE_TIMEOUT = 600
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Llamadas simultáneas a FastAPI por grupo de endpoints, por proceso.
+# 'espera' son los segundos en cola antes de rechazar (0 = rechazar en el acto)
+BACKEND_BULKHEADS = {
+    'auth': {'limite': 10, 'espera': 2},
+    'trabajos_lectura': {'limite': 12, 'espera': 3},
+    'trabajos_escritura': {'limite': 4, 'espera': 5},
+    'productos': {'limite': 8, 'espera': 3},
+    'subidas': {'limite': 2, 'espera': 10},
+}
+
+# Codec JSON de proxies y backend: 'auto' usa orjson si está instalado
+JSON_CODEC = os.environ.get('JSON_CODEC', 'auto')
+
+# Límites de peticiones por ruta (token bucket compartido entre procesos)
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True') == 'True'
+RATE_LIMIT_FILE = os.environ.get(
+    'RATE_LIMIT_FILE',
+    '/dev/shm/estetica_ratelimit' if os.path.isdir('/dev/shm') else str(BASE_DIR / 'ratelimit.bin'),
+)
+RATE_LIMIT_SLOTS = 4096
+RATE_LIMIT_TRUST_X_FORWARDED_FOR = os.environ.get('RATE_LIMIT_TRUST_X_FORWARDED_FOR', 'False') == 'True'
+RATE_LIMITS = {
+    'login': {'cliente': '10/m', 'total': '300/m'},
+    'register': {'cliente': '5/m', 'total': '60/m'},
+    'forgot_password': {'cliente': '3/m', 'total': '60/m'},
+    'verify_reset_code': {'cliente': '10/m', 'total': '300/m'},
+    'reset_password': {'cliente': '5/m', 'total': '120/m'},
+    'products_read': {'cliente': '120/m', 'total': '3000/m'},
+    'products_write': {'cliente': '60/m'},
+}
+
 CSRF_COOKIE_HTTPONLY = False  # Permite que JavaScript acceda a la cookie
 CSRF_COOKIE_NAME = 'csrftoken'
 CSRF_COOKIE_SAMESITE = 'Lax'
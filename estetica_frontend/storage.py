@@ -0,0 +1,189 @@
+"""Almacenamiento de archivos estáticos con hash en el nombre y minificado
+
+collectstatic copia cada CSS/JS minificado a STATIC_ROOT y después
+ManifestStaticFilesStorage genera la copia con el hash del contenido
+(ej: css/jobs/galeria.4f1c2a9b0e3d.css) y el staticfiles.json.
+"""
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+
+# Cadenas y comentarios de CSS; solo se tocan los espacios fuera de las cadenas
+CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+
+
+def _minificar_css_fuera_de_cadenas(texto):
+    texto = re.sub(r'\s+', ' ', texto)
+    texto = re.sub(r'\s*([{};,])\s*', r'\1', texto)
+    return texto.replace(';}', '}')
+
+
+def minificar_css(texto):
+    """Quita comentarios y espacios sobrantes sin tocar cadenas, selectores ni valores
+
+    No se quitan los espacios tras ':' porque en un selector (``a :hover``)
+    cambian su significado.
+    """
+    partes = []
+    codigo = ''  # lo que hay desde la última cadena, ya sin comentarios
+    posicion = 0
+    for token in CSS_TOKENS.finditer(texto):
+        codigo += texto[posicion:token.start()]
+        if token.group(1):
+            partes.append(_minificar_css_fuera_de_cadenas(codigo))
+            partes.append(token.group(1))
+            codigo = ''
+        posicion = token.end()
+    partes.append(_minificar_css_fuera_de_cadenas(codigo + texto[posicion:]))
+    return ''.join(partes).strip()
+
+
+# Tras estos caracteres (o palabras) una '/' empieza una expresión regular y no una división
+ANTES_DE_REGEX = set('(,=:[!&|?{};+-*%<>~^')
+PALABRAS_ANTES_DE_REGEX = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw'}
+
+
+def _saltos_en_literal(texto):
+    """Para cada salto de línea, True si cae dentro de un template literal o cadena continuada
+
+    Devuelve None si el texto no se entiende (cadena o regex sin cerrar):
+    en ese caso no se minifica.
+    """
+    saltos = []
+    pila = []  # 'plantilla' o la profundidad de llaves dentro de un ${ }
+    anterior = ''  # último carácter significativo en código
+    palabra = ''
+    i, n = 0, len(texto)
+    while i < n:
+        c = texto[i]
+        if pila and pila[-1] == 'plantilla':
+            if c == '\\':
+                if texto[i + 1:i + 2] == '\n':
+                    saltos.append(True)
+                i += 2
+                continue
+            if c == '\n':
+                saltos.append(True)
+            elif c == '`':
+                pila.pop()
+                anterior, palabra = '`', ''
+            elif c == '$' and texto[i + 1:i + 2] == '{':
+                pila.append(0)
+                anterior, palabra = '{', ''
+                i += 1
+            i += 1
+            continue
+
+        if c == '\n':
+            saltos.append(False)
+        elif c in ' \t\r':
+            pass
+        elif texto.startswith('//', i):
+            fin = texto.find('\n', i)
+            i = n if fin == -1 else fin
+            continue
+        elif texto.startswith('/*', i):
+            fin = texto.find('*/', i + 2)
+            if fin == -1:
+                return None
+            saltos.extend(False for _ in range(texto.count('\n', i, fin)))
+            i = fin + 2
+            continue
+        elif c in '\'"':
+            i += 1
+            while i < n and texto[i] != c:
+                if texto[i] == '\n':
+                    return None
+                if texto[i] == '\\':
+                    if texto[i + 1:i + 2] == '\n':
+                        saltos.append(True)
+                    i += 1
+                i += 1
+            if i >= n:
+                return None
+            anterior, palabra = c, ''
+        elif c == '`':
+            pila.append('plantilla')
+        elif c == '/' and (not anterior or anterior in ANTES_DE_REGEX or palabra in PALABRAS_ANTES_DE_REGEX):
+            i += 1
+            en_clase = False
+            while i < n and (texto[i] != '/' or en_clase):
+                if texto[i] == '\n':
+                    return None
+                if texto[i] == '\\':
+                    i += 1
+                elif texto[i] == '[':
+                    en_clase = True
+                elif texto[i] == ']':
+                    en_clase = False
+                i += 1
+            if i >= n:
+                return None
+            anterior, palabra = '/', ''
+        else:
+            if pila and c == '{':
+                pila[-1] += 1
+            elif pila and c == '}':
+                if pila[-1] == 0:
+                    # Fin del ${ }: se vuelve al template literal
+                    pila.pop()
+                    i += 1
+                    continue
+                pila[-1] -= 1
+            palabra = palabra + c if c.isalnum() or c in '_$' else ''
+            anterior = c
+        i += 1
+    if pila:
+        return None
+    return saltos
+
+
+def minificar_js(texto):
+    """Quita indentación, espacios finales y líneas vacías; conserva los saltos de línea (ASI)
+
+    Las líneas que empiezan o terminan dentro de un template literal (o de
+    una cadena continuada con \\) conservan sus espacios por ese lado.
+    """
+    saltos = _saltos_en_literal(texto)
+    if saltos is None:
+        return texto
+    lineas = texto.split('\n')
+    resultado = []
+    for k, linea in enumerate(lineas):
+        empieza_en_literal = k > 0 and saltos[k - 1]
+        termina_en_literal = k < len(saltos) and saltos[k]
+        if not empieza_en_literal:
+            linea = linea.lstrip()
+        if not termina_en_literal:
+            linea = linea.rstrip()
+        if linea or empieza_en_literal or termina_en_literal:
+            resultado.append(linea)
+    return '\n'.join(resultado) + '\n'
+
+
+MINIFICADORES = {
+    '.css': minificar_css,
+    '.js': minificar_js,
+}
+
+
+class MinifiedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage que minifica los CSS/JS propios al recolectarlos"""
+
+    # Solo se minifican nuestros archivos, no los del admin de Django
+    prefijos_minificables = ('css/', 'js/')
+
+    def _save(self, name, content):
+        minificar = None
+        for extension, funcion in MINIFICADORES.items():
+            if name.endswith(extension) and name.startswith(self.prefijos_minificables):
+                minificar = funcion
+        if minificar is not None:
+            content.seek(0)
+            texto = content.read()
+            if isinstance(texto, bytes):
+                texto = texto.decode('utf-8')
+            content = ContentFile(minificar(texto).encode('utf-8'))
+        return super()._save(name, content)
@@ -0,0 +1,110 @@
+"""Render en streaming de las páginas de listados
+
+La vista renderiza y devuelve de inmediato la primera parte de la página
+(head, navbar, cabecera) mientras las llamadas a FastAPI siguen en curso.
+El resto se envía a medida que llegan los datos, tarjeta por tarjeta, así
+la memoria por respuesta no depende de cuántas tarjetas tenga la página.
+
+Bajo ASGI Django acumula en una lista los iteradores síncronos antes de
+enviarlos, así que ahí la respuesta lleva un iterador asíncrono que pide
+cada parte al generador en un hilo.
+"""
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+
+from estetica_frontend import cancelacion, fragmentos
+
+logger = logging.getLogger(__name__)
+
+# Mismos escapes que el filtro json_script de Django
+_JSON_SCRIPT_ESCAPES = {
+    ord('>'): '\\u003E',
+    ord('<'): '\\u003C',
+    ord('&'): '\\u0026',
+}
+
+
+def esta_activo():
+    return getattr(settings, 'STREAMING_RENDER', False)
+
+
+def render_parte(request, template_name, context=None):
+    return render_to_string(template_name, context or {}, request=request)
+
+
+def render_items(template_name, nombre, items, context=None):
+    """Renderiza un item por vez (una tarjeta, una fila)
+
+    Sin contexto extra las tarjetas salen de la caché de fragmentos.
+    """
+    if not context:
+        yield from fragmentos.renderizar(template_name, nombre, items)
+        return
+    template = get_template(template_name)
+    base = dict(context or {})
+    for item in items:
+        base[nombre] = item
+        yield template.render(base)
+
+
+def resultado(futuro, default):
+    """Resultado de un Future, o default si la llamada al backend falló"""
+    try:
+        return cancelacion.esperar(futuro)
+    except Exception as e:
+        logger.error(f"Error obteniendo datos para streaming: {e}")
+        return default
+
+
+def _json(valor):
+    return json.dumps(valor, cls=DjangoJSONEncoder).translate(_JSON_SCRIPT_ESCAPES)
+
+
+def json_script_items(element_id, datos, clave_lista, items):
+    """Como el filtro json_script, pero enviando la lista item por item
+
+    Genera ``{...datos, "<clave_lista>": [item, item, ...]}``.
+    """
+    yield f'<script id="{element_id}" type="application/json">{{'
+    for clave, valor in datos.items():
+        yield f'{_json(clave)}: {_json(valor)}, '
+    yield f'{_json(clave_lista)}: ['
+    for i, item in enumerate(items):
+        yield (', ' if i else '') + _json(item)
+    yield ']}</script>\n'
+
+
+_FIN = object()
+
+
+async def _en_hilo(partes):
+    """Iterador asíncrono sobre un generador síncrono que bloquea (render, FastAPI)"""
+    siguiente = sync_to_async(next)
+    while True:
+        parte = await siguiente(partes, _FIN)
+        if parte is _FIN:
+            return
+        yield parte
+
+
+def streaming_response(request, primera_parte, resto):
+    """StreamingHttpResponse HTML que empieza con una parte ya renderizada"""
+    def partes():
+        yield primera_parte
+        for parte in resto:
+            # Con el cliente ya desconectado no se renderiza lo que falta (ver cancelacion)
+            cancelacion.comprobar('render_cancelados')
+            yield parte
+
+    contenido = _en_hilo(partes()) if isinstance(request, ASGIRequest) else partes()
+    response = StreamingHttpResponse(contenido, content_type='text/html; charset=utf-8')
+    # Evita que Nginx acumule la respuesta completa antes de enviarla
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,15 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from estetica_frontend import fragmentos
+
+register = template.Library()
+
+
+@register.simple_tag
+def render_fragmentos(template_name, nombre, items):
+    """Renderiza cada item con su template pasando por la caché de fragmentos
+
+    {% render_fragmentos "jobs/galeria/_tarjeta.html" "trabajo" trabajos %}
+    """
+    return mark_safe(''.join(fragmentos.renderizar(template_name, nombre, items or [])))
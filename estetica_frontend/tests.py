@@ -0,0 +1,788 @@
+import asyncio
+import io
+import json
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import Future
+from pathlib import Path
+from unittest import mock, skipUnless
+
+import requests
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import FileResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from estetica_frontend import (
+    backend, bootstrap, cache_ns, cancelacion, caos, fragmentos, grabacion, imagenes, memoria, metrics,
+    prefetch, profiling, ratelimit, service_worker, storage, upstreams, warmup,
+)
+from estetica_frontend.jsoncodec import JsonResponse
+from estetica_frontend.middleware import CompressionCacheMiddleware
+from estetica_frontend.precarga import EXTENSION_ASGI, EarlyHints
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+SIN_CACHES = override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    # Sin collectstatic no hay manifest
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    RATE_LIMIT_ENABLED=False,
+)
+
+
+class RedaccionGrabacionTests(SimpleTestCase):
+    def test_tokens_y_contrasenas(self):
+        cuerpo = {
+            'access_token': 'abc',
+            'token_type': 'bearer',
+            'user': {'email': 'a@b.c', 'password': 'secreto'},
+        }
+        self.assertEqual(grabacion.redactar(cuerpo), {
+            'access_token': grabacion.REDACTADO,
+            'token_type': 'bearer',
+            'user': {'email': 'a@b.c', 'password': grabacion.REDACTADO},
+        })
+
+    def test_formulario_y_query(self):
+        guardado = grabacion._cuerpo(b'username=a%40b.c&password=secreto', 'application/x-www-form-urlencoded')
+        self.assertEqual(guardado, {'form': {'username': 'a@b.c', 'password': grabacion.REDACTADO}})
+        _, _, query = grabacion.clave('get', 'http://x/api/auth/verify?token=abc&email=a')
+        self.assertEqual(query, 'email=a&token=%3Credactado%3E')
+
+    def test_reproduce_en_orden(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            path = Path(directorio) / 'login.jsonl'
+            with open(path, 'w') as f:
+                for status in (401, 200):
+                    f.write(json.dumps({
+                        'metodo': 'POST', 'ruta': '/api/auth/login', 'query': '',
+                        'status': status, 'headers': {'Content-Type': 'application/json'},
+                        'cuerpo': {'json': {'status': status}}, 'latencia': 0.01,
+                    }) + '\n')
+            session = requests.Session()
+            session.mount('http://', grabacion.ReplayAdapter(path, escala=0))
+            estados = [session.post('http://fastapi:8000/api/auth/login').status_code for _ in range(3)]
+        self.assertEqual(estados, [401, 200, 401])
+
+
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ajustes = override_settings(
+            RATE_LIMIT_ENABLED=True,
+            RATE_LIMIT_FILE=Path(directorio.name) / 'ratelimit.bin',
+            RATE_LIMITS={'login': {'cliente': '3/m', 'total': '5/m'}},
+        )
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        # Buckets nuevos en cada test
+        ratelimit._tabla = None
+        self.addCleanup(setattr, ratelimit, '_tabla', None)
+        self.factory = RequestFactory()
+
+    def _pedir(self, ip):
+        return ratelimit.comprobar(self.factory.post('/auth/api/login/', REMOTE_ADDR=ip), 'login')
+
+    def test_limite_por_cliente(self):
+        self.assertEqual([self._pedir('10.0.0.1') for _ in range(3)], [None] * 3)
+        rechazo = self._pedir('10.0.0.1')
+        self.assertEqual(rechazo.status_code, 429)
+        self.assertGreaterEqual(int(rechazo['Retry-After']), 1)
+        # Otra IP tiene su propio bucket
+        self.assertIsNone(self._pedir('10.0.0.2'))
+
+    def test_limite_total(self):
+        for i in range(5):
+            self.assertIsNone(self._pedir(f'10.0.1.{i}'))
+        self.assertEqual(self._pedir('10.0.1.99').status_code, 429)
+
+    def test_rechazos_de_un_cliente_no_gastan_el_total(self):
+        for _ in range(50):
+            self._pedir('10.0.2.1')
+        # Solo las 3 primeras pasaron al total; quedan 2 para los demás
+        self.assertIsNone(self._pedir('10.0.2.2'))
+        self.assertIsNone(self._pedir('10.0.2.3'))
+
+
+class MetricasTests(TestCase):
+    def test_solo_redes_internas(self):
+        self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='127.0.0.1').status_code, 200)
+        self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='203.0.113.5').status_code, 403)
+        with override_settings(METRICS_ALLOWED_NETWORKS=['10.0.0.0/8']):
+            self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='10.2.3.4').status_code, 200)
+
+
+@SIN_CACHES
+class CompresionTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+
+    def _comprimir(self, response):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        return CompressionCacheMiddleware(lambda r: response)(request)
+
+    def _json(self, **cabeceras):
+        response = JsonResponse({'productos': ['Producto'] * 100})
+        for cabecera, valor in cabeceras.items():
+            response[cabecera] = valor
+        return response
+
+    def test_json_publico_se_comprime_una_vez(self):
+        for _ in range(2):
+            self.assertEqual(self._comprimir(self._json())['Content-Encoding'], 'gzip')
+        contadores = metrics.snapshot()['counters']
+        self.assertEqual((contadores['compression_cache_misses'], contadores['compression_cache_hits']), (1, 1))
+
+    def test_respuestas_de_la_sesion_no_van_a_la_cache(self):
+        for cabeceras in ({'Vary': 'Cookie'}, {'Cache-Control': 'private, max-age=0'}):
+            self.assertEqual(self._comprimir(self._json(**cabeceras))['Content-Encoding'], 'gzip')
+        contadores = metrics.snapshot()['counters']
+        self.assertEqual(contadores['compression_uncached'], 2)
+        self.assertNotIn('compression_cache_misses', contadores)
+
+    def test_archivo_conserva_las_cookies(self):
+        response = FileResponse(io.BytesIO(b'body { color: red; }\n' * 50), content_type='text/css')
+        response['Content-Length'] = str(21 * 50)
+        response.set_cookie('tema', 'oscuro')
+        comprimida = self._comprimir(response)
+        self.assertEqual(comprimida['Content-Encoding'], 'gzip')
+        self.assertEqual(comprimida.cookies['tema'].value, 'oscuro')
+        # Con Set-Cookie tampoco se comparte
+        self.assertEqual(metrics.snapshot()['counters']['compression_uncached'], 1)
+
+
+@SIN_CACHES
+class ProfilingTests(TestCase):
+    def setUp(self):
+        directorio = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(PROFILING_ENABLED=True, PROFILING_DIR=directorio))
+        session = self.client.session
+        session['access_token'] = 'tok'
+        session.save()
+        with mock.patch.object(profiling, 'usuario_actual', return_value={'is_admin': True}):
+            self.token = self.client.get('/profiles/').context['token']
+
+    def test_token_en_la_cabecera_y_con_la_sesion(self):
+        response = self.client.get('/health/', HTTP_X_PROFILE_TOKEN=self.token)
+        self.assertTrue(response.has_header('X-Profile-Id'))
+        self.assertEqual(profiling.listar()[0]['motivo'], 'token')
+
+    def test_no_vale_en_la_url_ni_desde_otra_sesion(self):
+        self.assertFalse(self.client.get('/health/', {'_profile': self.token}).has_header('X-Profile-Id'))
+        self.assertFalse(Client().get('/health/', HTTP_X_PROFILE_TOKEN=self.token).has_header('X-Profile-Id'))
+        self.assertEqual(profiling.listar(), [])
+
+
+class MinificadoTests(SimpleTestCase):
+    def test_css_respeta_cadenas_y_selectores(self):
+        css = 'a  :hover {\n  content: "a  b;}" ;\n  color: red;\n}\n/* fuera */\n.b,\n.c { margin: 0 }'
+        self.assertEqual(storage.minificar_css(css), 'a :hover{content: "a  b;}";color: red}.b,.c{margin: 0}')
+
+    def test_js_respeta_template_literals(self):
+        js = (
+            'function f(x) {\n'
+            '    const html = `\n        <p>  ${x ? `  a  ` : "b"}</p>\n    `;\n'
+            '\n'
+            '    return x / 2 > 1 ? /[`]/.test(html) : html;\n'
+            '}\n'
+        )
+        self.assertEqual(storage.minificar_js(js), (
+            'function f(x) {\n'
+            'const html = `\n        <p>  ${x ? `  a  ` : "b"}</p>\n    `;\n'
+            'return x / 2 > 1 ? /[`]/.test(html) : html;\n'
+            '}\n'
+        ))
+
+    def test_js_que_no_se_entiende_queda_igual(self):
+        self.assertEqual(storage.minificar_js('  const a = `sin cerrar;\n'), '  const a = `sin cerrar;\n')
+
+
+@SIN_CACHES
+class EarlyHintsTests(TestCase):
+    def _mensajes(self, path, extensiones):
+        enviados = []
+
+        async def app(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 200})
+
+        async def send(mensaje):
+            enviados.append(mensaje)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'extensions': extensiones}
+        asyncio.run(EarlyHints(app)(scope, None, send))
+        return enviados
+
+    def test_103_antes_de_la_respuesta(self):
+        hint, inicio = self._mensajes('/jobs/', {EXTENSION_ASGI: {}})
+        self.assertEqual(hint['type'], EXTENSION_ASGI)
+        self.assertIn(b'</static/css/jobs/galeria.css>; rel=preload; as=style', hint['links'])
+        self.assertEqual(inicio['type'], 'http.response.start')
+
+    def test_sin_soporte_del_servidor_o_sin_precarga(self):
+        self.assertEqual(len(self._mensajes('/jobs/', {})), 1)
+        self.assertEqual(len(self._mensajes('/metrics/', {EXTENSION_ASGI: {}})), 1)
+
+
+class CancelacionTests(TestCase):
+    def test_desconexion_abandona_las_llamadas_pendientes(self):
+        metrics.reset()
+        peticion = cancelacion._Peticion()
+        token = cancelacion._actual.set(peticion)
+        try:
+            # Como si Desconexiones recibiera http.disconnect a mitad de la vista
+            threading.Timer(0.1, peticion.desconectada.set).start()
+            inicio = time.monotonic()
+            with self.assertRaises(cancelacion.Cancelada):
+                backend.parallel(lambda: None, lambda: time.sleep(1))
+            self.assertLess(time.monotonic() - inicio, 0.5)
+        finally:
+            cancelacion._actual.reset(token)
+        self.assertEqual(metrics.snapshot()['counters']['backend_respuestas_descartadas'], 1)
+
+    def test_timeout_de_la_llamada_se_propaga(self):
+        def falla():
+            raise TimeoutError('FastAPI no contestó')
+
+        token = cancelacion._actual.set(cancelacion._Peticion())
+        try:
+            with self.assertRaises(TimeoutError):
+                cancelacion.esperar(backend.submit(falla))
+        finally:
+            cancelacion._actual.reset(token)
+
+
+class UpstreamsTests(TestCase):
+    def test_elige_la_de_menor_latencia(self):
+        rapida, lenta = upstreams.Upstream('http://a:8000'), upstreams.Upstream('http://b:8000')
+        rapida.ewma, lenta.ewma = 0.05, 0.5
+        self.assertTrue(all(upstreams.elegir([lenta, rapida]) is rapida for _ in range(20)))
+
+    @override_settings(UPSTREAM_FALLOS_EXPULSION=2, UPSTREAM_EXPULSION_SEGUNDOS=30)
+    def test_expulsion_por_fallos_seguidos(self):
+        caida, sana = upstreams.Upstream('http://a:8000'), upstreams.Upstream('http://b:8000')
+        for _ in range(2):
+            caida.empezar()
+            caida.terminar(0.01, ok=False)
+        self.assertFalse(caida.disponible(time.monotonic()))
+        self.assertIs(upstreams.elegir([caida, sana]), sana)
+        # Que siga respondiendo al health check no la devuelve antes de tiempo
+        caida.marcar_salud(True)
+        self.assertFalse(caida.disponible(time.monotonic()))
+        self.assertTrue(caida.disponible(time.monotonic() + 31))
+
+    @override_settings(
+        FASTAPI_BASE_URL='http://fastapi:8000',
+        FASTAPI_UPSTREAMS='http://lectura:8000',
+        FASTAPI_UPSTREAMS_ESCRITURA='http://escritura:8000',
+        UPSTREAM_HEALTH_INTERVALO=0,
+    )
+    def test_escrituras_a_su_grupo(self):
+        upstreams._estado['pid'] = None
+        self.addCleanup(upstreams._estado.update, pid=None, lectura=[], escritura=[])
+        for metodo, esperada in (('GET', 'http://lectura:8000'), ('POST', 'http://escritura:8000')):
+            upstream, url = upstreams.resolver(metodo, 'http://fastapi:8000/api/trabajos/')
+            upstreams.terminar(upstream, 0.01, ok=True)
+            self.assertEqual(url, f'{esperada}/api/trabajos/')
+        # Lo que no va a FastAPI no se toca
+        self.assertEqual(upstreams.resolver('GET', 'http://otro/x'), (None, 'http://otro/x'))
+
+    @override_settings(
+        FASTAPI_BASE_URL='http://fastapi:8000',
+        FASTAPI_UPSTREAMS='http://lectura:8000',
+        UPSTREAM_HEALTH_INTERVALO=0,
+    )
+    def test_excepcion_ajena_a_la_red_libera_la_llamada(self):
+        upstreams._estado['pid'] = None
+        self.addCleanup(upstreams._estado.update, pid=None, lectura=[], escritura=[])
+        with mock.patch.object(backend, '_pedir', side_effect=RuntimeError('fallo propio')):
+            with self.assertRaises(RuntimeError):
+                backend.get('http://fastapi:8000/api/trabajos/')
+        lectura, = upstreams._estado['lectura']
+        self.assertEqual((lectura.pendientes, lectura.fallos_seguidos, lectura.ewma), (0, 0, None))
+
+
+class JsonResponseTests(SimpleTestCase):
+    def test_respeta_encoder_y_json_dumps_params(self):
+        class Encoder(json.JSONEncoder):
+            def default(self, obj):
+                return sorted(obj) if isinstance(obj, set) else super().default(obj)
+
+        response = JsonResponse({'b': {2, 1}, 'a': 1}, encoder=Encoder, json_dumps_params={'sort_keys': True})
+        self.assertEqual(response.content, b'{"a": 1, "b": [1, 2]}')
+
+
+class BulkheadsTests(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_grupos(self):
+        casos = [
+            ('POST', 'http://fastapi:8000/api/auth/login', 'auth'),
+            ('POST', 'http://fastapi:8000/api/trabajos/t1/upload-images', 'subidas'),
+            ('POST', 'http://fastapi:8000/api/products/p1/images/', 'subidas'),
+            ('GET', 'http://fastapi:8000/api/products/?skip=0', 'productos'),
+            ('GET', 'http://fastapi:8000/api/trabajos/', 'trabajos_lectura'),
+            ('DELETE', 'http://fastapi:8000/api/trabajos/t1', 'trabajos_escritura'),
+            ('GET', 'http://fastapi:8000/health', None),
+        ]
+        for metodo, url, grupo in casos:
+            self.assertEqual(backend.grupo_de(metodo, url), grupo, url)
+
+    def _gauges(self):
+        gauges = metrics.snapshot()['gauges']
+        return gauges.get('bulkhead_prueba_en_uso'), gauges.get('bulkhead_prueba_en_cola')
+
+    def test_espera_un_hueco_y_luego_rechaza(self):
+        compartimento = backend._Compartimento('prueba', 1, espera=1)
+        compartimento.entrar()
+        self.assertEqual(self._gauges(), (1, 0))
+
+        en_cola = threading.Thread(target=compartimento.entrar)
+        en_cola.start()
+        for _ in range(100):
+            if self._gauges() == (1, 1):
+                break
+            time.sleep(0.01)
+        self.assertEqual(self._gauges(), (1, 1))
+        # Al liberar, la que esperaba entra
+        compartimento.salir()
+        en_cola.join(1)
+        self.assertFalse(en_cola.is_alive())
+        self.assertEqual(self._gauges(), (1, 0))
+
+        compartimento.espera = 0.05
+        with self.assertRaises(backend.BackendSaturado):
+            compartimento.entrar()
+        self.assertEqual(self._gauges(), (1, 0))
+        self.assertEqual(metrics.snapshot()['counters']['bulkhead_prueba_rechazadas'], 1)
+
+    def test_sin_espera_rechaza_de_inmediato(self):
+        compartimento = backend._Compartimento('prueba', 1, espera=0)
+        compartimento.entrar()
+        inicio = time.monotonic()
+        with self.assertRaises(backend.BackendSaturado):
+            compartimento.entrar()
+        self.assertLess(time.monotonic() - inicio, 0.1)
+        self.assertEqual(self._gauges(), (1, 0))
+
+
+def imagen(formato='JPEG', tamano=(40, 20), **kwargs):
+    salida = io.BytesIO()
+    Image.new('RGB', tamano, 'red').save(salida, formato, **kwargs)
+    return salida.getvalue()
+
+
+class ImagenesTests(SimpleTestCase):
+    def test_firma_real_y_no_la_extension(self):
+        imagenes.validar(SimpleUploadedFile('a.png', imagen('PNG')))
+        with self.assertRaisesMessage(imagenes.ImagenInvalida, 'no es una imagen'):
+            imagenes.validar(SimpleUploadedFile('a.jpg', b'<?php echo 1; ?>'))
+
+    @override_settings(IMAGE_MAX_UPLOAD_BYTES=1024)
+    def test_tamano_maximo(self):
+        errores = imagenes.validar_todas([
+            SimpleUploadedFile('chica.jpg', imagen()),
+            SimpleUploadedFile('grande.jpg', b'\xff\xd8\xff' + b'0' * 2048),
+        ])
+        self.assertEqual(len(errores), 1)
+        self.assertIn('grande.jpg', errores[0])
+
+    def test_orientacion_aplicada_y_exif_descartado(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotar 90° al mostrar
+        exif[0x010F] = 'Telefono'
+        info = imagenes.normalizar(imagen(exif=exif), 'foto.jpeg')
+        resultado = Image.open(io.BytesIO(info['contenido']))
+        self.assertEqual(resultado.size, (20, 40))
+        self.assertEqual(dict(resultado.getexif()), {})
+        self.assertEqual((info['nombre'], info['content_type']), ('foto.jpg', 'image/jpeg'))
+
+    @override_settings(IMAGE_MAX_DIMENSION=100)
+    def test_reduce_al_lado_maximo(self):
+        info = imagenes.normalizar(imagen('PNG', (400, 200)), 'grande.png')
+        self.assertEqual(info['dimensiones_originales'], (400, 200))
+        self.assertEqual(info['dimensiones_finales'], (100, 50))
+        self.assertEqual(info['sha256'], imagenes.hash_contenido(info['contenido']))
+
+    def test_imagen_danada(self):
+        with self.assertRaises(imagenes.ImagenInvalida):
+            imagenes.normalizar(b'\xff\xd8\xff' + b'0' * 100, 'rota.jpg')
+
+
+@SIN_CACHES
+class CacheNamespacesTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidar_descarta_todo_el_espacio(self):
+        cache_ns.set('productos', 'a', 1)
+        cache_ns.set_many('productos', {'b': 2, 'c': 3})
+        cache_ns.set('trabajos', 'a', 'otro')
+        self.assertEqual(cache_ns.get_many('productos', ['a', 'b', 'x']), {'a': 1, 'b': 2})
+        cache_ns.invalidar('productos')
+        self.assertIsNone(cache_ns.get('productos', 'a'))
+        self.assertEqual(cache_ns.get_many('productos', ['b', 'c']), {})
+        self.assertEqual(cache_ns.get('trabajos', 'a'), 'otro')
+
+    def test_version_perdida_no_resucita_entradas_viejas(self):
+        cache_ns.set('productos', 'a', 'viejo')
+        anterior = cache_ns.version('productos')
+        cache.delete('ns:productos')
+        self.assertGreater(cache_ns.version('productos'), anterior)
+        self.assertIsNone(cache_ns.get('productos', 'a'))
+
+    def test_invalidar_sin_version(self):
+        cache_ns.invalidar('nuevo')
+        self.assertIsNotNone(cache.get('ns:nuevo'))
+
+
+def _me(status, datos=None):
+    return mock.Mock(status_code=status, json=mock.Mock(return_value=datos or {}))
+
+
+class BootstrapTests(SimpleTestCase):
+    def test_usuario_actual(self):
+        self.assertIsNone(bootstrap.usuario_actual(None))
+        datos = {'id': 1, 'email': 'a@b.c', 'is_admin': True, 'password_hash': 'x'}
+        with mock.patch.object(backend, 'get', return_value=_me(200, datos)):
+            self.assertEqual(bootstrap.usuario_actual('tok'), {'id': 1, 'email': 'a@b.c', 'is_admin': True})
+        with mock.patch.object(backend, 'get', return_value=_me(401)):
+            self.assertIs(bootstrap.usuario_actual('tok'), bootstrap.SIN_RESOLVER)
+        with mock.patch.object(backend, 'get', side_effect=requests.exceptions.ConnectionError()):
+            self.assertIs(bootstrap.usuario_actual('tok'), bootstrap.SIN_RESOLVER)
+
+    def test_con_usuario_omite_lo_no_resuelto(self):
+        # Sin la clave el JS hace su fetch de siempre
+        self.assertEqual(bootstrap.con_usuario({}, bootstrap.SIN_RESOLVER), {})
+        self.assertEqual(bootstrap.con_usuario({}, None), {'user': None})
+
+
+@SIN_CACHES
+@override_settings(PREFETCH_ENABLED=True, PREFETCH_MAX_EN_CURSO=1)
+class PrefetchTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        prefetch._en_curso.clear()
+
+    def _esperar(self):
+        for futuro in [f for f in prefetch._en_curso.values() if f is not None]:
+            futuro.result(timeout=2)
+
+    def test_la_siguiente_pagina_sale_de_la_cache(self):
+        self.assertIsNone(prefetch.tomar('trabajos', ['pagina', 2]))
+        self.assertTrue(prefetch.programar('trabajos', ['pagina', 2], lambda: ['t13']))
+        self._esperar()
+        self.assertEqual(prefetch.tomar('trabajos', ['pagina', 2]), ['t13'])
+        # Ya está hecho: no se vuelve a pedir
+        self.assertFalse(prefetch.programar('trabajos', ['pagina', 2], lambda: ['otro']))
+        self.assertEqual(metrics.snapshot()['gauges']['prefetch_hit_rate'], 0.5)
+
+    def test_acotado_y_sin_repetir_lo_que_esta_en_curso(self):
+        soltar = threading.Event()
+        self.addCleanup(soltar.set)
+        self.assertTrue(prefetch.programar('trabajos', 'a', lambda: soltar.wait(2)))
+        self.assertFalse(prefetch.programar('trabajos', 'a', lambda: True))
+        self.assertFalse(prefetch.programar('trabajos', 'b', lambda: True))
+        self.assertEqual(metrics.snapshot()['counters']['prefetch_skipped'], 1)
+        soltar.set()
+        self._esperar()
+
+    def test_invalidar_mientras_esta_en_curso(self):
+        soltar = threading.Event()
+        prefetch.programar('trabajos', 'a', lambda: soltar.wait(2) and ['viejo'])
+        cache_ns.invalidar('trabajos')
+        soltar.set()
+        self._esperar()
+        # Se guardó con la versión anterior: nadie lo ve
+        self.assertIsNone(prefetch.tomar('trabajos', 'a'))
+
+    def test_cancelar_los_que_no_empezaron(self):
+        pendiente = Future()
+        with mock.patch.object(backend, 'submit', return_value=pendiente):
+            prefetch.programar('trabajos', 'a', lambda: ['x'])
+        self.assertEqual(prefetch.cancelar('productos'), 0)
+        self.assertEqual(prefetch.cancelar('trabajos'), 1)
+        self.assertEqual(prefetch._en_curso, {})
+
+
+@SIN_CACHES
+class WarmupTests(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+        warmup._listo.clear()
+        self.addCleanup(warmup._listo.set)
+
+    def test_listo_aunque_falle_un_paso(self):
+        self.assertEqual(self.client.get('/ready/').status_code, 503)
+        with mock.patch.object(warmup, '_compilar_templates'), \
+                mock.patch.object(warmup, '_galeria', side_effect=requests.exceptions.ConnectionError('caído')), \
+                mock.patch.object(warmup, '_catalogo') as catalogo:
+            estado = warmup.ejecutar()
+        catalogo.assert_called_once_with()
+        self.assertEqual(estado['errores'], ['galeria: caído'])
+        response = self.client.get('/ready/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['errores'], ['galeria: caído'])
+        self.assertEqual(metrics.snapshot()['gauges']['ready'], 1)
+
+    def test_solo_el_proceso_hijo_de_runserver(self):
+        casos = [
+            (['manage.py', 'runserver'], {'RUN_MAIN': 'true'}, True),
+            (['manage.py', 'runserver'], {}, False),
+            (['manage.py', 'runserver', '--noreload'], {}, True),
+            (['manage.py', 'test'], {'RUN_MAIN': 'true'}, False),
+        ]
+        for argv, entorno, esperado in casos:
+            with mock.patch.object(warmup.sys, 'argv', argv), mock.patch.dict(warmup.os.environ, entorno, clear=True):
+                self.assertIs(warmup.es_servidor_de_desarrollo(), esperado, argv)
+
+    @override_settings(WARMUP_ENABLED=False)
+    def test_una_vez_por_proceso(self):
+        self.addCleanup(warmup._estado.update, pid=None)
+        warmup._estado['pid'] = None
+        with mock.patch('jobs.subidas.iniciar_con_la_primera_peticion') as subidas, \
+                mock.patch.object(warmup.threading, 'Thread') as hilo:
+            warmup.iniciar()
+            warmup.iniciar()
+        subidas.assert_called_once_with()
+        # Desactivado: listo sin lanzar el hilo
+        hilo.assert_not_called()
+        self.assertTrue(warmup.esta_listo())
+
+
+@override_settings(MEMORY_PROFILING_ENABLED=True, MEMORY_PROFILING_SAMPLE_RATE=1, MEMORY_PROFILING_TOP=3)
+class MemoriaTests(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+
+    @staticmethod
+    @memoria.medir_memoria('prueba')
+    def vista(request):
+        request.bloques = [bytearray(1024 * 1024) for _ in range(4)]
+        return 'respuesta'
+
+    def test_muestra_con_tracemalloc(self):
+        request = RequestFactory().get('/')
+        self.assertEqual(self.vista(request), 'respuesta')
+        self.assertFalse(tracemalloc.is_tracing())
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['counters']['memoria_prueba_muestras'], 1)
+        self.assertGreaterEqual(snapshot['gauges']['memoria_prueba_pico_bytes'], 4 * 1024 * 1024)
+        top = snapshot['details']['memoria_prueba_top']
+        self.assertLessEqual(len(top), 3)
+        # Lo que la vista dejó retenido encabeza el top
+        self.assertTrue(top[0]['sitio'].startswith('estetica_frontend/tests.py:'))
+        self.assertGreaterEqual(top[0]['bytes'], 4 * 1024 * 1024)
+        if memoria.rss_bytes() is not None:
+            self.assertIn('memoria_rss_bytes', snapshot['gauges'])
+
+    def test_una_muestra_a_la_vez(self):
+        with memoria._muestreo:
+            self.vista(RequestFactory().get('/'))
+        self.assertNotIn('memoria_prueba_muestras', metrics.snapshot()['counters'])
+
+    @override_settings(MEMORY_PROFILING_ENABLED=False)
+    def test_desactivado(self):
+        self.vista(RequestFactory().get('/'))
+        self.assertEqual(metrics.snapshot()['gauges'], {})
+
+
+CAIDO = [{'patron': r'/api/products/', 'error': 1, 'status': 503}]
+
+
+@SIN_CACHES
+@override_settings(DEBUG=True, CHAOS_ENABLED=True, CHAOS_RULES=[], CHAOS_PROFILES={'caido': CAIDO})
+class CaosTests(SimpleTestCase):
+    def test_solo_con_debug(self):
+        token = caos.usar_perfil('caido')
+        self.addCleanup(caos.restaurar, token)
+        self.assertIs(caos.regla_para('GET', '/api/products/'), CAIDO[0])
+        with override_settings(DEBUG=False):
+            self.assertIsNone(caos.regla_para('GET', '/api/products/'))
+
+    def test_perfil_por_cabecera_tambien_en_paralelo(self):
+        # Sin la cabecera se usan CHAOS_RULES (vacías)
+        self.assertIsNone(caos.regla_para('GET', '/api/products/'))
+        enviar = mock.Mock()
+        with mock.patch.object(backend, '_pedir', enviar):
+            response = self.client.get('/products/api/', HTTP_X_CHAOS='caido')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'detail': 'Error inyectado (caos)'})
+        enviar.assert_not_called()
+        # Las llamadas lanzadas en otros hilos heredan el perfil
+        token = caos.usar_perfil('caido')
+        self.addCleanup(caos.restaurar, token)
+        reglas, = backend.parallel(lambda: caos.regla_para('GET', '/api/products/1'))
+        self.assertIs(reglas, CAIDO[0])
+
+    def test_timeout_desconexion_y_truncado(self):
+        enviar = mock.Mock(return_value=mock.Mock(content=b'0123456789'))
+        with mock.patch.object(caos.time, 'sleep') as dormir:
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                caos.aplicar({'latencia': 5}, 'GET', 'http://x/a', (3, 2), enviar)
+            dormir.assert_called_once_with(2)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            caos.aplicar({'desconexion': 1}, 'GET', 'http://x/a', 10, enviar)
+        enviar.assert_not_called()
+        self.assertEqual(caos.aplicar({'truncar': 1}, 'GET', 'http://x/a', 10, enviar)._content, b'01234')
+
+    def test_latencia_con_mediana_y_p99(self):
+        random.seed(45)
+        muestras = [caos._latencia({'mediana': 0.3, 'p99': 2.0}) for _ in range(5000)]
+        self.assertAlmostEqual(statistics.median(muestras), 0.3, delta=0.03)
+        self.assertAlmostEqual(statistics.quantiles(muestras, n=100)[98], 2.0, delta=0.4)
+        self.assertEqual(caos._latencia(1.5), 1.5)
+        self.assertTrue(0.5 <= caos._latencia([0.5, 2.0]) <= 2.0)
+
+
+@SIN_CACHES
+class ServiceWorkerTests(SimpleTestCase):
+    def setUp(self):
+        service_worker.generar_manifest.cache_clear()
+        self.addCleanup(service_worker.generar_manifest.cache_clear)
+
+    def test_manifest(self):
+        response = self.client.get('/sw-manifest.json')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        manifest = response.json()
+        self.assertIn('/static/css/jobs/galeria.css', manifest['precache'])
+        self.assertFalse([url for url in manifest['precache'] if '/admin/' in url or url.endswith('.map')])
+        self.assertEqual(manifest['stale_while_revalidate'], ['/jobs/'])
+        self.assertEqual(manifest['stale_while_revalidate_exactas'], ['/products/api/'])
+        self.assertIn('/jobs/admin/', manifest['excluir'])
+
+    def _ejecutar(self, peticiones, respuestas=None):
+        sw = self.client.get('/sw.js')
+        self.assertEqual(sw['Cache-Control'], 'no-cache')
+        escenario = json.dumps({'peticiones': peticiones, 'respuestas': respuestas or {}})
+        salida = subprocess.run(
+            ['node', str(FIXTURES / 'service_worker.js'), escenario],
+            input=sw.content, capture_output=True, check=True, timeout=20,
+        )
+        return json.loads(salida.stdout)
+
+    @skipUnless(shutil.which('node'), 'hace falta node para ejecutar el service worker')
+    def test_estrategias_por_ruta(self):
+        resultado = self._ejecutar(
+            [
+                {'url': '/products/api/'},
+                {'url': '/products/api/7/'},
+                {'url': '/jobs/'},
+                {'url': '/jobs/categoria/unas/'},
+                {'url': '/jobs/admin/'},
+                {'url': '/static/css/base.css'},
+                {'url': '/static/css/base.css'},
+                {'url': '/products/api/', 'cache': 'no-store'},
+            ],
+            # La galería con sesión depende de la cookie
+            respuestas={'/jobs/': {'Vary': 'Cookie'}},
+        )
+        self.assertEqual(
+            [(r['url'], r['atendida'], r['red']) for r in resultado['resultados']],
+            [
+                ('/products/api/', True, 1),
+                # Solo el listado, no el detalle
+                ('/products/api/7/', False, 0),
+                ('/jobs/', True, 1),
+                ('/jobs/categoria/unas/', True, 1),
+                ('/jobs/admin/', False, 0),
+                ('/static/css/base.css', True, 1),
+                ('/static/css/base.css', True, 0),
+                ('/products/api/', True, 1),
+            ],
+        )
+        self.assertEqual(resultado['caches']['datos'], ['/jobs/categoria/unas/', '/products/api/'])
+        self.assertEqual(resultado['caches']['estaticos'], ['/static/css/base.css'])
+
+    @skipUnless(shutil.which('node'), 'hace falta node para ejecutar el service worker')
+    @override_settings(SERVICE_WORKER_ENABLED=False)
+    def test_desactivado_no_atiende_nada(self):
+        resultado = self._ejecutar([{'url': '/products/api/'}, {'url': '/static/css/base.css'}])
+        self.assertFalse(any(r['atendida'] for r in resultado['resultados']))
+
+
+def _templates(fuente):
+    return override_settings(TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'OPTIONS': {'loaders': [('django.template.loaders.locmem.Loader', {'tarjeta.html': fuente})]},
+    }])
+
+
+@SIN_CACHES
+class FragmentosTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.enterContext(_templates('<li>{{ trabajo.id }} {{ trabajo.titulo }}</li>'))
+        fragmentos._version_template.cache_clear()
+        self.addCleanup(fragmentos._version_template.cache_clear)
+
+    def _renderizar(self, trabajos):
+        with mock.patch.object(metrics, 'incr') as incr:
+            html = ''.join(fragmentos.renderizar('tarjeta.html', 'trabajo', trabajos))
+        contadores = {}
+        for llamada in incr.call_args_list:
+            nombre, cantidad = llamada.args
+            contadores[nombre] = contadores.get(nombre, 0) + cantidad
+        return html, contadores
+
+    def test_clave_por_id_y_datos(self):
+        clave = fragmentos._clave('tarjeta.html', {'id': 1, 'titulo': 'Uñas', 'precio': 10})
+        self.assertTrue(clave.startswith('fragmento:tarjeta.html:'))
+        self.assertIn(':1:', clave)
+        # El orden de los campos no cambia la clave, el contenido sí
+        self.assertEqual(clave, fragmentos._clave('tarjeta.html', {'precio': 10, 'titulo': 'Uñas', 'id': 1}))
+        self.assertNotEqual(clave, fragmentos._clave('tarjeta.html', {'id': 1, 'titulo': 'Uñas', 'precio': 12}))
+        self.assertNotEqual(clave, fragmentos._clave('tarjeta.html', {'id': 2, 'titulo': 'Uñas', 'precio': 10}))
+
+    def test_solo_renderiza_los_que_cambiaron(self):
+        trabajos = [{'id': 1, 'titulo': 'Uñas'}, {'id': 2, 'titulo': 'Cejas'}]
+        html, contadores = self._renderizar(trabajos)
+        self.assertEqual(html, '<li>1 Uñas</li><li>2 Cejas</li>')
+        self.assertEqual(contadores, {'fragment_cache_hits': 0, 'fragment_cache_misses': 2})
+
+        html, contadores = self._renderizar(trabajos)
+        self.assertEqual(html, '<li>1 Uñas</li><li>2 Cejas</li>')
+        self.assertEqual(contadores, {'fragment_cache_hits': 2})
+
+        trabajos[1] = {'id': 2, 'titulo': 'Pestañas'}
+        html, contadores = self._renderizar(trabajos)
+        self.assertEqual(html, '<li>1 Uñas</li><li>2 Pestañas</li>')
+        self.assertEqual(contadores, {'fragment_cache_hits': 1, 'fragment_cache_misses': 1})
+
+    def test_cambio_de_template_invalida(self):
+        trabajos = [{'id': 1, 'titulo': 'Uñas'}]
+        self._renderizar(trabajos)
+        # Un despliegue reinicia el proceso con el template nuevo
+        self.enterContext(_templates('<article>{{ trabajo.titulo }}</article>'))
+        fragmentos._version_template.cache_clear()
+        html, contadores = self._renderizar(trabajos)
+        self.assertEqual(html, '<article>Uñas</article>')
+        self.assertEqual(contadores, {'fragment_cache_hits': 0, 'fragment_cache_misses': 1})
+
+    def test_un_get_many_por_lote(self):
+        trabajos = [{'id': i, 'titulo': f'Trabajo {i}'} for i in range(fragmentos.LOTE * 2 + 1)]
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            html, _ = self._renderizar(trabajos)
+        self.assertEqual(get_many.call_count, 3)
+        self.assertEqual(html.count('<li>'), len(trabajos))
+
+    @override_settings(FRAGMENT_CACHE_ENABLED=False)
+    def test_desactivado(self):
+        html, contadores = self._renderizar([{'id': 1, 'titulo': 'Uñas'}])
+        self.assertEqual(html, '<li>1 Uñas</li>')
+        self.assertEqual(contadores, {})
+        self.assertIsNone(cache.get(fragmentos._clave('tarjeta.html', {'id': 1, 'titulo': 'Uñas'})))
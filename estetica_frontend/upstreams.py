@@ -0,0 +1,172 @@
+"""Varias instancias de FastAPI detrás del cliente compartido
+
+Las vistas siguen construyendo las URLs con FASTAPI_BASE_URL; si hay
+FASTAPI_UPSTREAMS, backend cambia ese prefijo por la instancia elegida:
+
+- Balanceo 'ewma' (por defecto): de dos instancias al azar, la de menor
+  latencia media móvil × (llamadas en curso + 1). 'menos_pendientes': la que
+  tiene menos llamadas en curso.
+- Expulsión: tras UPSTREAM_FALLOS_EXPULSION fallos seguidos (error de
+  conexión, timeout o 5xx) la instancia deja de recibir llamadas durante
+  UPSTREAM_EXPULSION_SEGUNDOS.
+- Health checks activos: un hilo por proceso pide UPSTREAM_HEALTH_PATH a cada
+  instancia cada UPSTREAM_HEALTH_INTERVALO segundos; las que fallan no reciben
+  tráfico hasta que vuelven a responder. Las dos exclusiones son
+  independientes: responder al health check no acorta una expulsión.
+- Con FASTAPI_UPSTREAMS_ESCRITURA las escrituras van solo a esas instancias.
+
+Si todas están caídas se usan igualmente: mejor intentarlo que fallar sin
+llamar. Cada instancia publica sus gauges y contadores ``upstream_<host>_*``.
+"""
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+
+from estetica_frontend import metrics
+
+logger = logging.getLogger(__name__)
+
+METODOS_LECTURA = ('GET', 'HEAD', 'OPTIONS')
+# Peso de la última llamada en la latencia media móvil
+ALFA = 0.3
+# Latencia que se anota cuando la llamada falla
+PENALIZACION_FALLO = 1.0
+
+_lock = threading.Lock()
+_estado = {'pid': None, 'lectura': [], 'escritura': []}
+
+
+class Upstream:
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.nombre = re.sub(r'[^a-z0-9]+', '_', self.url.split('://')[-1].lower()).strip('_')
+        self.pendientes = 0
+        self.ewma = None
+        self.fallos_seguidos = 0
+        self.expulsado_hasta = 0
+        self.sano = True
+        self._lock = threading.Lock()
+
+    def disponible(self, ahora):
+        return self.sano and ahora >= self.expulsado_hasta
+
+    def puntuacion(self):
+        # Sin medidas todavía cuenta como la más rápida para que reciba tráfico
+        return (self.ewma or 0) * (self.pendientes + 1)
+
+    def empezar(self):
+        with self._lock:
+            self.pendientes += 1
+        metrics.incr(f'upstream_{self.nombre}_peticiones')
+        metrics.set_gauge(f'upstream_{self.nombre}_pendientes', self.pendientes)
+
+    def terminar(self, segundos, ok):
+        """Cierra una llamada; con ok=None (no llegó a haber respuesta ni error de red) solo la libera"""
+        with self._lock:
+            self.pendientes -= 1
+            if ok is None:
+                metrics.set_gauge(f'upstream_{self.nombre}_pendientes', self.pendientes)
+                return
+            if not ok:
+                # Un error rápido no puede hacer que la instancia parezca la mejor
+                segundos = max(segundos, PENALIZACION_FALLO)
+            self.ewma = segundos if self.ewma is None else ALFA * segundos + (1 - ALFA) * self.ewma
+            if ok:
+                self.fallos_seguidos = 0
+            else:
+                self.fallos_seguidos += 1
+                if self.fallos_seguidos >= getattr(settings, 'UPSTREAM_FALLOS_EXPULSION', 3):
+                    self._expulsar()
+        metrics.set_gauge(f'upstream_{self.nombre}_pendientes', self.pendientes)
+        metrics.set_gauge(f'upstream_{self.nombre}_ewma_ms', round(self.ewma * 1000, 1))
+        if not ok:
+            metrics.incr(f'upstream_{self.nombre}_fallos')
+
+    def _expulsar(self):
+        segundos = getattr(settings, 'UPSTREAM_EXPULSION_SEGUNDOS', 30)
+        self.expulsado_hasta = time.monotonic() + segundos
+        self.fallos_seguidos = 0
+        metrics.incr(f'upstream_{self.nombre}_expulsiones')
+        logger.warning(f"Upstream {self.url} expulsado {segundos} s por fallos seguidos")
+
+    def marcar_salud(self, sano):
+        # No toca la expulsión por fallos: una instancia que da 5xx al tráfico
+        # real puede seguir respondiendo al health check
+        if sano != self.sano:
+            logger.warning(f"Upstream {self.url} {'recuperado' if sano else 'no responde al health check'}")
+        self.sano = sano
+        metrics.set_gauge(f'upstream_{self.nombre}_sano', int(sano))
+
+
+def _lista(valor):
+    if isinstance(valor, str):
+        valor = valor.split(',')
+    return [url.strip() for url in valor or () if url.strip()]
+
+
+def _iniciar():
+    """Crea las instancias y el hilo de health checks una vez por proceso"""
+    if _estado['pid'] == os.getpid():
+        return
+    with _lock:
+        if _estado['pid'] == os.getpid():
+            return
+        lectura = [Upstream(url) for url in _lista(getattr(settings, 'FASTAPI_UPSTREAMS', ()))]
+        escritura = [Upstream(url) for url in _lista(getattr(settings, 'FASTAPI_UPSTREAMS_ESCRITURA', ()))]
+        _estado.update(pid=os.getpid(), lectura=lectura, escritura=escritura or lectura)
+    if lectura and getattr(settings, 'UPSTREAM_HEALTH_INTERVALO', 10):
+        threading.Thread(target=_health_checks, name='upstreams', daemon=True).start()
+
+
+def _todos():
+    vistos = {}
+    for upstream in _estado['lectura'] + _estado['escritura']:
+        vistos.setdefault(id(upstream), upstream)
+    return list(vistos.values())
+
+
+def _health_checks():
+    from estetica_frontend import backend
+
+    ruta = getattr(settings, 'UPSTREAM_HEALTH_PATH', '/health')
+    while True:
+        for upstream in _todos():
+            try:
+                response = backend.get_session().get(f'{upstream.url}{ruta}', timeout=2)
+                upstream.marcar_salud(response.status_code < 500)
+            except Exception:
+                upstream.marcar_salud(False)
+        time.sleep(getattr(settings, 'UPSTREAM_HEALTH_INTERVALO', 10))
+
+
+def elegir(candidatos):
+    ahora = time.monotonic()
+    disponibles = [u for u in candidatos if u.disponible(ahora)] or candidatos
+    if len(disponibles) == 1:
+        return disponibles[0]
+    if getattr(settings, 'UPSTREAM_BALANCEO', 'ewma') == 'menos_pendientes':
+        menor = min(u.pendientes for u in disponibles)
+        return random.choice([u for u in disponibles if u.pendientes == menor])
+    return min(random.sample(disponibles, 2), key=Upstream.puntuacion)
+
+
+def resolver(method, url):
+    """(instancia elegida o None, URL reescrita hacia ella)"""
+    base = getattr(settings, 'FASTAPI_BASE_URL', '').rstrip('/')
+    if not getattr(settings, 'FASTAPI_UPSTREAMS', None) or not base or not url.startswith(base):
+        return None, url
+    _iniciar()
+    candidatos = _estado['lectura'] if method in METODOS_LECTURA else _estado['escritura']
+    upstream = elegir(candidatos)
+    upstream.empezar()
+    return upstream, upstream.url + url[len(base):]
+
+
+def terminar(upstream, segundos, ok):
+    if upstream is not None:
+        upstream.terminar(segundos, ok)
@@ -1,11 +1,18 @@
 from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.http import HttpResponse
 from django.shortcuts import render
 
 from authentication import views
+from estetica_frontend.metrics import metrics_view
+from estetica_frontend.precarga import precargar
+from estetica_frontend.profiling import profile_download, profiles_view
+from estetica_frontend.service_worker import manifest_view, service_worker_view
+from estetica_frontend.views import static_con_cache
+from estetica_frontend.warmup import ready_view
 
+@precargar('css/index.css', 'js/index.js')
 def home_view(request):
     """Vista de la página principal"""
     return render(request, 'index.html', {
@@ -21,7 +28,14 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', home_view, name='home'),  # Página principal
     path('health/', health_check, name='health_check'),
+    path('ready/', ready_view, name='ready'),
+    path('metrics/', metrics_view, name='metrics'),
+    path('sw.js', service_worker_view, name='service_worker'),
+    path('sw-manifest.json', manifest_view, name='service_worker_manifest'),
+    path('profiles/', profiles_view, name='profiles'),
+    path('profiles/<str:perfil_id>/', profile_download, name='profile_download'),
     path('auth/', include('authentication.urls')),  # Incluir las URLs de autenticación
     path('products/', include('products.urls')),
     path('jobs/', include('jobs.urls')),
+    re_path(r'^static/(?P<path>.*)$', static_con_cache, name='static'),
     ]
\ No newline at end of file
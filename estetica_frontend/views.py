@@ -1,7 +1,14 @@
+import re
+
 import requests
 from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.views.static import serve
+
+from estetica_frontend.jsoncodec import JsonResponse
+
+# Nombres generados por ManifestStaticFilesStorage: archivo.<12 hex>.ext
+NOMBRE_CON_HASH = re.compile(r'\.[0-9a-f]{12}\.\w+$')
 
 def index(request):
     """Vista principal"""
@@ -10,3 +17,17 @@ def index(request):
         'fastapi_url': settings.FASTAPI_BASE_URL
     }
     return render(request, 'index.html', context)
+
+
+def static_con_cache(request, path):
+    """Sirve STATIC_ROOT con cabeceras de caché largas para los archivos con hash
+
+    Cuando Nginx está delante debe aplicar la misma regla; esta vista cubre
+    el despliegue con runserver y DEBUG=False.
+    """
+    response = serve(request, path, document_root=settings.STATIC_ROOT)
+    if NOMBRE_CON_HASH.search(path):
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'public, max-age=300'
+    return response
@@ -0,0 +1,142 @@
+"""Calentamiento al arrancar el servidor
+
+Tras cada despliegue o reinicio del contenedor los primeros visitantes pagaban
+conexiones en frío, la compilación de los templates y las cachés vacías. Al
+arrancar se lanza en segundo plano:
+
+1. La carga de los templates principales (quedan en el loader con caché).
+2. Las llamadas de datos calientes a FastAPI en paralelo, que de paso abren
+   varias conexiones del pool: categorías, tags populares, primera página de
+   la galería (y su HTML pre-renderizado si falta) y primera del catálogo.
+
+Los workers de la cola de subidas arrancan con la primera petición (no aquí:
+Django desaconseja tocar la base durante la inicialización de las apps, y
+sin migrar fallaría), para que los archivos que quedaron pendientes antes de
+un reinicio se suban sin esperar a que alguien encole algo nuevo.
+
+/ready/ responde 503 hasta que termina; /health/ sigue indicando solo que el
+proceso está vivo. Si algún paso falla se registra y el proceso se marca
+listo igualmente: sin FastAPI el frontend tampoco se arreglaría esperando.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from estetica_frontend import backend, metrics
+from estetica_frontend.jsoncodec import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES = (
+    'index.html',
+    'jobs/galeria.html',
+    'jobs/galeria/_inicio.html',
+    'jobs/galeria/_filtros.html',
+    'jobs/galeria/_lista_inicio.html',
+    'jobs/galeria/_tarjeta.html',
+    'jobs/galeria/_lista_fin.html',
+    'jobs/detalle.html',
+    'products/catalog.html',
+    'products/catalog/_pagina.html',
+    'products/catalog/_scripts.html',
+)
+
+_listo = threading.Event()
+_lock = threading.Lock()
+_estado = {'pid': None, 'errores': [], 'segundos': None}
+
+
+def esta_activo():
+    return getattr(settings, 'WARMUP_ENABLED', True)
+
+
+def esta_listo():
+    return _listo.is_set()
+
+
+def _compilar_templates():
+    for nombre in TEMPLATES:
+        get_template(nombre)
+
+
+def _galeria():
+    from jobs import prerender
+    from jobs.views import cargar_galeria
+
+    path = prerender.ruta_galeria()
+    if prerender.esta_activo() and not path.is_file():
+        prerender.generar_galeria()
+    else:
+        cargar_galeria()
+
+
+def _catalogo():
+    from products.views import listar_productos
+
+    listar_productos(limit=100)
+
+
+def _paso(nombre, funcion):
+    """Ejecuta un paso sin que un fallo detenga a los demás"""
+    inicio = time.monotonic()
+    try:
+        funcion()
+    except Exception as e:
+        logger.warning(f"Warmup: falló '{nombre}': {e}")
+        _estado['errores'].append(f'{nombre}: {e}')
+    metrics.observe(f'warmup_{nombre}', time.monotonic() - inicio)
+
+
+def ejecutar():
+    """Calienta el proceso actual y lo marca listo"""
+    inicio = time.monotonic()
+    _estado['errores'] = []
+    _paso('templates', _compilar_templates)
+    backend.parallel(
+        lambda: _paso('galeria', _galeria),
+        lambda: _paso('catalogo', _catalogo),
+    )
+    _estado['segundos'] = round(time.monotonic() - inicio, 3)
+    metrics.observe('warmup', _estado['segundos'])
+    metrics.set_gauge('ready', 1)
+    _listo.set()
+    logger.info(f"Warmup terminado en {_estado['segundos']} s ({len(_estado['errores'])} errores)")
+    return dict(_estado)
+
+
+def iniciar():
+    """Lanza el warmup en segundo plano una vez por proceso"""
+    with _lock:
+        if _estado['pid'] == os.getpid():
+            return
+        _estado['pid'] = os.getpid()
+    from jobs import subidas
+    subidas.iniciar_con_la_primera_peticion()
+    if not esta_activo():
+        _listo.set()
+        return
+    metrics.set_gauge('ready', 0)
+    threading.Thread(target=ejecutar, name='warmup', daemon=True).start()
+
+
+def es_servidor_de_desarrollo():
+    """runserver arranca dos procesos; solo el hijo (RUN_MAIN) sirve peticiones"""
+    if len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+        return False
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+
+
+def ready_view(request):
+    """Readiness: 200 cuando el warmup terminó, 503 mientras tanto"""
+    if not esta_listo():
+        return JsonResponse({'ready': False}, status=503)
+    return JsonResponse({
+        'ready': True,
+        'warmup_segundos': _estado['segundos'],
+        'errores': _estado['errores'],
+    })
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'estetica_frontend.settings')
 
 application = get_wsgi_application()
+
+# Calienta conexiones, templates y cachés antes de marcar el proceso como listo
+from estetica_frontend import warmup  # noqa: E402
+
+warmup.iniciar()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from jobs import prerender
+
+
+class Command(BaseCommand):
+    help = 'Pre-renderiza a HTML estático la galería, las categorías y el detalle de cada trabajo'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trabajo',
+            help='Regenera solo las páginas afectadas por este trabajo',
+        )
+
+    def handle(self, *args, **options):
+        root = prerender.get_root()
+
+        if options['trabajo']:
+            prerender.regenerar_trabajo(options['trabajo'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Páginas del trabajo {options['trabajo']} regeneradas en {root}"
+            ))
+            return
+
+        resultado = prerender.generar_todo()
+        self.stdout.write(self.style.SUCCESS(
+            f"Pre-renderizadas {resultado['categorias']} categorías y "
+            f"{resultado['trabajos']} trabajos en {root}"
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from jobs import subidas
+
+
+class Command(BaseCommand):
+    help = 'Procesa la cola de subidas de imágenes pendientes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Termina cuando la cola quede vacía en lugar de seguir esperando',
+        )
+
+    def handle(self, *args, **options):
+        subidas.liberar_colgados()
+        self.stdout.write('Procesando subidas pendientes...')
+        subidas.procesar_pendientes(esperar=not options['una_vez'])
+        self.stdout.write(self.style.SUCCESS('Cola de subidas vacía'))
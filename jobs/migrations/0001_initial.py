@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TareaSubida',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trabajo_id', models.CharField(db_index=True, max_length=64)),
+                ('token', models.TextField(blank=True)),
+                ('propietario', models.CharField(db_index=True, max_length=64)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('completada', 'Completada'), ('con_errores', 'Con errores')], default='pendiente', max_length=20)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('actualizada', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-creada'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivoSubida',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('ruta', models.CharField(max_length=500)),
+                ('tamano', models.PositiveIntegerField(default=0)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_curso', 'En curso'), ('subida', 'Subida'), ('fallida', 'Fallida')], db_index=True, default='pendiente', max_length=20)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('proximo_intento', models.DateTimeField(db_index=True)),
+                ('error', models.TextField(blank=True)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+                ('tarea', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archivos', to='jobs.tareasubida')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
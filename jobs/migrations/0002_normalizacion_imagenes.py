@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivosubida',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='archivosubida',
+            name='tamano_final',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='archivosubida',
+            name='estado',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('en_curso', 'En curso'), ('subida', 'Subida'), ('duplicada', 'Duplicada'), ('fallida', 'Fallida')], db_index=True, default='pendiente', max_length=20),
+        ),
+    ]
@@ -1,3 +1,66 @@
 from django.db import models
 
-# Create your models here.
+
+class TareaSubida(models.Model):
+    """Subida en segundo plano de las imágenes de un trabajo a FastAPI"""
+
+    PENDIENTE = 'pendiente'
+    COMPLETADA = 'completada'
+    CON_ERRORES = 'con_errores'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (COMPLETADA, 'Completada'),
+        (CON_ERRORES, 'Con errores'),
+    ]
+
+    trabajo_id = models.CharField(max_length=64, db_index=True)
+    # Token de FastAPI del admin, cifrado (ver subidas.cifrar_token); se borra al terminar la tarea
+    token = models.TextField(blank=True)
+    # Hash del token para que solo quien la creó consulte su estado
+    propietario = models.CharField(max_length=64, db_index=True)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    creada = models.DateTimeField(auto_now_add=True)
+    actualizada = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-creada']
+
+    def __str__(self):
+        return f'Subida {self.pk} del trabajo {self.trabajo_id} ({self.estado})'
+
+
+class ArchivoSubida(models.Model):
+    """Una imagen dentro de una tarea; se sube y reintenta por separado"""
+
+    PENDIENTE = 'pendiente'
+    EN_CURSO = 'en_curso'
+    SUBIDA = 'subida'
+    DUPLICADA = 'duplicada'
+    FALLIDA = 'fallida'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_CURSO, 'En curso'),
+        (SUBIDA, 'Subida'),
+        (DUPLICADA, 'Duplicada'),
+        (FALLIDA, 'Fallida'),
+    ]
+
+    tarea = models.ForeignKey(TareaSubida, on_delete=models.CASCADE, related_name='archivos')
+    nombre = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    ruta = models.CharField(max_length=500)
+    tamano = models.PositiveIntegerField(default=0)
+    # Se completan al normalizar la imagen (una sola vez, antes del primer intento)
+    tamano_final = models.PositiveIntegerField(null=True, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE, db_index=True)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    proximo_intento = models.DateTimeField(db_index=True)
+    error = models.TextField(blank=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.nombre} ({self.estado})'
@@ -0,0 +1,292 @@
+"""Pre-renderizado estático de las páginas públicas de trabajos
+
+Las páginas se guardan en PRERENDER_ROOT con la misma estructura que las URLs,
+para que Nginx pueda servirlas directamente con ``try_files``:
+
+    jobs/index.html                          -> /jobs/
+    jobs/page-2.html                         -> /jobs/?page=2
+    jobs/categoria/<categoria>/index.html    -> /jobs/categoria/<categoria>/
+    jobs/categoria/<categoria>/page-2.html   -> /jobs/categoria/<categoria>/?page=2
+    jobs/trabajo/<id>/index.html             -> /jobs/trabajo/<id>/
+
+Si Nginx no está delante, las vistas sirven los mismos archivos. Se leen
+enteros (son HTML pequeños) para que la compresión los cachee: el mismo
+archivo es el mismo cuerpo para todos los visitantes.
+
+Un detalle renderizado por una visita se guarda solo si ninguna
+regeneración empezó mientras tanto: sus datos podrían ser de antes de la
+escritura del admin y las páginas no caducan.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.template.loader import render_to_string
+
+logger = logging.getLogger(__name__)
+
+# Solo se aceptan segmentos seguros para construir rutas en disco
+SEGMENTO_VALIDO = re.compile(r'^[\w-]+$')
+
+# Reentrante: regenerar_trabajos() lo tiene tomado cuando guarda los detalles
+_lock = threading.RLock()
+
+
+def esta_activo():
+    return getattr(settings, 'PRERENDER_ENABLED', False)
+
+
+def get_root():
+    return Path(getattr(settings, 'PRERENDER_ROOT', settings.BASE_DIR / 'prerendered'))
+
+
+def ruta_galeria(categoria='', page=1):
+    """Ruta del archivo de una página de la galería (None si no es válida)"""
+    base = get_root() / 'jobs'
+    if categoria:
+        if not SEGMENTO_VALIDO.match(categoria):
+            return None
+        base = base / 'categoria' / categoria
+    nombre = 'index.html' if page == 1 else f'page-{page}.html'
+    return base / nombre
+
+
+def ruta_detalle(trabajo_id):
+    """Ruta del archivo del detalle de un trabajo (None si no es válida)"""
+    if not SEGMENTO_VALIDO.match(str(trabajo_id)):
+        return None
+    return get_root() / 'jobs' / 'trabajo' / str(trabajo_id) / 'index.html'
+
+
+# ==================== SERVIR ====================
+
+def _servir(path):
+    if not esta_activo() or path is None or not path.is_file():
+        return None
+    response = HttpResponse(path.read_bytes(), content_type='text/html; charset=utf-8')
+    response['X-Prerendered'] = '1'
+    return response
+
+
+def servir_galeria(request, categoria='', page=1):
+    """Devuelve la página pre-renderizada de la galería, o None si no existe"""
+    if request.method != 'GET' or page < 1:
+        return None
+    return _servir(ruta_galeria(categoria, page))
+
+
+def servir_detalle(request, trabajo_id):
+    """Devuelve el detalle pre-renderizado de un trabajo, o None si no existe"""
+    if request.method != 'GET':
+        return None
+    return _servir(ruta_detalle(trabajo_id))
+
+
+# ==================== GENERAR ====================
+
+def _escribir(path, html):
+    """Escritura atómica para no servir nunca un archivo a medias"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(html)
+    os.replace(tmp, path)
+
+
+def _request_sintetico(params):
+    """Request mínimo para que el template arme los enlaces de paginación"""
+    request = HttpRequest()
+    request.method = 'GET'
+    request.GET = QueryDict(mutable=True)
+    request.GET.update(params)
+    return request
+
+
+def generar_galeria(categoria=''):
+    """Genera todas las páginas de la galería (o de una categoría)
+
+    Returns:
+        Lista de IDs de los trabajos listados
+    """
+    from .views import cargar_galeria
+
+    if categoria and not SEGMENTO_VALIDO.match(categoria):
+        return []
+
+    ids = []
+    page = 1
+    while True:
+        context = cargar_galeria(categoria=categoria, page=page)
+        params = {'categoria': categoria} if categoria else {}
+        html = render_to_string('jobs/galeria.html', context, request=_request_sintetico(params))
+        _escribir(ruta_galeria(categoria, page), html)
+        ids.extend(t['id'] for t in context['trabajos'])
+        if not context['has_next']:
+            break
+        page += 1
+
+    # Borrar páginas que ya no existen
+    sobrante = page + 1
+    while True:
+        path = ruta_galeria(categoria, sobrante)
+        if not path.exists():
+            break
+        path.unlink()
+        sobrante += 1
+
+    return ids
+
+
+def ruta_marca():
+    """Archivo que cada regeneración toca al empezar (lo ven todos los procesos)"""
+    return get_root() / '.regeneracion'
+
+
+def inicio_peticion():
+    """Marca de tiempo para pasar luego a guardar_detalle(desde=...)"""
+    return time.time_ns()
+
+
+def _cambiado_desde(desde, *paths):
+    for path in paths:
+        try:
+            if path.stat().st_mtime_ns >= desde:
+                return True
+        except FileNotFoundError:
+            pass
+    return False
+
+
+def guardar_detalle(trabajo_id, context, html, desde=None):
+    """Guarda el HTML del detalle y la categoría con la que se generó
+
+    Con ``desde`` (ver inicio_peticion) no se guarda nada si hay una
+    regeneración en curso, o si una regeneración o escritura empezó después.
+
+    Returns:
+        True si se escribió el archivo
+    """
+    path = ruta_detalle(trabajo_id)
+    if path is None or not esta_activo():
+        return False
+    # Una visita no espera a que termine la regeneración en curso
+    if not _lock.acquire(blocking=desde is None):
+        return False
+    try:
+        if desde is not None and _cambiado_desde(desde, ruta_marca(), path):
+            return False
+        _escribir(path, html)
+        meta = {'categoria': context['trabajo'].get('categoria', '')}
+        _escribir(path.with_name('meta.json'), json.dumps(meta))
+        return True
+    finally:
+        _lock.release()
+
+
+def categoria_generada(trabajo_id):
+    """Categoría del trabajo en la última generación, para invalidarla si cambia"""
+    path = ruta_detalle(trabajo_id)
+    if path is None:
+        return ''
+    try:
+        return json.loads(path.with_name('meta.json').read_text()).get('categoria', '')
+    except (OSError, ValueError):
+        return ''
+
+
+def generar_detalle(trabajo_id):
+    """Genera la página de detalle; la borra si el trabajo ya no existe"""
+    from .views import cargar_detalle
+
+    if ruta_detalle(trabajo_id) is None:
+        return False
+
+    context = cargar_detalle(trabajo_id)
+    if context is None or context['trabajo'] is None:
+        invalidar_detalle(trabajo_id)
+        return False
+
+    guardar_detalle(trabajo_id, context, render_to_string('jobs/detalle.html', context))
+    return True
+
+
+def invalidar_detalle(trabajo_id):
+    path = ruta_detalle(trabajo_id)
+    if path is None:
+        return
+    for archivo in (path, path.with_name('meta.json')):
+        if archivo.exists():
+            archivo.unlink()
+
+
+def generar_todo():
+    """Genera la galería, todas las categorías y todos los detalles"""
+    from estetica_frontend import backend
+    from .views import get_fastapi_url
+
+    ids = set(generar_galeria())
+
+    cat_response = backend.get(get_fastapi_url('/trabajos/categorias'))
+    categorias = cat_response.json() if cat_response.status_code == 200 else []
+    for cat in categorias:
+        ids.update(generar_galeria(cat['value']))
+
+    for trabajo_id in ids:
+        generar_detalle(trabajo_id)
+
+    return {'categorias': len(categorias), 'trabajos': len(ids)}
+
+
+def regenerar_trabajos(trabajo_ids, categorias=()):
+    """Regenera solo las páginas afectadas por cambios en uno o varios trabajos
+
+    Se regeneran la galería general, las categorías indicadas más las de la
+    generación anterior (por si cambiaron) y el detalle de cada trabajo. Los
+    detalles de los demás trabajos de esas categorías se invalidan porque
+    muestran a los cambiados en "relacionados"; se vuelven a generar la
+    próxima vez que se pidan. Cada galería se genera una sola vez aunque
+    cambien varios trabajos de la misma categoría.
+    """
+    trabajo_ids = [str(t) for t in trabajo_ids]
+    with _lock:
+        try:
+            ruta_marca().parent.mkdir(parents=True, exist_ok=True)
+            ruta_marca().touch()
+            generar_galeria()
+            hermanos = set()
+            categorias = set(categorias) | {categoria_generada(t) for t in trabajo_ids}
+            for categoria in {c for c in categorias if c}:
+                hermanos.update(str(h) for h in generar_galeria(categoria))
+            hermanos.difference_update(trabajo_ids)
+            for hermano_id in hermanos:
+                invalidar_detalle(hermano_id)
+            for trabajo_id in trabajo_ids:
+                generar_detalle(trabajo_id)
+        except Exception as e:
+            logger.error(f"Error regenerando páginas de los trabajos {trabajo_ids}: {e}")
+
+
+def regenerar_trabajo(trabajo_id, categorias=()):
+    regenerar_trabajos([trabajo_id], categorias)
+
+
+def regenerar_trabajos_async(trabajo_ids, categorias=()):
+    """Lanza la regeneración en segundo plano para no bloquear al admin"""
+    if not esta_activo() or not trabajo_ids:
+        return
+    threading.Thread(
+        target=regenerar_trabajos,
+        args=(tuple(trabajo_ids), tuple(categorias)),
+        daemon=True,
+    ).start()
+
+
+def regenerar_trabajo_async(trabajo_id, categorias=()):
+    regenerar_trabajos_async([trabajo_id], categorias)
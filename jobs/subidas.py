@@ -0,0 +1,337 @@
+"""Cola local de subidas de imágenes a FastAPI
+
+Las vistas de crear/editar trabajo guardan las imágenes en UPLOAD_QUEUE_DIR,
+registran una TareaSubida en SQLite y responden de inmediato. Un pool de
+hilos del propio proceso sube cada imagen por separado, con reintentos y
+espera exponencial. Al estar la cola en la base de datos no hace falta un
+broker externo, y `python manage.py procesar_subidas` puede procesarla
+desde otro proceso (por ejemplo tras un reinicio).
+"""
+import base64
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+import requests
+from cryptography.fernet import Fernet, InvalidToken
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DatabaseError, close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from estetica_frontend import backend, imagenes, metrics
+
+from .models import ArchivoSubida, TareaSubida
+
+logger = logging.getLogger(__name__)
+
+_hay_trabajo = threading.Event()
+_workers_lock = threading.Lock()
+_workers_pid = None
+
+
+def get_spool_dir():
+    return Path(getattr(settings, 'UPLOAD_QUEUE_DIR', settings.BASE_DIR / 'upload_queue'))
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _fernet():
+    clave = hashlib.sha256(f'jobs.subidas:{settings.SECRET_KEY}'.encode()).digest()
+    return Fernet(base64.urlsafe_b64encode(clave))
+
+
+def cifrar_token(token):
+    """El token del admin se guarda cifrado con una clave derivada de SECRET_KEY"""
+    return _fernet().encrypt(token.encode()).decode()
+
+
+def descifrar_token(cifrado):
+    """Token en claro, o '' si no se puede descifrar (otra SECRET_KEY, fila antigua)"""
+    try:
+        return _fernet().decrypt(cifrado.encode()).decode()
+    except (InvalidToken, ValueError):
+        return ''
+
+
+# ==================== ENCOLAR ====================
+
+def encolar(trabajo_id, token, files):
+    """Guarda las imágenes en disco y crea la tarea de subida
+
+    Returns:
+        TareaSubida creada
+    """
+    directorio = get_spool_dir() / uuid.uuid4().hex
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    tarea = TareaSubida.objects.create(
+        trabajo_id=str(trabajo_id),
+        token=cifrar_token(token),
+        propietario=hash_token(token),
+    )
+    ahora = timezone.now()
+    for i, f in enumerate(files):
+        ruta = directorio / f'{i:03d}'
+        with open(ruta, 'wb') as destino:
+            for chunk in f.chunks():
+                destino.write(chunk)
+        ArchivoSubida.objects.create(
+            tarea=tarea,
+            nombre=f.name,
+            content_type=f.content_type or '',
+            ruta=str(ruta),
+            tamano=f.size,
+            proximo_intento=ahora,
+        )
+
+    iniciar_workers()
+    _hay_trabajo.set()
+    return tarea
+
+
+def estado_tarea(tarea):
+    """Resumen JSON-serializable del progreso de una tarea"""
+    archivos = list(tarea.archivos.all())
+    normalizados = [a for a in archivos if a.tamano_final is not None]
+    return {
+        'id': tarea.pk,
+        'trabajo_id': tarea.trabajo_id,
+        'estado': tarea.estado,
+        'total': len(archivos),
+        'subidas': sum(1 for a in archivos if a.estado == ArchivoSubida.SUBIDA),
+        'duplicadas': sum(1 for a in archivos if a.estado == ArchivoSubida.DUPLICADA),
+        'fallidas': sum(1 for a in archivos if a.estado == ArchivoSubida.FALLIDA),
+        'bytes_originales': sum(a.tamano for a in normalizados),
+        'bytes_finales': sum(a.tamano_final for a in normalizados),
+        'archivos': [
+            {
+                'nombre': a.nombre,
+                'tamano': a.tamano,
+                'tamano_final': a.tamano_final,
+                'estado': a.estado,
+                'intentos': a.intentos,
+                'error': a.error,
+            }
+            for a in archivos
+        ],
+    }
+
+
+# ==================== PROCESAR ====================
+
+def _reclamar_siguiente():
+    """Toma el siguiente archivo listo para subir
+
+    El UPDATE condicional garantiza que dos workers (o dos procesos) no
+    tomen el mismo archivo.
+    """
+    while True:
+        candidato = (
+            ArchivoSubida.objects
+            .filter(estado=ArchivoSubida.PENDIENTE, proximo_intento__lte=timezone.now())
+            .order_by('proximo_intento', 'id')
+            .values_list('id', flat=True)
+            .first()
+        )
+        if candidato is None:
+            return None
+        tomado = ArchivoSubida.objects.filter(
+            id=candidato, estado=ArchivoSubida.PENDIENTE
+        ).update(
+            estado=ArchivoSubida.EN_CURSO,
+            intentos=F('intentos') + 1,
+            # update() no toca auto_now; sin esto liberar_colgados() lo devolvería a la cola
+            actualizado=timezone.now(),
+        )
+        if tomado:
+            return ArchivoSubida.objects.select_related('tarea').get(id=candidato)
+
+
+def liberar_colgados():
+    """Devuelve a la cola archivos que quedaron en curso por un proceso caído"""
+    limite = timezone.now() - timedelta(seconds=getattr(settings, 'UPLOAD_QUEUE_STALE_SECONDS', 300))
+    ArchivoSubida.objects.filter(
+        estado=ArchivoSubida.EN_CURSO, actualizado__lt=limite
+    ).update(estado=ArchivoSubida.PENDIENTE)
+
+
+def _subir(archivo, token):
+    from .views import get_fastapi_url
+
+    with open(archivo.ruta, 'rb') as f:
+        return backend.post(
+            get_fastapi_url(f'/trabajos/{archivo.tarea.trabajo_id}/upload-images'),
+            headers={'Authorization': f'Bearer {token}'},
+            files=[('files', (archivo.nombre, f, archivo.content_type))],
+            timeout=30
+        )
+
+
+def _normalizar(archivo):
+    """Reduce y recodifica la imagen en el spool antes del primer intento"""
+    ruta = Path(archivo.ruta)
+    info = imagenes.normalizar(ruta.read_bytes(), archivo.nombre)
+    ruta.write_bytes(info['contenido'])
+    archivo.nombre = info['nombre']
+    archivo.content_type = info['content_type']
+    archivo.tamano_final = info['tamano_final']
+    archivo.sha256 = info['sha256']
+    # Guardado ya, para que las copias de la misma tarea lo vean mientras se sube
+    archivo.save()
+
+
+def _copia(archivo):
+    """Estado de otra copia de la misma imagen
+
+    Returns:
+        SUBIDA si ya está en FastAPI, PENDIENTE si una copia anterior de la
+        tarea sigue en la cola (hay que esperar a ver si llega), o None si
+        esta es la que hay que subir
+    """
+    if archivo.sha256 in imagenes.ya_subidas(f'trabajo:{archivo.tarea.trabajo_id}'):
+        return ArchivoSubida.SUBIDA
+    copias = archivo.tarea.archivos.filter(sha256=archivo.sha256).exclude(pk=archivo.pk)
+    if copias.filter(estado=ArchivoSubida.SUBIDA).exists():
+        return ArchivoSubida.SUBIDA
+    # Solo se espera a las anteriores: dos copias nunca se esperan la una a la otra.
+    # Si la anterior acaba FALLIDA, esta se sube en su lugar.
+    if copias.filter(pk__lt=archivo.pk, estado__in=[ArchivoSubida.PENDIENTE, ArchivoSubida.EN_CURSO]).exists():
+        return ArchivoSubida.PENDIENTE
+    return None
+
+
+def procesar(archivo):
+    """Sube un archivo y actualiza su estado (reintentando si corresponde)"""
+    max_intentos = getattr(settings, 'UPLOAD_QUEUE_MAX_ATTEMPTS', 5)
+    reintentable = True
+    try:
+        if archivo.tamano_final is None:
+            _normalizar(archivo)
+        copia = _copia(archivo)
+        if copia == ArchivoSubida.SUBIDA:
+            archivo.estado = ArchivoSubida.DUPLICADA
+            metrics.incr('images_duplicates_skipped')
+            archivo.save()
+            _cerrar_tarea_si_termino(archivo.tarea)
+            return
+        if copia == ArchivoSubida.PENDIENTE:
+            # Esperar a la otra copia no gasta intentos
+            archivo.estado = ArchivoSubida.PENDIENTE
+            archivo.intentos -= 1
+            archivo.proximo_intento = timezone.now() + timedelta(
+                seconds=getattr(settings, 'UPLOAD_QUEUE_POLL_SECONDS', 2)
+            )
+            archivo.save()
+            return
+        token = descifrar_token(archivo.tarea.token)
+        if not token:
+            # Sin token FastAPI no aceptará la imagen por mucho que se reintente
+            archivo.error = 'No se pudo descifrar el token de la subida'
+            reintentable = False
+        else:
+            response = _subir(archivo, token)
+            if response.status_code == 200:
+                archivo.estado = ArchivoSubida.SUBIDA
+                archivo.error = ''
+                imagenes.registrar_subidas(f'trabajo:{archivo.tarea.trabajo_id}', [archivo.sha256])
+            else:
+                archivo.error = f'HTTP {response.status_code}: {response.text[:200]}'
+                # Un 4xx (token vencido, imagen inválida) no se arregla reintentando
+                reintentable = response.status_code >= 500 or response.status_code == 429
+    except imagenes.ImagenInvalida as e:
+        archivo.error = str(e)
+        reintentable = False
+    except (OSError, requests.exceptions.RequestException) as e:
+        archivo.error = str(e)
+
+    if archivo.estado != ArchivoSubida.SUBIDA:
+        if reintentable and archivo.intentos < max_intentos:
+            archivo.estado = ArchivoSubida.PENDIENTE
+            archivo.proximo_intento = timezone.now() + timedelta(seconds=2 ** archivo.intentos)
+        else:
+            archivo.estado = ArchivoSubida.FALLIDA
+        logger.warning(f"Subida de {archivo.nombre} (intento {archivo.intentos}): {archivo.error}")
+
+    archivo.save()
+    _cerrar_tarea_si_termino(archivo.tarea)
+
+
+def _cerrar_tarea_si_termino(tarea):
+    archivos = tarea.archivos.all()
+    if archivos.filter(estado__in=[ArchivoSubida.PENDIENTE, ArchivoSubida.EN_CURSO]).exists():
+        return
+    fallidas = archivos.filter(estado=ArchivoSubida.FALLIDA).exists()
+    cerrada = TareaSubida.objects.filter(pk=tarea.pk, estado=TareaSubida.PENDIENTE).update(
+        estado=TareaSubida.CON_ERRORES if fallidas else TareaSubida.COMPLETADA,
+        token='',
+        actualizada=timezone.now(),
+    )
+    if not cerrada:
+        return
+    ruta = archivos.values_list('ruta', flat=True).first()
+    if ruta:
+        shutil.rmtree(Path(ruta).parent, ignore_errors=True)
+    from .views import trabajos_modificados
+    trabajos_modificados([tarea.trabajo_id])
+
+
+def procesar_pendientes(esperar=True):
+    """Bucle de un worker; con esperar=False termina cuando la cola está vacía"""
+    intervalo = getattr(settings, 'UPLOAD_QUEUE_POLL_SECONDS', 2)
+    while True:
+        try:
+            archivo = _reclamar_siguiente()
+            if archivo is not None:
+                procesar(archivo)
+                continue
+            if not esperar:
+                return
+            _hay_trabajo.wait(intervalo)
+            _hay_trabajo.clear()
+        except Exception as e:
+            logger.exception(f"Error en el worker de subidas: {e}")
+            _hay_trabajo.wait(intervalo)
+        finally:
+            close_old_connections()
+
+
+def iniciar_workers():
+    """Arranca (una vez por proceso) los hilos que procesan la cola"""
+    global _workers_pid
+    if _workers_pid == os.getpid():
+        return
+    with _workers_lock:
+        if _workers_pid == os.getpid():
+            return
+        liberar_colgados()
+        for i in range(getattr(settings, 'UPLOAD_QUEUE_WORKERS', 2)):
+            threading.Thread(
+                target=procesar_pendientes,
+                name=f'subidas-{i}',
+                daemon=True,
+            ).start()
+        _workers_pid = os.getpid()
+
+
+def _al_empezar_peticion(sender, **kwargs):
+    try:
+        iniciar_workers()
+    except DatabaseError as e:
+        # Por ejemplo, sin migrar todavía: se reintenta con la siguiente petición
+        logger.warning(f"No se pudieron arrancar los workers de subidas: {e}")
+        return
+    request_started.disconnect(dispatch_uid='jobs.subidas')
+
+
+def iniciar_con_la_primera_peticion():
+    """Arranca los workers al llegar la primera petición, fuera del arranque de Django"""
+    request_started.connect(_al_empezar_peticion, dispatch_uid='jobs.subidas')
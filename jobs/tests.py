@@ -1,3 +1,355 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import tempfile
+import threading
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+import requests
+from django.utils import timezone
+from PIL import Image
+
+from estetica_frontend import backend, metrics
+from estetica_frontend.grabacion import reproduciendo
+from estetica_frontend.presupuestos import PresupuestoBackendMixin, comprobar_presupuestos
+
+from . import prerender, subidas, views
+from .models import ArchivoSubida, TareaSubida
+
+# Grabadas con BACKEND_RECORD_FILE (ver estetica_frontend.grabacion)
+GRABACIONES = Path(__file__).resolve().parent / 'fixtures' / 'backend'
+
+SIN_CACHES = override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    # Sin collectstatic no hay manifest
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    PRERENDER_ENABLED=False,
+    PREFETCH_ENABLED=False,
+    STREAMING_RENDER=False,
+    RATE_LIMIT_ENABLED=False,
+)
+
+
+@SIN_CACHES
+class GaleriaReplayTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+
+    def test_primera_pagina(self):
+        with reproduciendo(GRABACIONES / 'galeria.jsonl'):
+            response = self.client.get('/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['trabajos']), 12)
+        self.assertTrue(response.context['has_next'])
+        self.assertContains(response, 'Uñas')
+        self.assertEqual(metrics.snapshot()['counters'].get('backend_replay_misses', 0), 0)
+
+    def test_segunda_pagina_y_categoria(self):
+        with reproduciendo(GRABACIONES / 'galeria.jsonl'):
+            segunda = self.client.get('/jobs/?page=2')
+            categoria = self.client.get('/jobs/?categoria=unas')
+        self.assertTrue(segunda.context['has_prev'])
+        self.assertTrue(all(t['categoria'] == 'unas' for t in categoria.context['trabajos']))
+
+    def test_llamada_no_grabada(self):
+        with reproduciendo(GRABACIONES / 'galeria.jsonl'):
+            response = self.client.get('/jobs/?search=nada')
+        # La vista lo trata como FastAPI caído
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['trabajos'], [])
+        self.assertEqual(metrics.snapshot()['counters']['backend_replay_misses'], 1)
+
+    def test_llamadas_de_la_galeria_en_paralelo(self):
+        # Las cuatro llamadas tienen que estar en curso a la vez para pasar la barrera
+        barrera = threading.Barrier(4, timeout=2)
+
+        def llamada(resultado):
+            def funcion(*args):
+                barrera.wait()
+                return resultado
+            return funcion
+
+        with mock.patch.object(views, 'usuario_actual', llamada(None)), \
+                mock.patch.object(views, '_fetch_trabajos', llamada([{'id': 't1', 'titulo': 'Uno'}])), \
+                mock.patch.object(views, '_fetch_categorias', llamada([])), \
+                mock.patch.object(views, '_fetch_tags_populares', llamada([])):
+            response = self.client.get('/jobs/')
+        self.assertEqual([t['id'] for t in response.context['trabajos']], ['t1'])
+        self.assertFalse(barrera.broken)
+
+
+@SIN_CACHES
+class GaleriaStreamingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.enterContext(override_settings(STREAMING_RENDER=True))
+
+    def test_wsgi(self):
+        with reproduciendo(GRABACIONES / 'galeria.jsonl'):
+            response = self.client.get('/jobs/')
+            html = b''.join(response.streaming_content).decode()
+        self.assertFalse(response.is_async)
+        self.assertIn('Uñas', html)
+
+    async def test_asgi_con_iterador_asincrono_y_gzip(self):
+        with reproduciendo(GRABACIONES / 'galeria.jsonl'):
+            response = await self.async_client.get('/jobs/', headers={'accept-encoding': 'gzip'})
+            # Django solo lo acumularía (y avisaría) con un iterador síncrono
+            self.assertTrue(response.is_async)
+            partes = [parte async for parte in response.streaming_content]
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertGreater(len(partes), 2)
+        self.assertIn('Uñas', gzip.decompress(b''.join(partes)).decode())
+
+
+@SIN_CACHES
+class DetalleReplayTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_detalle_con_relacionados(self):
+        with reproduciendo(GRABACIONES / 'detalle.jsonl'):
+            response = self.client.get('/jobs/trabajo/665f00000000000000000001/')
+        self.assertEqual(response.status_code, 200)
+        trabajo = response.context['trabajo']
+        self.assertEqual(trabajo['titulo'], 'Trabajo 1 de maquillaje')
+        self.assertNotIn(trabajo['id'], [t['id'] for t in response.context['trabajos_relacionados']])
+        self.assertEqual(
+            response['Link'],
+            '</static/css/jobs/detalle.css>; rel=preload; as=style, '
+            '</static/js/jobs/detalle.js>; rel=preload; as=script',
+        )
+
+    def test_detalle_inexistente(self):
+        with reproduciendo(GRABACIONES / 'detalle.jsonl'):
+            response = self.client.get('/jobs/trabajo/nope/')
+        self.assertRedirects(response, '/jobs/', fetch_redirect_response=False)
+        self.assertFalse(response.has_header('Link'))
+
+
+@SIN_CACHES
+class PrerenderTests(TestCase):
+    TRABAJO = '665f00000000000000000001'
+
+    def setUp(self):
+        cache.clear()
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(PRERENDER_ENABLED=True, PRERENDER_ROOT=self.root))
+
+    def _guardar(self, trabajo_id, categoria='unas', **kwargs):
+        return prerender.guardar_detalle(trabajo_id, {'trabajo': {'categoria': categoria}}, f'<p>{trabajo_id}</p>', **kwargs)
+
+    def test_visita_guarda_y_la_siguiente_se_sirve_del_archivo(self):
+        with reproduciendo(GRABACIONES / 'detalle.jsonl'):
+            primera = self.client.get(f'/jobs/trabajo/{self.TRABAJO}/')
+        self.assertFalse(primera.has_header('X-Prerendered'))
+        # Sin grabación: si llamara a FastAPI fallaría
+        segunda = self.client.get(f'/jobs/trabajo/{self.TRABAJO}/')
+        self.assertEqual(segunda['X-Prerendered'], '1')
+        self.assertEqual(segunda.content, primera.content)
+        self.assertEqual(prerender.categoria_generada(self.TRABAJO), primera.context['trabajo']['categoria'])
+
+    def test_rutas_no_validas(self):
+        self.assertIsNone(prerender.ruta_detalle('../x'))
+        self.assertIsNone(prerender.ruta_galeria('a/b'))
+        self.assertFalse(self._guardar('../x'))
+        self.assertIsNone(prerender.servir_detalle(mock.Mock(method='GET'), 'nope'))
+
+    def test_visita_anterior_a_una_regeneracion_no_pisa_la_pagina(self):
+        desde = prerender.inicio_peticion()
+        with mock.patch.object(prerender, 'generar_galeria', return_value=[]), \
+                mock.patch.object(prerender, 'generar_detalle', side_effect=lambda t: self._guardar(t, 'pelo')):
+            prerender.regenerar_trabajos([self.TRABAJO])
+        self.assertFalse(self._guardar(self.TRABAJO, desde=desde))
+        self.assertEqual(prerender.categoria_generada(self.TRABAJO), 'pelo')
+        self.assertTrue(self._guardar(self.TRABAJO, desde=prerender.inicio_peticion()))
+
+    def test_visita_durante_una_regeneracion_no_escribe(self):
+        with prerender._lock:
+            resultado = []
+            hilo = threading.Thread(target=lambda: resultado.append(
+                self._guardar(self.TRABAJO, desde=prerender.inicio_peticion())
+            ))
+            hilo.start()
+            hilo.join()
+        self.assertEqual(resultado, [False])
+
+    def test_regenerar_invalida_los_hermanos(self):
+        self._guardar('t1', 'pelo')
+        self._guardar('t2', 'unas')
+        self._guardar('t3', 'otra')
+        galerias = {'': ['t1', 't2', 't3'], 'unas': ['t2'], 'pelo': ['t1', 't2']}
+        with mock.patch.object(prerender, 'generar_galeria', side_effect=lambda c='': galerias[c]) as galeria, \
+                mock.patch.object(prerender, 'generar_detalle') as detalle:
+            prerender.regenerar_trabajos(['t1'], ['unas'])
+        self.assertEqual(sorted(c.args[0] if c.args else '' for c in galeria.call_args_list), ['', 'pelo', 'unas'])
+        detalle.assert_called_once_with('t1')
+        # t2 aparece en "relacionados" de las categorías tocadas; t3 no
+        self.assertFalse(prerender.ruta_detalle('t2').exists())
+        self.assertTrue(prerender.ruta_detalle('t3').exists())
+        self.assertTrue(prerender.ruta_detalle('t1').exists())
+
+    def test_invalidar_borra_html_y_meta(self):
+        self._guardar('t1')
+        prerender.invalidar_detalle('t1')
+        self.assertFalse(prerender.ruta_detalle('t1').parent.joinpath('meta.json').exists())
+        self.assertIsNone(prerender.servir_detalle(mock.Mock(method='GET'), 't1'))
+
+
+def _respuesta(status, data=None):
+    return mock.Mock(status_code=status, json=mock.Mock(return_value=data or {}))
+
+
+@SIN_CACHES
+class AccionesMasivasTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        session = self.client.session
+        session['access_token'] = 'tok'
+        session.save()
+        self.me = self.enterContext(mock.patch.object(
+            backend, 'get', return_value=_respuesta(200, {'is_admin': True})
+        ))
+        self.modificados = self.enterContext(mock.patch.object(views, 'trabajos_modificados'))
+
+    def _post(self, data):
+        return self.client.post('/jobs/admin/masivo/', json.dumps(data), content_type='application/json')
+
+    def test_validacion(self):
+        casos = [
+            ({'accion': 'borrar', 'ids': ['t1']}, 'Acción no válida'),
+            ({'accion': 'eliminar', 'ids': []}, 'No se seleccionó ningún trabajo'),
+            ({'accion': 'eliminar', 'ids': [str(i) for i in range(101)]}, 'Máximo 100 trabajos por operación'),
+            ({'accion': 'categoria', 'ids': ['t1']}, 'Falta la categoría'),
+        ]
+        for data, error in casos:
+            response = self._post(data)
+            self.assertEqual((response.status_code, response.json()['error']), (400, error))
+        # Ni siquiera se verifica al admin
+        self.me.assert_not_called()
+
+    def test_un_resultado_por_trabajo(self):
+        def delete(url, **kwargs):
+            trabajo_id = url.rsplit('/', 1)[1]
+            if trabajo_id == 't3':
+                raise requests.exceptions.ConnectionError('caído')
+            return {'t1': _respuesta(204), 't2': _respuesta(404, {'detail': 'No encontrado'})}[trabajo_id]
+
+        with mock.patch.object(backend, 'delete', side_effect=delete):
+            data = self._post({'accion': 'eliminar', 'ids': ['t1', 't2', 't3', 't1']}).json()
+        # Una sola verificación del admin para todo el lote
+        self.me.assert_called_once()
+        self.assertEqual((data['total'], data['correctos'], data['fallidos']), (3, 1, 2))
+        self.assertEqual(data['resultados'], [
+            {'id': 't1', 'ok': True, 'status': 204},
+            {'id': 't2', 'ok': False, 'status': 404, 'error': 'No encontrado'},
+            {'id': 't3', 'ok': False, 'status': None, 'error': 'caído'},
+        ])
+        self.modificados.assert_called_once_with(['t1'], set())
+
+    def test_sin_permisos(self):
+        self.me.return_value = _respuesta(200, {'is_admin': False})
+        with mock.patch.object(backend, 'delete') as delete:
+            response = self._post({'accion': 'eliminar', 'ids': ['t1']})
+        self.assertEqual(response.status_code, 403)
+        delete.assert_not_called()
+
+
+@SIN_CACHES
+class PresupuestosTests(PresupuestoBackendMixin, TestCase):
+    def test_presupuestos(self):
+        comprobar_presupuestos(self, 'jobs:')
+
+    def test_galeria_cacheada_solo_pide_trabajos(self):
+        with reproduciendo(GRABACIONES / 'galeria.jsonl'):
+            self.client.get('/jobs/')
+            with self.assertLlamadasBackend(1):
+                self.client.get('/jobs/?page=2')
+
+
+@SIN_CACHES
+class ColaSubidasTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _archivo(self, tarea=None, **campos):
+        if tarea is None:
+            tarea = TareaSubida.objects.create(
+                trabajo_id='t1', token=subidas.cifrar_token('secreto'), propietario=subidas.hash_token('secreto'),
+            )
+        campos.setdefault('ruta', '/nope')
+        return ArchivoSubida.objects.create(
+            tarea=tarea, nombre='a.jpg', proximo_intento=timezone.now(), **campos
+        )
+
+    def _copias(self, cantidad):
+        """Archivos de una misma tarea con la misma imagen en el spool"""
+        directorio = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        contenido = io.BytesIO()
+        Image.new('RGB', (8, 8), 'red').save(contenido, 'JPEG')
+        archivos = []
+        for i in range(cantidad):
+            ruta = directorio / f'{i:03d}'
+            ruta.write_bytes(contenido.getvalue())
+            archivos.append(self._archivo(archivos[0].tarea if archivos else None, ruta=str(ruta)))
+        return archivos
+
+    def _procesar(self, archivo, status):
+        archivo = ArchivoSubida.objects.select_related('tarea').get(pk=archivo.pk)
+        archivo.estado = ArchivoSubida.EN_CURSO
+        archivo.intentos += 1
+        with mock.patch.object(subidas, '_subir', return_value=mock.Mock(status_code=status, text='')) as subir, \
+                mock.patch.object(views, 'trabajos_modificados'):
+            subidas.procesar(archivo)
+        return subir.called, ArchivoSubida.objects.get(pk=archivo.pk)
+
+    def test_copia_de_una_imagen_ya_subida(self):
+        a, b = self._copias(2)
+        self._procesar(a, 200)
+        enviada, b = self._procesar(b, 200)
+        self.assertFalse(enviada)
+        self.assertEqual(b.estado, ArchivoSubida.DUPLICADA)
+        self.assertEqual(b.tarea.estado, TareaSubida.COMPLETADA)
+
+    def test_copia_espera_y_se_sube_si_la_primera_falla(self):
+        a, b = self._copias(2)
+        # a falla con un 503 y queda para reintentar
+        self.assertEqual(self._procesar(a, 503)[1].estado, ArchivoSubida.PENDIENTE)
+        enviada, b = self._procesar(b, 200)
+        self.assertFalse(enviada)
+        self.assertEqual((b.estado, b.intentos), (ArchivoSubida.PENDIENTE, 0))
+        # a no llega a subirse: b ocupa su lugar en vez de perderse
+        self.assertEqual(self._procesar(a, 400)[1].estado, ArchivoSubida.FALLIDA)
+        enviada, b = self._procesar(b, 200)
+        self.assertTrue(enviada)
+        self.assertEqual(b.estado, ArchivoSubida.SUBIDA)
+        self.assertEqual(b.tarea.estado, TareaSubida.CON_ERRORES)
+
+    def test_token_cifrado_en_la_base(self):
+        tarea = self._archivo().tarea
+        self.assertNotIn('secreto', tarea.token)
+        self.assertEqual(subidas.descifrar_token(tarea.token), 'secreto')
+        self.assertEqual(subidas.descifrar_token('texto-plano'), '')
+
+    def test_reclamar_no_lo_deja_como_colgado(self):
+        archivo = self._archivo()
+        # Esperó en la cola más que UPLOAD_QUEUE_STALE_SECONDS
+        ArchivoSubida.objects.filter(pk=archivo.pk).update(actualizado=timezone.now() - timedelta(hours=1))
+        self.assertEqual(subidas._reclamar_siguiente().pk, archivo.pk)
+        subidas.liberar_colgados()
+        self.assertEqual(ArchivoSubida.objects.get(pk=archivo.pk).estado, ArchivoSubida.EN_CURSO)
+
+    def test_workers_arrancan_con_la_primera_peticion(self):
+        subidas.iniciar_con_la_primera_peticion()
+        with mock.patch.object(subidas, 'iniciar_workers') as iniciar:
+            self.client.get('/health/')
+            self.client.get('/health/')
+        iniciar.assert_called_once_with()
@@ -20,4 +20,6 @@ urlpatterns = [
          views.admin_eliminar_imagen, name='admin_eliminar_imagen'),
     path('admin/trabajo/<str:trabajo_id>/toggle-destacado/', 
          views.admin_toggle_destacado, name='admin_toggle_destacado'),
+    path('admin/masivo/', views.admin_acciones_masivas, name='admin_acciones_masivas'),
+    path('admin/subidas/<int:tarea_id>/', views.admin_estado_subida, name='admin_estado_subida'),
 ]
\ No newline at end of file
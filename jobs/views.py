@@ -1,11 +1,19 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
 import requests
 import json
 
+from estetica_frontend import backend, cache_ns, imagenes, prefetch, streaming
+from estetica_frontend.jsoncodec import JsonResponse
+from estetica_frontend.bootstrap import SIN_RESOLVER, usuario_actual, con_usuario
+from estetica_frontend.memoria import medir_memoria
+from estetica_frontend.precarga import precargar
+
+from . import prerender, subidas
+from .models import TareaSubida
+
 # ==================== HELPER FUNCTION ====================
 
 def get_fastapi_url(endpoint):
@@ -34,47 +42,167 @@ def get_fastapi_url(endpoint):
 
 # ==================== VISTAS PÚBLICAS ====================
 
-def galeria_trabajos(request):
+GALERIA_LIMIT = 12
+
+# Espacio de caché compartida de los trabajos (ver estetica_frontend.cache_ns)
+ESPACIO_CACHE = 'trabajos'
+
+def _json_o(response, default):
+    """Cuerpo JSON si la respuesta es 200, si no el valor por defecto"""
+    return response.json() if response.status_code == 200 else default
+
+def _params_galeria(categoria, search, tag, destacados, page):
+    params = {'skip': (page - 1) * GALERIA_LIMIT, 'limit': GALERIA_LIMIT}
+    if categoria:
+        params['categoria'] = categoria
+    if search:
+        params['search'] = search
+    if tag:
+        params['tag'] = tag
+    if destacados:
+        params['destacados_only'] = 'true'
+    return params
+
+def _fetch_trabajos(params):
+    return _json_o(backend.get(get_fastapi_url('/trabajos/'), params=params), [])
+
+# ==================== PREFETCH Y CACHÉ ====================
+
+def _pedir_lista(params, headers=None):
+    """Lista de trabajos para el prefetch (None si la respuesta no se puede cachear)"""
+    response = backend.get(get_fastapi_url('/trabajos/'), params=params, headers=headers, timeout=5)
+    return response.json() if response.status_code == 200 else None
+
+def _lista_prefetcheada(params, admin=False):
+    """Página ya pedida en segundo plano; la primera nunca se prefetchea"""
+    if not params['skip']:
+        return None
+    return prefetch.tomar(ESPACIO_CACHE, [admin, params])
+
+def _prefetch_siguiente(params, headers=None):
+    """Pide en segundo plano la página siguiente a la que se acaba de servir"""
+    siguiente = dict(params, skip=params['skip'] + params['limit'])
+    prefetch.programar(
+        ESPACIO_CACHE,
+        [headers is not None, siguiente],
+        lambda: _pedir_lista(siguiente, headers),
+    )
+
+def trabajos_modificados(trabajo_ids, categorias=()):
+    """Tras una escritura en FastAPI: descarta páginas prefetcheadas y regenera las estáticas"""
+    if not trabajo_ids:
+        return
+    prefetch.cancelar(ESPACIO_CACHE)
+    cache_ns.invalidar(ESPACIO_CACHE)
+    prerender.regenerar_trabajos_async(trabajo_ids, categorias)
+
+def _cacheado(nombre, pedir):
+    """Datos que casi no cambian, en la caché compartida hasta la próxima escritura"""
+    data = cache_ns.get(ESPACIO_CACHE, nombre)
+    if data is None:
+        data = _json_o(pedir(), None)
+        if data is None:
+            return []
+        cache_ns.set(ESPACIO_CACHE, nombre, data, getattr(settings, 'GALERIA_CACHE_TTL', 300))
+    return data
+
+def _fetch_categorias():
+    return _cacheado('categorias', lambda: backend.get(get_fastapi_url('/trabajos/categorias')))
+
+def _fetch_tags_populares():
+    return _cacheado('tags_populares', lambda: backend.get(
+        get_fastapi_url('/trabajos/tags/populares'), params={'limit': 15}
+    ))
+
+def _llamadas_galeria(params, usar_prefetch=False):
+    """Funciones que piden trabajos, categorías y tags, para pasarlas a backend.parallel
+    
+    Quien necesite más datos (el usuario, en la vista) las añade a la misma
+    llamada: un parallel() anidado dentro de un worker se ejecuta en serie.
+    """
+    prefetcheados = _lista_prefetcheada(params) if usar_prefetch else None
+    return (
+        lambda: prefetcheados if prefetcheados is not None else _fetch_trabajos(params),
+        _fetch_categorias,
+        _fetch_tags_populares,
+    )
+
+def _contexto_galeria(trabajos, categorias, tags_populares, categoria, search, tag, page):
+    return {
+        'trabajos': trabajos,
+        'categorias': categorias,
+        'tags_populares': tags_populares,
+        'categoria_actual': categoria,
+        'search_query': search,
+        'tag_actual': tag,
+        'page': page,
+        'has_next': len(trabajos) == GALERIA_LIMIT,
+        'has_prev': page > 1,
+    }
+
+def cargar_galeria(categoria='', search='', tag='', destacados='', page=1, usar_prefetch=False):
+    """Obtiene de FastAPI el contexto de una página de la galería"""
+    params = _params_galeria(categoria, search, tag, destacados, page)
+    trabajos, categorias, tags_populares = backend.parallel(*_llamadas_galeria(params, usar_prefetch))
+    return _contexto_galeria(trabajos, categorias, tags_populares, categoria, search, tag, page)
+
+def cargar_detalle(trabajo_id):
+    """Obtiene de FastAPI el contexto del detalle de un trabajo
+    
+    Returns:
+        None si el trabajo no existe, o el contexto para el template
+    """
+    response = backend.get(get_fastapi_url(f'/trabajos/{trabajo_id}'))
+    
+    if response.status_code == 404:
+        return None
+    
+    trabajo = response.json() if response.status_code == 200 else None
+    
+    relacionados = []
+    if trabajo:
+        rel_response = backend.get(
+            get_fastapi_url('/trabajos/'),
+            params={'categoria': trabajo['categoria'], 'limit': 4}
+        )
+        if rel_response.status_code == 200:
+            relacionados = [t for t in rel_response.json() if t['id'] != trabajo_id][:3]
+    
+    return {
+        'trabajo': trabajo,
+        'trabajos_relacionados': relacionados,
+    }
+
+@precargar('css/jobs/galeria.css', 'js/bootstrap.js', 'js/jobs/galeria.js')
+def galeria_trabajos(request, categoria=''):
     """Vista pública de galería de trabajos con filtros"""
     try:
-        categoria = request.GET.get('categoria', '')
+        categoria = request.GET.get('categoria', categoria)
         search = request.GET.get('search', '')
         tag = request.GET.get('tag', '')
         destacados = request.GET.get('destacados', '')
         page = int(request.GET.get('page', 1))
-        limit = 12
-        skip = (page - 1) * limit
         
-        params = {'skip': skip, 'limit': limit}
-        if categoria:
-            params['categoria'] = categoria
-        if search:
-            params['search'] = search
-        if tag:
-            params['tag'] = tag
-        if destacados:
-            params['destacados_only'] = 'true'
-        
-        response = requests.get(get_fastapi_url('/trabajos/'), params=params)
-        trabajos = response.json() if response.status_code == 200 else []
-        
-        cat_response = requests.get(get_fastapi_url('/trabajos/categorias'))
-        categorias = cat_response.json() if cat_response.status_code == 200 else []
+        if not (search or tag or destacados):
+            cached = prerender.servir_galeria(request, categoria, page)
+            if cached:
+                return cached
         
-        tags_response = requests.get(get_fastapi_url('/trabajos/tags/populares'), params={'limit': 15})
-        tags_populares = tags_response.json() if tags_response.status_code == 200 else []
+        token = request.session.get('access_token')
         
-        context = {
-            'trabajos': trabajos,
-            'categorias': categorias,
-            'tags_populares': tags_populares,
-            'categoria_actual': categoria,
-            'search_query': search,
-            'tag_actual': tag,
-            'page': page,
-            'has_next': len(trabajos) == limit,
-            'has_prev': page > 1,
-        }
+        if streaming.esta_activo():
+            return _galeria_streaming(request, token, categoria, search, tag, destacados, page)
+        
+        # Una sola llamada en paralelo: usuario y datos de la galería a la vez
+        params = _params_galeria(categoria, search, tag, destacados, page)
+        usuario, trabajos, categorias, tags_populares = backend.parallel(
+            lambda: usuario_actual(token),
+            *_llamadas_galeria(params, usar_prefetch=True),
+        )
+        context = _contexto_galeria(trabajos, categorias, tags_populares, categoria, search, tag, page)
+        context['bootstrap'] = con_usuario({}, usuario)
+        if context['has_next']:
+            _prefetch_siguiente(params)
         
         return render(request, 'jobs/galeria.html', context)
     
@@ -82,43 +210,80 @@ def galeria_trabajos(request):
         messages.error(request, f'Error al cargar la galería: {str(e)}')
         return render(request, 'jobs/galeria.html', {'trabajos': [], 'categorias': []})
 
+def _galeria_streaming(request, token, categoria, search, tag, destacados, page):
+    """Galería en streaming: cabecera ya, filtros y tarjetas a medida que llegan"""
+    params = _params_galeria(categoria, search, tag, destacados, page)
+    prefetcheados = _lista_prefetcheada(params)
+    if prefetcheados is not None:
+        f_trabajos = backend.submit(lambda: prefetcheados)
+    else:
+        f_trabajos = backend.submit(lambda: _fetch_trabajos(params))
+    f_categorias = backend.submit(_fetch_categorias)
+    f_tags = backend.submit(_fetch_tags_populares)
+    f_usuario = backend.submit(lambda: usuario_actual(token))
+    
+    context = {
+        'categoria_actual': categoria,
+        'search_query': search,
+        'tag_actual': tag,
+        'page': page,
+        'has_prev': page > 1,
+    }
+    primera = streaming.render_parte(request, 'jobs/galeria/_inicio.html', context)
+    
+    def resto():
+        context['categorias'] = streaming.resultado(f_categorias, [])
+        context['tags_populares'] = streaming.resultado(f_tags, [])
+        yield streaming.render_parte(request, 'jobs/galeria/_filtros.html', context)
+        
+        trabajos = streaming.resultado(f_trabajos, [])
+        context['trabajos'] = trabajos
+        context['has_next'] = len(trabajos) == GALERIA_LIMIT
+        yield streaming.render_parte(request, 'jobs/galeria/_lista_inicio.html', context)
+        yield from streaming.render_items('jobs/galeria/_tarjeta.html', 'trabajo', trabajos)
+        
+        context['bootstrap'] = con_usuario({}, streaming.resultado(f_usuario, SIN_RESOLVER))
+        yield streaming.render_parte(request, 'jobs/galeria/_lista_fin.html', context)
+        
+        if context['has_next']:
+            _prefetch_siguiente(params)
+    
+    return streaming.streaming_response(request, primera, resto())
+
+@precargar('css/jobs/detalle.css', 'js/jobs/detalle.js')
 def detalle_trabajo(request, trabajo_id):
     """Vista de detalle de un trabajo específico"""
     try:
-        response = requests.get(get_fastapi_url(f'/trabajos/{trabajo_id}'))
+        cached = prerender.servir_detalle(request, trabajo_id)
+        if cached:
+            return cached
         
-        if response.status_code == 404:
+        inicio = prerender.inicio_peticion()
+        context = cargar_detalle(trabajo_id)
+        
+        if context is None:
             messages.error(request, 'Trabajo no encontrado')
             return redirect('jobs:galeria')
         
-        trabajo = response.json() if response.status_code == 200 else None
-        
-        relacionados = []
-        if trabajo:
-            rel_response = requests.get(
-                get_fastapi_url('/trabajos/'),
-                params={'categoria': trabajo['categoria'], 'limit': 4}
-            )
-            if rel_response.status_code == 200:
-                relacionados = [t for t in rel_response.json() if t['id'] != trabajo_id][:3]
-        
-        context = {
-            'trabajo': trabajo,
-            'trabajos_relacionados': relacionados,
-        }
-        
-        return render(request, 'jobs/detalle.html', context)
+        response = render(request, 'jobs/detalle.html', context)
+        if context['trabajo']:
+            prerender.guardar_detalle(trabajo_id, context, response.content.decode(), desde=inicio)
+        return response
     
     except Exception as e:
         messages.error(request, f'Error al cargar el trabajo: {str(e)}')
         return redirect('jobs:galeria')
 
+@precargar('css/jobs/galeria.css', 'js/bootstrap.js', 'js/jobs/galeria.js')
 def trabajos_categoria(request, categoria):
     """Vista de trabajos filtrados por categoría"""
-    return galeria_trabajos(request)
+    return galeria_trabajos(request, categoria)
 
 # ==================== VISTAS DE ADMINISTRACIÓN ====================
 
+ADMIN_LIMIT = 20
+
+@precargar('css/jobs/admin/lista.css', 'js/jobs/admin/lista.js')
 def admin_trabajos(request):
     """Panel de administración de trabajos - SIN @login_required"""
     print(f"🔍 DEBUG admin_trabajos - Path: {request.path}")
@@ -140,7 +305,7 @@ def admin_trabajos(request):
         auth_url = get_fastapi_url('/auth/me')
         print(f"🔍 DEBUG - Verificando auth en: {auth_url}")
         
-        auth_response = requests.get(auth_url, headers=headers, timeout=5)
+        auth_response = backend.get(auth_url, headers=headers, timeout=5)
         print(f"🔍 DEBUG - Auth response status: {auth_response.status_code}")
         
         if auth_response.status_code != 200:
@@ -161,30 +326,37 @@ def admin_trabajos(request):
         
         # Obtener todos los trabajos
         page = int(request.GET.get('page', 1))
-        limit = 20
+        limit = ADMIN_LIMIT
         skip = (page - 1) * limit
         
-        trabajos_url = get_fastapi_url('/trabajos/')
-        print(f"🔍 DEBUG - Obteniendo trabajos de: {trabajos_url}")
-        
-        response = requests.get(
-            trabajos_url,
-            params={'skip': skip, 'limit': limit},
-            headers=headers,
-            timeout=5
-        )
+        if streaming.esta_activo():
+            return _admin_trabajos_streaming(request, headers, page)
         
-        print(f"🔍 DEBUG - Trabajos response status: {response.status_code}")
+        params = {'skip': skip, 'limit': limit}
+        trabajos = _lista_prefetcheada(params, admin=True)
         
-        if response.status_code == 401:
-            messages.error(request, 'Sesión expirada')
-            return redirect('authentication:login_page')
+        if trabajos is None:
+            trabajos_url = get_fastapi_url('/trabajos/')
+            print(f"🔍 DEBUG - Obteniendo trabajos de: {trabajos_url}")
             
-        trabajos = response.json() if response.status_code == 200 else []
+            response = backend.get(
+                trabajos_url,
+                params=params,
+                headers=headers,
+                timeout=5
+            )
+            
+            print(f"🔍 DEBUG - Trabajos response status: {response.status_code}")
+            
+            if response.status_code == 401:
+                messages.error(request, 'Sesión expirada')
+                return redirect('authentication:login_page')
+                
+            trabajos = response.json() if response.status_code == 200 else []
         print(f"✅ Trabajos cargados: {len(trabajos)}")
         
         # Obtener estadísticas
-        stats_response = requests.get(
+        stats_response = backend.get(
             get_fastapi_url('/trabajos/estadisticas'), 
             headers=headers,
             timeout=5
@@ -194,11 +366,16 @@ def admin_trabajos(request):
         context = {
             'trabajos': trabajos,
             'estadisticas': estadisticas,
+            'categorias': _fetch_categorias(),
+            'subidas': request.session.pop('subidas_pendientes', []),
             'page': page,
             'has_next': len(trabajos) == limit,
             'has_prev': page > 1,
         }
         
+        if context['has_next']:
+            _prefetch_siguiente(params, headers)
+        
         print("✅ Renderizando template admin/lista.html")
         return render(request, 'jobs/admin/lista.html', context)
     
@@ -217,6 +394,64 @@ def admin_trabajos(request):
         messages.error(request, f'Error al cargar trabajos: {str(e)}')
         return render(request, 'jobs/admin/lista.html', {'trabajos': []})
 
+def _admin_trabajos_streaming(request, headers, page):
+    """Panel en streaming: cabecera y mensajes ya, estadísticas y filas al llegar"""
+    params = {'skip': (page - 1) * ADMIN_LIMIT, 'limit': ADMIN_LIMIT}
+    prefetcheados = _lista_prefetcheada(params, admin=True)
+    f_trabajos = None if prefetcheados is not None else backend.submit(lambda: backend.get(
+        get_fastapi_url('/trabajos/'),
+        params=params,
+        headers=headers,
+        timeout=5
+    ))
+    f_stats = backend.submit(lambda: _json_o(backend.get(
+        get_fastapi_url('/trabajos/estadisticas'),
+        headers=headers,
+        timeout=5
+    ), {}))
+    f_categorias = backend.submit(_fetch_categorias)
+    
+    # Los mensajes se consumen aquí, antes de que MessageMiddleware procese la respuesta
+    primera = streaming.render_parte(request, 'jobs/admin/lista/_inicio.html', {
+        'subidas': request.session.pop('subidas_pendientes', []),
+    })
+    
+    def resto():
+        context = {'page': page, 'has_prev': page > 1}
+        context['estadisticas'] = streaming.resultado(f_stats, {})
+        yield streaming.render_parte(request, 'jobs/admin/lista/_estadisticas.html', context)
+        
+        response = streaming.resultado(f_trabajos, None) if f_trabajos is not None else None
+        if prefetcheados is not None:
+            trabajos = prefetcheados
+        elif response is not None and response.status_code == 401:
+            # Ya no se puede redirigir con un 302: la página está a medio enviar
+            yield streaming.render_parte(request, 'jobs/admin/lista/_sesion_expirada.html')
+            trabajos = []
+        else:
+            trabajos = _json_o(response, []) if response is not None else []
+        
+        context['trabajos'] = trabajos
+        context['has_next'] = len(trabajos) == ADMIN_LIMIT
+        context['categorias'] = streaming.resultado(f_categorias, [])
+        yield streaming.render_parte(request, 'jobs/admin/lista/_tabla_inicio.html', context)
+        yield from streaming.render_items('jobs/admin/lista/_fila.html', 'trabajo', trabajos)
+        yield streaming.render_parte(request, 'jobs/admin/lista/_tabla_fin.html', context)
+        
+        if context['has_next']:
+            _prefetch_siguiente(params, headers)
+    
+    return streaming.streaming_response(request, primera, resto())
+
+def _encolar_subida(request, trabajo_id, token, files):
+    """Encola las imágenes y deja la tarea en sesión para que el panel muestre su progreso"""
+    tarea = subidas.encolar(trabajo_id, token, files)
+    pendientes = request.session.get('subidas_pendientes', [])
+    request.session['subidas_pendientes'] = pendientes + [tarea.pk]
+    messages.success(request, f'📸 Subiendo {len(files)} imágenes en segundo plano')
+    return tarea
+
+@medir_memoria('admin_crear_trabajo')
 def admin_crear_trabajo(request):
     """Crear nuevo trabajo - SIN @login_required"""
     print("=" * 80)
@@ -232,7 +467,7 @@ def admin_crear_trabajo(request):
         
         headers = {'Authorization': f'Bearer {token}'}
         
-        auth_response = requests.get(get_fastapi_url('/auth/me'), headers=headers)
+        auth_response = backend.get(get_fastapi_url('/auth/me'), headers=headers)
         if auth_response.status_code != 200:
             messages.error(request, 'Error de autenticación')
             return redirect('authentication:login_page')
@@ -248,7 +483,7 @@ def admin_crear_trabajo(request):
     
     if request.method == 'GET':
         print("📄 Mostrando formulario (GET)")
-        cat_response = requests.get(get_fastapi_url('/trabajos/categorias'))
+        cat_response = backend.get(get_fastapi_url('/trabajos/categorias'))
         categorias = cat_response.json() if cat_response.status_code == 200 else []
         
         return render(request, 'jobs/admin/crear_editar.html', {
@@ -300,6 +535,13 @@ def admin_crear_trabajo(request):
                 messages.error(request, 'La categoría es obligatoria')
                 raise ValueError('Categoría vacía')
             
+            # Rechazar imágenes inválidas antes de crear el trabajo
+            errores_imagenes = imagenes.validar_todas(request.FILES.getlist('imagenes'))
+            if errores_imagenes:
+                print(f"❌ ERROR: Imágenes inválidas: {errores_imagenes}")
+                messages.error(request, f'❌ {"; ".join(errores_imagenes)}')
+                raise ValueError('Imágenes inválidas')
+            
             data = {
                 'titulo': titulo,
                 'descripcion': descripcion,
@@ -331,7 +573,7 @@ def admin_crear_trabajo(request):
             url = get_fastapi_url('/trabajos/')
             print(f"🌐 URL: {url}")
             
-            response = requests.post(
+            response = backend.post(
                 url,
                 headers=headers,
                 json=data,
@@ -346,32 +588,21 @@ def admin_crear_trabajo(request):
                 trabajo = response.json()
                 print(f"✅ Trabajo creado con ID: {trabajo.get('id')}")
                 
-                # Subir imágenes
+                # Subir imágenes en segundo plano
                 files = request.FILES.getlist('imagenes')
                 if files:
-                    print(f"📸 Subiendo {len(files)} imágenes...")
-                    files_data = [('files', (f.name, f, f.content_type)) for f in files]
+                    print(f"📸 Encolando {len(files)} imágenes...")
                     try:
-                        img_response = requests.post(
-                            get_fastapi_url(f'/trabajos/{trabajo["id"]}/upload-images'),
-                            headers={'Authorization': f'Bearer {token}'},
-                            files=files_data,
-                            timeout=30
-                        )
-                        print(f"📸 Response status imágenes: {img_response.status_code}")
-                        if img_response.status_code == 200:
-                            print("✅ Imágenes subidas correctamente")
-                        else:
-                            print(f"⚠️  Error al subir imágenes: {img_response.text}")
-                            messages.warning(request, 'Trabajo creado pero hubo un error al subir las imágenes')
+                        _encolar_subida(request, trabajo['id'], token, files)
                     except Exception as img_error:
-                        print(f"❌ Error al subir imágenes: {str(img_error)}")
+                        print(f"❌ Error al encolar imágenes: {str(img_error)}")
                         import traceback
                         traceback.print_exc()
                         messages.warning(request, 'Trabajo creado pero las imágenes no se pudieron subir')
                 else:
                     print("ℹ️  No hay imágenes para subir")
                 
+                trabajos_modificados([trabajo['id']], [trabajo.get('categoria', categoria)])
                 messages.success(request, '✅ Trabajo creado exitosamente')
                 return redirect('jobs:admin_trabajos')
                 
@@ -446,7 +677,7 @@ def admin_crear_trabajo(request):
         
         # Recargar formulario con error
         print("🔄 Recargando formulario después de error")
-        cat_response = requests.get(get_fastapi_url('/trabajos/categorias'))
+        cat_response = backend.get(get_fastapi_url('/trabajos/categorias'))
         categorias = cat_response.json() if cat_response.status_code == 200 else []
         
         return render(request, 'jobs/admin/crear_editar.html', {
@@ -464,7 +695,7 @@ def admin_editar_trabajo(request, trabajo_id):
         
         headers = {'Authorization': f'Bearer {token}'}
         
-        auth_response = requests.get(get_fastapi_url('/auth/me'), headers=headers)
+        auth_response = backend.get(get_fastapi_url('/auth/me'), headers=headers)
         if auth_response.status_code != 200:
             messages.error(request, 'Error de autenticación')
             return redirect('authentication:login_page')
@@ -480,10 +711,10 @@ def admin_editar_trabajo(request, trabajo_id):
     
     if request.method == 'GET':
         try:
-            response = requests.get(get_fastapi_url(f'/trabajos/{trabajo_id}'))
+            response = backend.get(get_fastapi_url(f'/trabajos/{trabajo_id}'))
             trabajo = response.json() if response.status_code == 200 else None
             
-            cat_response = requests.get(get_fastapi_url('/trabajos/categorias'))
+            cat_response = backend.get(get_fastapi_url('/trabajos/categorias'))
             categorias = cat_response.json() if cat_response.status_code == 200 else []
             
             if not trabajo:
@@ -525,7 +756,11 @@ def admin_editar_trabajo(request, trabajo_id):
             if fecha_realizacion:
                 data['fecha_realizacion'] = f'{fecha_realizacion}T00:00:00'
             
-            response = requests.put(
+            errores_imagenes = imagenes.validar_todas(request.FILES.getlist('imagenes'))
+            if errores_imagenes:
+                raise imagenes.ImagenInvalida('; '.join(errores_imagenes))
+            
+            response = backend.put(
                 get_fastapi_url(f'/trabajos/{trabajo_id}'),
                 headers=headers,
                 json=data
@@ -534,13 +769,9 @@ def admin_editar_trabajo(request, trabajo_id):
             if response.status_code == 200:
                 files = request.FILES.getlist('imagenes')
                 if files:
-                    files_data = [('files', (f.name, f, f.content_type)) for f in files]
-                    img_response = requests.post(
-                        get_fastapi_url(f'/trabajos/{trabajo_id}/upload-images'),
-                        headers={'Authorization': f'Bearer {token}'},
-                        files=files_data
-                    )
+                    _encolar_subida(request, trabajo_id, token, files)
                 
+                trabajos_modificados([trabajo_id], [data['categoria']])
                 messages.success(request, 'Trabajo actualizado exitosamente')
                 return redirect('jobs:admin_trabajos')
             else:
@@ -550,10 +781,10 @@ def admin_editar_trabajo(request, trabajo_id):
         except Exception as e:
             messages.error(request, f'Error: {str(e)}')
         
-        cat_response = requests.get(get_fastapi_url('/trabajos/categorias'))
+        cat_response = backend.get(get_fastapi_url('/trabajos/categorias'))
         categorias = cat_response.json() if cat_response.status_code == 200 else []
         
-        response = requests.get(get_fastapi_url(f'/trabajos/{trabajo_id}'))
+        response = backend.get(get_fastapi_url(f'/trabajos/{trabajo_id}'))
         trabajo = response.json() if response.status_code == 200 else None
         
         if trabajo:
@@ -574,7 +805,7 @@ def admin_eliminar_trabajo(request, trabajo_id):
         
         headers = {'Authorization': f'Bearer {token}'}
         
-        auth_response = requests.get(get_fastapi_url('/auth/me'), headers=headers)
+        auth_response = backend.get(get_fastapi_url('/auth/me'), headers=headers)
         if auth_response.status_code != 200:
             messages.error(request, 'Error de autenticación')
             return redirect('authentication:login_page')
@@ -590,12 +821,13 @@ def admin_eliminar_trabajo(request, trabajo_id):
     
     if request.method == 'POST':
         try:
-            response = requests.delete(
+            response = backend.delete(
                 get_fastapi_url(f'/trabajos/{trabajo_id}'),
                 headers=headers
             )
             
             if response.status_code == 204:
+                trabajos_modificados([trabajo_id])
                 messages.success(request, 'Trabajo eliminado exitosamente')
             else:
                 messages.error(request, 'Error al eliminar trabajo')
@@ -615,7 +847,7 @@ def admin_eliminar_imagen(request, trabajo_id, imagen_index):
         
         headers = {'Authorization': f'Bearer {token}'}
         
-        auth_response = requests.get(get_fastapi_url('/auth/me'), headers=headers)
+        auth_response = backend.get(get_fastapi_url('/auth/me'), headers=headers)
         if auth_response.status_code != 200:
             return JsonResponse({'error': 'Error de autenticación'}, status=401)
         
@@ -623,12 +855,14 @@ def admin_eliminar_imagen(request, trabajo_id, imagen_index):
         if not user_data.get('is_admin'):
             return JsonResponse({'error': 'No tienes permisos de administrador'}, status=403)
         
-        response = requests.delete(
+        response = backend.delete(
             get_fastapi_url(f'/trabajos/{trabajo_id}/images/{imagen_index}'),
             headers=headers
         )
         
         if response.status_code == 200:
+            imagenes.olvidar_subidas(f'trabajo:{trabajo_id}')
+            trabajos_modificados([trabajo_id])
             return JsonResponse({'success': True, 'message': 'Imagen eliminada'})
         else:
             return JsonResponse({'error': 'Error al eliminar imagen'}, status=400)
@@ -649,7 +883,7 @@ def admin_toggle_destacado(request, trabajo_id):
             'Content-Type': 'application/json'
         }
         
-        auth_response = requests.get(get_fastapi_url('/auth/me'), headers=headers)
+        auth_response = backend.get(get_fastapi_url('/auth/me'), headers=headers)
         if auth_response.status_code != 200:
             return JsonResponse({'error': 'Error de autenticación'}, status=401)
         
@@ -660,16 +894,148 @@ def admin_toggle_destacado(request, trabajo_id):
         data = json.loads(request.body)
         destacar = data.get('destacar', False)
         
-        response = requests.patch(
+        response = backend.patch(
             get_fastapi_url(f'/trabajos/{trabajo_id}/destacar'),
             headers=headers,
             json={'destacar': destacar}
         )
         
         if response.status_code == 200:
+            trabajos_modificados([trabajo_id])
             return JsonResponse({'success': True, 'destacado': destacar})
         else:
             return JsonResponse({'error': 'Error al actualizar'}, status=400)
     
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({'error': str(e)}, status=500)
+
+# ==================== OPERACIONES MASIVAS ====================
+
+ACCIONES_MASIVAS = ('eliminar', 'destacar', 'quitar_destacado', 'categoria')
+MAX_IDS_MASIVOS = 100
+
+def _resultado_masivo(trabajo_id, response, esperado):
+    """Resultado de un item: ok o el error que devolvió FastAPI"""
+    if response.status_code == esperado:
+        return {'id': trabajo_id, 'ok': True, 'status': response.status_code}
+    try:
+        detalle = response.json().get('detail', 'Error desconocido')
+    except ValueError:
+        detalle = 'Error desconocido'
+    return {'id': trabajo_id, 'ok': False, 'status': response.status_code, 'error': str(detalle)}
+
+def _cambiar_categoria(trabajo_id, categoria, headers):
+    """FastAPI solo acepta el trabajo completo en el PUT: se lee y se reenvía"""
+    response = backend.get(get_fastapi_url(f'/trabajos/{trabajo_id}'), headers=headers, timeout=10)
+    if response.status_code != 200:
+        return response, None
+    trabajo = response.json()
+    data = {
+        'titulo': trabajo.get('titulo'),
+        'descripcion': trabajo.get('descripcion', ''),
+        'categoria': categoria,
+        'destacado': trabajo.get('destacado', False),
+        'tags': trabajo.get('tags', []),
+    }
+    if trabajo.get('fecha_realizacion'):
+        data['fecha_realizacion'] = trabajo['fecha_realizacion']
+    response = backend.put(get_fastapi_url(f'/trabajos/{trabajo_id}'), headers=headers, json=data, timeout=10)
+    return response, trabajo.get('categoria')
+
+@require_http_methods(["POST"])
+def admin_acciones_masivas(request):
+    """Eliminar, destacar o cambiar de categoría varios trabajos a la vez
+
+    Body JSON: {"accion": "eliminar|destacar|quitar_destacado|categoria",
+                "ids": [...], "categoria": "..."}
+    Verifica al admin una sola vez, reparte las escrituras en un pool
+    acotado y devuelve el resultado de cada trabajo.
+    """
+    token = request.session.get('access_token')
+    if not token:
+        return JsonResponse({'error': 'No autorizado'}, status=401)
+    
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'JSON inválido'}, status=400)
+    
+    accion = data.get('accion')
+    categoria = data.get('categoria', '')
+    ids = data.get('ids')
+    if accion not in ACCIONES_MASIVAS:
+        return JsonResponse({'error': 'Acción no válida'}, status=400)
+    if not isinstance(ids, list) or not ids:
+        return JsonResponse({'error': 'No se seleccionó ningún trabajo'}, status=400)
+    ids = list(dict.fromkeys(str(i) for i in ids))
+    if len(ids) > MAX_IDS_MASIVOS:
+        return JsonResponse({'error': f'Máximo {MAX_IDS_MASIVOS} trabajos por operación'}, status=400)
+    if accion == 'categoria' and not categoria:
+        return JsonResponse({'error': 'Falta la categoría'}, status=400)
+    
+    headers = {
+        'Authorization': f'Bearer {token}',
+        'Content-Type': 'application/json'
+    }
+    
+    try:
+        auth_response = backend.get(get_fastapi_url('/auth/me'), headers=headers, timeout=5)
+    except requests.exceptions.RequestException as e:
+        return JsonResponse({'error': f'Error de verificación: {str(e)}'}, status=503)
+    if auth_response.status_code != 200:
+        return JsonResponse({'error': 'Error de autenticación'}, status=401)
+    if not auth_response.json().get('is_admin'):
+        return JsonResponse({'error': 'No tienes permisos de administrador'}, status=403)
+    
+    categorias_afectadas = set()
+    if accion == 'categoria':
+        categorias_afectadas.add(categoria)
+    
+    def aplicar(trabajo_id):
+        try:
+            if accion == 'eliminar':
+                response = backend.delete(get_fastapi_url(f'/trabajos/{trabajo_id}'), headers=headers, timeout=10)
+                return _resultado_masivo(trabajo_id, response, 204)
+            if accion == 'categoria':
+                response, anterior = _cambiar_categoria(trabajo_id, categoria, headers)
+                if anterior:
+                    categorias_afectadas.add(anterior)
+                return _resultado_masivo(trabajo_id, response, 200)
+            response = backend.patch(
+                get_fastapi_url(f'/trabajos/{trabajo_id}/destacar'),
+                headers=headers,
+                json={'destacar': accion == 'destacar'},
+                timeout=10
+            )
+            return _resultado_masivo(trabajo_id, response, 200)
+        except requests.exceptions.RequestException as e:
+            return {'id': trabajo_id, 'ok': False, 'status': None, 'error': str(e)}
+    
+    resultados = backend.map_bounded(aplicar, ids)
+    
+    cambiados = [r['id'] for r in resultados if r['ok']]
+    if accion == 'eliminar':
+        for trabajo_id in cambiados:
+            imagenes.olvidar_subidas(f'trabajo:{trabajo_id}')
+    trabajos_modificados(cambiados, categorias_afectadas)
+    
+    return JsonResponse({
+        'accion': accion,
+        'total': len(resultados),
+        'correctos': len(cambiados),
+        'fallidos': len(resultados) - len(cambiados),
+        'resultados': resultados,
+    })
+
+@require_http_methods(["GET"])
+def admin_estado_subida(request, tarea_id):
+    """Progreso de una subida de imágenes en segundo plano (para el panel)"""
+    token = request.session.get('access_token')
+    if not token:
+        return JsonResponse({'error': 'No autorizado'}, status=401)
+    
+    tarea = TareaSubida.objects.filter(pk=tarea_id, propietario=subidas.hash_token(token)).first()
+    if tarea is None:
+        return JsonResponse({'error': 'Subida no encontrada'}, status=404)
+    
+    return JsonResponse(subidas.estado_tarea(tarea))
@@ -0,0 +1,82 @@
+import base64
+import os
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse as DjangoJsonResponse
+from django.test import override_settings
+
+from estetica_frontend import jsoncodec
+from estetica_frontend.backend import RespuestaBackend
+
+
+def _producto(i, imagenes, imagen_kb):
+    return {
+        'id': str(i),
+        'nombre': f'Producto {i}',
+        'descripcion': 'Tratamiento facial hidratante con ácido hialurónico ' * 3,
+        'precio': 199.5 + i,
+        'cantidad_disponible': i % 17,
+        'disponible': True,
+        'imagenes': [
+            base64.b64encode(os.urandom(imagen_kb * 1024)).decode()
+            for _ in range(imagenes)
+        ],
+        'created_at': '2025-03-01T10:00:00',
+        'updated_at': '2025-03-02T12:30:00',
+    }
+
+
+def _medir(funcion, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+class Command(BaseCommand):
+    help = 'Compara json y el codec rápido decodificando y codificando una página de productos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--productos', type=int, default=100)
+        parser.add_argument('--imagenes', type=int, default=2, help='Imágenes por producto')
+        parser.add_argument('--imagen-kb', type=int, default=60, help='KB de cada imagen antes de base64')
+        parser.add_argument('--repeticiones', type=int, default=10)
+
+    def handle(self, *args, **options):
+        productos = [
+            _producto(i, options['imagenes'], options['imagen_kb'])
+            for i in range(options['productos'])
+        ]
+        cuerpo = jsoncodec.dumps(productos)
+        self.stdout.write(
+            f"{options['productos']} productos, {len(cuerpo) / 1024 / 1024:.1f} MB de JSON, "
+            f"mejor de {options['repeticiones']} repeticiones"
+        )
+
+        def respuesta(clase):
+            response = clase()
+            response.status_code = 200
+            response._content = cuerpo
+            response.encoding = None
+            return response
+
+        # Lo que hacían los proxies: requests.Response.json() y django JsonResponse
+        base_decode = _medir(lambda: respuesta(requests.Response).json(), options['repeticiones'])
+        base_encode = _medir(lambda: DjangoJsonResponse(productos, safe=False), options['repeticiones'])
+        self.stdout.write(f"  json (antes)  decodificar {base_decode * 1000:8.1f} ms   codificar {base_encode * 1000:8.1f} ms")
+
+        if jsoncodec.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson no está instalado: el codec usa json'))
+            return
+
+        with override_settings(JSON_CODEC='orjson'):
+            decode = _medir(lambda: respuesta(RespuestaBackend).json(), options['repeticiones'])
+            encode = _medir(lambda: jsoncodec.JsonResponse(productos, safe=False), options['repeticiones'])
+        self.stdout.write(f"  orjson        decodificar {decode * 1000:8.1f} ms   codificar {encode * 1000:8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"  ahorro        decodificar {base_decode / decode:6.1f}x     codificar {base_encode / encode:6.1f}x"
+        ))
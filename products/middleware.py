@@ -1,7 +1,8 @@
-import requests
-from django.http import JsonResponse
 from django.conf import settings
 
+from estetica_frontend import backend
+from estetica_frontend.jsoncodec import JsonResponse
+
 
 def check_admin_permission(request):
     """Helper para verificar permisos de administrador"""
@@ -11,7 +12,7 @@ def check_admin_permission(request):
         return False, JsonResponse({'detail': 'No autenticado'}, status=401)
     
     try:
-        response = requests.get(
+        response = backend.get(
             f"{settings.FASTAPI_BASE_URL}/api/auth/me",
             headers={'Authorization': f'Bearer {token}'},
             timeout=10
@@ -1,3 +1,164 @@
-from django.test import TestCase
+import io
+import json
+import re
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from estetica_frontend import backend
+from estetica_frontend.grabacion import reproduciendo
+from estetica_frontend.presupuestos import PresupuestoBackendMixin, comprobar_presupuestos
+
+# Grabadas con BACKEND_RECORD_FILE (ver estetica_frontend.grabacion)
+GRABACIONES = Path(__file__).resolve().parent / 'fixtures' / 'backend'
+
+SIN_CACHES = override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    # Sin collectstatic no hay manifest
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    STREAMING_RENDER=False,
+    RATE_LIMIT_ENABLED=False,
+)
+
+
+@SIN_CACHES
+class CatalogoReplayTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_catalogo_con_productos_iniciales(self):
+        with reproduciendo(GRABACIONES / 'catalogo.jsonl'):
+            response = self.client.get('/products/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'bootstrap-data')
+        self.assertContains(response, 'Producto 60')
+
+    def test_bootstrap_igual_con_y_sin_streaming(self):
+        datos = []
+        for streaming in (False, True):
+            cache.clear()
+            with override_settings(STREAMING_RENDER=streaming), reproduciendo(GRABACIONES / 'catalogo.jsonl'):
+                response = self.client.get('/products/')
+                html = b''.join(response.streaming_content if streaming else [response.content]).decode()
+            bloque = re.search(r'<script id="bootstrap-data" type="application/json">(.*?)</script>', html, re.S)
+            datos.append(json.loads(bloque.group(1)))
+        self.assertEqual(datos[0], datos[1])
+        self.assertIsNone(datos[0]['user'])
+        self.assertEqual(len(datos[0]['products']), 60)
+
+    def test_api_lista(self):
+        with reproduciendo(GRABACIONES / 'catalogo.jsonl'):
+            response = self.client.get('/products/api/?skip=0&limit=100')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 60)
+
+    def test_api_solo_disponibles(self):
+        with reproduciendo(GRABACIONES / 'catalogo.jsonl'):
+            response = self.client.get('/products/api/?skip=0&limit=20&available_only=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 20)
+
+
+def _respuesta(status, data):
+    return mock.Mock(status_code=status, json=mock.Mock(return_value=data))
+
+
+def _imagen(color):
+    salida = io.BytesIO()
+    Image.new('RGB', (8, 8), color).save(salida, 'JPEG')
+    return salida.getvalue()
+
+
+@SIN_CACHES
+class BatchProductosTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _batch(self, ids, respuestas):
+        """GET del batch con FastAPI respondiendo ``respuestas[id]`` (o lanzándola)"""
+        def get(url, **kwargs):
+            respuesta = respuestas[url.rsplit('/', 1)[1]]
+            if isinstance(respuesta, Exception):
+                raise respuesta
+            return respuesta
+
+        with mock.patch.object(backend, 'get', side_effect=get) as llamada:
+            response = self.client.get('/products/api/batch/', {'ids': ids})
+        return response.json(), [c.args[0].rsplit('/', 1)[1] for c in llamada.call_args_list]
+
+    def test_status_por_id_y_repetidos(self):
+        data, pedidos = self._batch('a,b,a,c', {
+            'a': _respuesta(200, {'id': 'a'}),
+            'b': _respuesta(404, {'detail': 'No existe'}),
+            'c': requests.exceptions.ConnectionError('caído'),
+        })
+        self.assertEqual(sorted(pedidos), ['a', 'b', 'c'])
+        self.assertEqual(
+            [(r['id'], r['status']) for r in data['results']],
+            [('a', 200), ('b', 404), ('c', 502)],
+        )
+        self.assertEqual(data['results'][0]['product'], {'id': 'a'})
+        self.assertEqual(data['results'][1]['detail'], 'No existe')
+
+    def test_segunda_vez_desde_la_cache(self):
+        self._batch('a', {'a': _respuesta(200, {'id': 'a'})})
+        data, pedidos = self._batch('a', {})
+        self.assertEqual(pedidos, [])
+        self.assertEqual((data['cached'], data['fetched']), (1, 0))
+        self.assertEqual(data['results'][0]['product'], {'id': 'a'})
+
+    def test_ids_invalidos_no_llegan_a_fastapi(self):
+        data, pedidos = self._batch('a,../users/me,x?y=1,b#c', {'a': _respuesta(200, {'id': 'a'})})
+        self.assertEqual(pedidos, ['a'])
+        self.assertEqual([r['status'] for r in data['results']], [200, 400, 400, 400])
+        self.assertEqual(data['results'][1]['detail'], 'ID de producto inválido')
+
+
+@SIN_CACHES
+class SubidaImagenesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        session = self.client.session
+        session['access_token'] = 'tok'
+        session.save()
+
+    def _subir(self, *contenidos):
+        archivos = [SimpleUploadedFile(f'{i}.jpg', c, 'image/jpeg') for i, c in enumerate(contenidos)]
+        with mock.patch.object(backend, 'post', return_value=_respuesta(200, {'message': 'ok'})) as post:
+            response = self.client.post('/products/api/p1/upload-images/', {'images': archivos})
+        return response.json(), [len(c.kwargs['files']) for c in post.call_args_list]
+
+    def test_omite_repetidas_en_la_peticion_y_ya_subidas(self):
+        roja, azul = _imagen('red'), _imagen('blue')
+        data, enviadas = self._subir(roja, roja, azul)
+        self.assertEqual(enviadas, [2])
+        self.assertEqual(data['normalizacion']['duplicadas_omitidas'], 1)
+        # La segunda vez ya no hay nada que enviar
+        data, enviadas = self._subir(azul)
+        self.assertEqual(enviadas, [])
+        self.assertEqual(data['message'], 'Las imágenes ya estaban subidas')
+
+    def test_archivo_que_no_es_imagen(self):
+        data, enviadas = self._subir(b'GIF no')
+        self.assertEqual(enviadas, [])
+        self.assertIn('no es una imagen', data['detail'])
+
+
+@SIN_CACHES
+class PresupuestosTests(PresupuestoBackendMixin, TestCase):
+    def test_presupuestos(self):
+        comprobar_presupuestos(self, 'products:')
+
+    def test_lista_cacheada_no_llama_a_fastapi(self):
+        with reproduciendo(GRABACIONES / 'catalogo.jsonl'):
+            self.client.get('/products/api/?skip=0&limit=100')
+            with self.assertLlamadasBackend(0):
+                self.client.get('/products/api/?skip=0&limit=100')
@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 app_name = 'products'
@@ -14,5 +14,6 @@ urlpatterns = [
     path('api/<str:product_id>/upload-images/', views.upload_product_images_api, name='api_upload_images'),  # NUEVO
     # API endpoints públicos
     path('api/', views.get_products_api, name='api_list'),
+    re_path(r'^api/batch/?$', views.get_products_batch_api, name='api_batch'),  # APPEND_SLASH está desactivado
     path('api/<str:product_id>/', views.get_product_detail_api, name='api_detail'),
 ]
\ No newline at end of file
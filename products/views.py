@@ -1,21 +1,119 @@
 import requests
 from django.shortcuts import render
-from django.http import JsonResponse
 from django.conf import settings
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.html import json_script
+import hashlib
 import json
 import logging
+import re
+
+from estetica_frontend import backend, cache_ns, imagenes, metrics, streaming
+from estetica_frontend.jsoncodec import JsonResponse
+from estetica_frontend.bootstrap import SIN_RESOLVER, usuario_actual, con_usuario
+from estetica_frontend.memoria import medir_memoria
+from estetica_frontend.precarga import precargar
+from estetica_frontend.ratelimit import rate_limit
 
 logger = logging.getLogger(__name__)
 
+# Espacio de caché compartida de productos (ver estetica_frontend.cache_ns)
+ESPACIO_CACHE = 'productos'
+
+# IDs aceptados en el batch; con '/', '?' o '..' la URL apuntaría a otro endpoint de FastAPI
+ID_PRODUCTO = re.compile(r'[\w-]+')
+
+
+def fetch_products(skip=0, limit=100, search='', available_only=False):
+    """Pide a FastAPI una página de productos"""
+    fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
+    url = f"{fastapi_url}/api/products/"
+    
+    params = {
+        'skip': skip,
+        'limit': limit,
+        'available_only': available_only
+    }
+    
+    if search:
+        params['search'] = search
+    
+    return backend.get(url, params=params, timeout=10)
+
+
+def listar_productos(skip=0, limit=100, search='', available_only=False):
+    """fetch_products pasando por la caché compartida
+
+    Returns:
+        (status, cuerpo JSON)
+    """
+    params = json.dumps([str(skip), str(limit), search, available_only])
+    nombre = 'lista:' + hashlib.blake2b(params.encode(), digest_size=16).hexdigest()
+    data = cache_ns.get(ESPACIO_CACHE, nombre)
+    if data is not None:
+        metrics.incr('product_cache_hits')
+        return 200, data
+    
+    metrics.incr('product_cache_misses')
+    response = fetch_products(skip, limit, search, available_only)
+    data = response.json()
+    if response.status_code == 200:
+        cache_ns.set(ESPACIO_CACHE, nombre, data, getattr(settings, 'PRODUCT_CACHE_TTL', 60))
+    return response.status_code, data
+
+
+def _productos_iniciales():
+    """Primera página del catálogo (la misma que pide catalog.js al cargar)"""
+    try:
+        status, data = listar_productos(limit=100)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Error cargando productos iniciales: {e}")
+        return None
+    return data if status == 200 else None
+
 
+@precargar('css/products/catalog.css', 'js/bootstrap.js', 'js/products/catalog.js')
 def products_catalog(request):
     """Vista para el catálogo de productos"""
-    return render(request, 'products/catalog.html')
+    token = request.session.get('access_token')
+    
+    if streaming.esta_activo():
+        return _catalog_streaming(request, token)
+    
+    usuario, productos = backend.parallel(
+        lambda: usuario_actual(token),
+        _productos_iniciales,
+    )
+    bootstrap = con_usuario({}, usuario)
+    if productos is not None:
+        bootstrap['products'] = productos
+    return render(request, 'products/catalog.html', {'bootstrap': bootstrap})
+
+
+def _catalog_streaming(request, token):
+    """Catálogo en streaming: la página sale ya y los productos al llegar"""
+    f_usuario = backend.submit(lambda: usuario_actual(token))
+    f_productos = backend.submit(_productos_iniciales)
+    
+    primera = streaming.render_parte(request, 'products/catalog/_pagina.html')
+    
+    def resto():
+        bootstrap = con_usuario({}, streaming.resultado(f_usuario, SIN_RESOLVER))
+        productos = streaming.resultado(f_productos, None)
+        yield '    '
+        if isinstance(productos, list):
+            yield from streaming.json_script_items('bootstrap-data', bootstrap, 'products', productos)
+        else:
+            yield json_script(bootstrap, 'bootstrap-data') + '\n'
+        yield streaming.render_parte(request, 'products/catalog/_scripts.html')
+    
+    return streaming.streaming_response(request, primera, resto())
 
 
 @require_http_methods(["GET"])
+@rate_limit('products_read')
+@medir_memoria('get_products_api')
 def get_products_api(request):
     """API proxy para obtener productos desde FastAPI"""
     try:
@@ -24,42 +122,120 @@ def get_products_api(request):
         search = request.GET.get('search', '')
         available_only = request.GET.get('available_only', 'false')
         
-        fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
-        url = f"{fastapi_url}/api/products/"
-        
-        params = {
-            'skip': skip,
-            'limit': limit,
-            'available_only': available_only.lower() == 'true'
-        }
-        
-        if search:
-            params['search'] = search
-        
-        response = requests.get(url, params=params, timeout=10)
-        return JsonResponse(response.json(), status=response.status_code, safe=False)
+        status, data = listar_productos(skip, limit, search, available_only.lower() == 'true')
+        return JsonResponse(data, status=status, safe=False)
         
     except Exception as e:
         logger.error(f"Error en get_products_api: {e}")
         return JsonResponse({'detail': str(e)}, status=500)
 
 
+# ==================== CACHÉ DE PRODUCTOS ====================
+
+def _clave_producto(product_id):
+    return f'producto:{product_id}'
+
+
+def olvidar_productos():
+    """Tras cualquier escritura: listas y detalles dejan de valer en todos los workers"""
+    cache_ns.invalidar(ESPACIO_CACHE)
+
+
+def fetch_product(product_id):
+    """Pide un producto a FastAPI y lo guarda en caché si existe
+
+    Returns:
+        (status, cuerpo JSON)
+    """
+    fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
+    response = backend.get(f"{fastapi_url}/api/products/{product_id}", timeout=10)
+    data = response.json()
+    if response.status_code == 200:
+        cache_ns.set(ESPACIO_CACHE, _clave_producto(product_id), data, getattr(settings, 'PRODUCT_CACHE_TTL', 60))
+    return response.status_code, data
+
+
 @require_http_methods(["GET"])
+@rate_limit('products_read')
 def get_product_detail_api(request, product_id):
     """API proxy para obtener detalle de un producto"""
     try:
-        fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
-        url = f"{fastapi_url}/api/products/{product_id}"
-        response = requests.get(url, timeout=10)
-        return JsonResponse(response.json(), status=response.status_code)
+        data = cache_ns.get(ESPACIO_CACHE, _clave_producto(product_id))
+        if data is not None:
+            metrics.incr('product_cache_hits')
+            return JsonResponse(data)
+        
+        metrics.incr('product_cache_misses')
+        status, data = fetch_product(product_id)
+        return JsonResponse(data, status=status, safe=False)
         
     except Exception as e:
         logger.error(f"Error en get_product_detail_api: {e}")
         return JsonResponse({'detail': str(e)}, status=500)
 
 
+@require_http_methods(["GET"])
+@rate_limit('products_read')
+def get_products_batch_api(request):
+    """Varios productos en una sola petición: /products/api/batch/?ids=1,2,3
+
+    Los IDs repetidos se piden una vez, los que están en caché no se piden
+    y el resto se piden a FastAPI en paralelo. Cada ID lleva su propio
+    status, así que un producto inexistente no hace fallar a los demás.
+    Un ID con caracteres no válidos recibe un 400 y no se pide.
+    """
+    ids = []
+    for valor in request.GET.getlist('ids'):
+        ids.extend(i.strip() for i in valor.split(',') if i.strip())
+    ids = list(dict.fromkeys(ids))
+    
+    if not ids:
+        return JsonResponse({'detail': 'Falta el parámetro ids'}, status=400)
+    maximo = getattr(settings, 'PRODUCT_BATCH_MAX_IDS', 50)
+    if len(ids) > maximo:
+        return JsonResponse({'detail': f'Máximo {maximo} productos por petición'}, status=400)
+    
+    validos = [i for i in ids if ID_PRODUCTO.fullmatch(i)]
+    en_cache = cache_ns.get_many(ESPACIO_CACHE, [_clave_producto(i) for i in validos])
+    pendientes = [i for i in validos if _clave_producto(i) not in en_cache]
+    metrics.incr('product_cache_hits', len(validos) - len(pendientes))
+    metrics.incr('product_cache_misses', len(pendientes))
+    
+    def pedir(product_id):
+        try:
+            return fetch_product(product_id)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error en get_products_batch_api ({product_id}): {e}")
+            return 502, {'detail': 'Error al consultar el producto'}
+    
+    pedidos = dict(zip(pendientes, backend.map_bounded(
+        pedir, pendientes, getattr(settings, 'PRODUCT_BATCH_CONCURRENCY', 8)
+    )))
+    
+    resultados = []
+    for product_id in ids:
+        if not ID_PRODUCTO.fullmatch(product_id):
+            status, data = 400, {'detail': 'ID de producto inválido'}
+        elif product_id in pedidos:
+            status, data = pedidos[product_id]
+        else:
+            status, data = 200, en_cache[_clave_producto(product_id)]
+        if status == 200:
+            resultados.append({'id': product_id, 'status': status, 'product': data})
+        else:
+            detalle = data.get('detail', 'Error desconocido') if isinstance(data, dict) else 'Error desconocido'
+            resultados.append({'id': product_id, 'status': status, 'detail': detalle})
+    
+    return JsonResponse({
+        'results': resultados,
+        'cached': len(validos) - len(pendientes),
+        'fetched': len(pendientes),
+    })
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limit('products_write')
 def create_product_api(request):
     """API proxy para crear un producto (solo admin)"""
     try:
@@ -72,12 +248,13 @@ def create_product_api(request):
         fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
         url = f"{fastapi_url}/api/products/"
         
-        response = requests.post(
+        response = backend.post(
             url,
             json=data,
             headers={'Authorization': f'Bearer {token}'},
             timeout=10
         )
+        olvidar_productos()
         
         return JsonResponse(response.json(), status=response.status_code)
         
@@ -90,6 +267,7 @@ def create_product_api(request):
 
 @csrf_exempt
 @require_http_methods(["PUT"])
+@rate_limit('products_write')
 def update_product_api(request, product_id):
     """API proxy para actualizar un producto (solo admin)"""
     try:
@@ -102,12 +280,13 @@ def update_product_api(request, product_id):
         fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
         url = f"{fastapi_url}/api/products/{product_id}"
         
-        response = requests.put(
+        response = backend.put(
             url,
             json=data,
             headers={'Authorization': f'Bearer {token}'},
             timeout=10
         )
+        olvidar_productos()
         
         return JsonResponse(response.json(), status=response.status_code)
         
@@ -120,6 +299,7 @@ def update_product_api(request, product_id):
 
 @csrf_exempt
 @require_http_methods(["DELETE"])
+@rate_limit('products_write')
 def delete_product_api(request, product_id):
     """API proxy para eliminar un producto (solo admin)"""
     try:
@@ -130,11 +310,12 @@ def delete_product_api(request, product_id):
         fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
         url = f"{fastapi_url}/api/products/{product_id}"
         
-        response = requests.delete(
+        response = backend.delete(
             url,
             headers={'Authorization': f'Bearer {token}'},
             timeout=10
         )
+        olvidar_productos()
         
         if response.status_code == 204:
             return JsonResponse({'message': 'Producto eliminado exitosamente'})
@@ -147,6 +328,8 @@ def delete_product_api(request, product_id):
     
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limit('products_write')
+@medir_memoria('upload_product_images_api')
 def upload_product_images_api(request, product_id):
     """API proxy para subir múltiples imágenes (solo admin)"""
     try:
@@ -160,25 +343,56 @@ def upload_product_images_api(request, product_id):
         if not files:
             return JsonResponse({'detail': 'No se enviaron imágenes'}, status=400)
         
+        # Rechazar archivos inválidos antes de enviar nada a FastAPI
+        errores = imagenes.validar_todas(files)
+        if errores:
+            return JsonResponse({'detail': '; '.join(errores), 'errores': errores}, status=400)
+        
+        destino = f'producto:{product_id}'
+        vistos = imagenes.ya_subidas(destino)
+        normalizadas = []
+        duplicadas = 0
+        for file in files:
+            info = imagenes.normalizar(file.read(), file.name)
+            if info['sha256'] in vistos:
+                duplicadas += 1
+                continue
+            vistos.add(info['sha256'])
+            normalizadas.append(info)
+        
+        metrics.incr('images_duplicates_skipped', duplicadas)
+        resumen = imagenes.resumen(normalizadas, duplicadas)
+        
+        if not normalizadas:
+            return JsonResponse({'message': 'Las imágenes ya estaban subidas', 'normalizacion': resumen})
+        
         fastapi_url = getattr(settings, 'FASTAPI_BASE_URL', 'http://fastapi:8000')
         url = f"{fastapi_url}/api/products/{product_id}/upload-images"
         
         # Preparar archivos para enviar a FastAPI
-        files_data = []
-        for file in files:
-            files_data.append(
-                ('files', (file.name, file.read(), file.content_type))
-            )
+        files_data = [
+            ('files', (info['nombre'], info['contenido'], info['content_type']))
+            for info in normalizadas
+        ]
         
-        response = requests.post(
+        response = backend.post(
             url,
             files=files_data,
             headers={'Authorization': f'Bearer {token}'},
             timeout=30
         )
         
-        return JsonResponse(response.json(), status=response.status_code)
+        data = response.json()
+        olvidar_productos()
+        if response.status_code == 200:
+            imagenes.registrar_subidas(destino, [info['sha256'] for info in normalizadas])
+            if isinstance(data, dict):
+                data['normalizacion'] = resumen
+        
+        return JsonResponse(data, status=response.status_code)
         
+    except imagenes.ImagenInvalida as e:
+        return JsonResponse({'detail': str(e)}, status=400)
     except Exception as e:
         logger.error(f"Error en upload_product_images_api: {e}")
         return JsonResponse({'detail': str(e)}, status=500)
\ No newline at end of file
@@ -0,0 +1,101 @@
+// Crear partículas
+window.addEventListener('load', function() {
+    const particlesContainer = document.getElementById('particles');
+    for (let i = 0; i < 30; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+        particle.style.width = Math.random() * 100 + 50 + 'px';
+        particle.style.height = particle.style.width;
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 20 + 's';
+        particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+        particlesContainer.appendChild(particle);
+    }
+});
+
+// Verificar si el usuario está autenticado al cargar la página
+window.addEventListener('load', async function() {
+    try {
+        const response = await fetch('/auth/api/me/', {
+            headers: {
+                'X-CSRFToken': getCSRFToken()
+            }
+        });
+
+        if (!response.ok) {
+            // Si no está autenticado, redirigir al login
+            window.location.href = '/auth/login/';
+        }
+    } catch (error) {
+        console.log('Error verificando autenticación:', error);
+        window.location.href = '/auth/login/';
+    }
+});
+
+document.getElementById('changePasswordForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const currentPassword = document.getElementById('current_password').value;
+    const newPassword = document.getElementById('new_password').value;
+    const confirmPassword = document.getElementById('confirm_password').value;
+
+    if (newPassword !== confirmPassword) {
+        showMessage('❌ Las contraseñas no coinciden', 'error');
+        return;
+    }
+
+    if (newPassword.length < 8) {
+        showMessage('❌ La nueva contraseña debe tener al menos 8 caracteres', 'error');
+        return;
+    }
+
+    const formData = {
+        current_password: currentPassword,
+        new_password: newPassword,
+        confirm_password: confirmPassword
+    };
+
+    const messageDiv = document.getElementById('message');
+    messageDiv.style.display = 'none';
+
+    try {
+        const response = await fetch('/auth/api/change-password/', {
+            method: 'PUT',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: JSON.stringify(formData)
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            showMessage('✅ Contraseña cambiada exitosamente!', 'success');
+            // Limpiar el formulario
+            document.getElementById('changePasswordForm').reset();
+        } else {
+            showMessage('❌ ' + (data.detail || 'Error cambiando la contraseña'), 'error');
+        }
+    } catch (error) {
+        showMessage('❌ Error de conexión con el servidor', 'error');
+    }
+});
+
+function showMessage(text, type) {
+    const messageDiv = document.getElementById('message');
+    messageDiv.textContent = text;
+    messageDiv.className = `message ${type}`;
+    messageDiv.style.display = 'block';
+
+    // Auto-hide después de 5 segundos
+    setTimeout(() => {
+        messageDiv.style.display = 'none';
+    }, 5000);
+}
+
+function getCSRFToken() {
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]');
+    return csrfToken ? csrfToken.value : '';
+}
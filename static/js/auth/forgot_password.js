@@ -0,0 +1,180 @@
+// Crear partículas
+window.addEventListener('load', function() {
+    const particlesContainer = document.getElementById('particles');
+    for (let i = 0; i < 30; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+        particle.style.width = Math.random() * 100 + 50 + 'px';
+        particle.style.height = particle.style.width;
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 20 + 's';
+        particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+        particlesContainer.appendChild(particle);
+    }
+});
+
+let currentEmail = '';
+let currentResetCode = '';
+
+function showStep(stepNumber) {
+    // Ocultar todos los formularios
+    document.getElementById('email-form').style.display = 'none';
+    document.getElementById('verification-form').style.display = 'none';
+    document.getElementById('reset-form').style.display = 'none';
+
+    // Resetear indicadores de pasos
+    document.querySelectorAll('.step').forEach(step => step.classList.remove('active'));
+
+    // Mostrar el formulario correcto y activar el paso
+    if (stepNumber === 1) {
+        document.getElementById('email-form').style.display = 'block';
+        document.getElementById('step1').classList.add('active');
+    } else if (stepNumber === 2) {
+        document.getElementById('verification-form').style.display = 'block';
+        document.getElementById('step2').classList.add('active');
+    } else if (stepNumber === 3) {
+        document.getElementById('reset-form').style.display = 'block';
+        document.getElementById('step3').classList.add('active');
+    }
+}
+
+function goBack() {
+    showStep(1);
+}
+
+function goBackToVerify() {
+    showStep(2);
+}
+
+// Paso 1: Solicitar código de recuperación
+document.getElementById('forgotForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const email = document.getElementById('email').value;
+    currentEmail = email;
+
+    const formData = { email: email };
+
+    try {
+        const response = await fetch('/auth/api/forgot_password/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: JSON.stringify(formData)
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            showMessage('✅ Código enviado a tu correo electrónico', 'success');
+            setTimeout(() => {
+                showStep(2);
+            }, 2000);
+        } else {
+            showMessage('❌ ' + ('Error enviando el código'), 'error');
+        }
+    } catch (error) {
+        showMessage('❌ Error de conexión con el servidor', 'error');
+    }
+});
+
+// Paso 2: Verificar código
+document.getElementById('verifyForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const resetCode = document.getElementById('reset_code').value;
+    currentResetCode = resetCode;
+
+    const formData = {
+        email: currentEmail,
+        reset_code: resetCode
+    };
+
+    try {
+        const response = await fetch('/auth/api/verify-reset-code/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: JSON.stringify(formData)
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            showMessage('✅ Código válido', 'success');
+            setTimeout(() => {
+                showStep(3);
+            }, 1500);
+        } else {
+            showMessage('❌ ' + ('Código inválido'), 'error');
+        }
+    } catch (error) {
+        showMessage('❌ Error de conexión con el servidor', 'error');
+    }
+});
+
+// Paso 3: Restablecer contraseña
+document.getElementById('resetForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const newPassword = document.getElementById('new_password').value;
+    const confirmPassword = document.getElementById('confirm_password').value;
+
+    if (newPassword !== confirmPassword) {
+        showMessage('❌ Las contraseñas no coinciden', 'error');
+        return;
+    }
+
+    const formData = {
+        email: currentEmail,
+        reset_code: currentResetCode,
+        new_password: newPassword,
+        confirm_password: confirmPassword
+    };
+
+    try {
+        const response = await fetch('/auth/api/reset-password/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: JSON.stringify(formData)
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            showMessage('✅ Contraseña cambiada exitosamente! Redirigiendo al login...', 'success');
+            setTimeout(() => {
+                window.location.href = '/auth/login/';
+            }, 3000);
+        } else {
+            showMessage('❌ ' + ('Error cambiando la contraseña'), 'error');
+        }
+    } catch (error) {
+        showMessage('❌ Error de conexión con el servidor', 'error');
+    }
+});
+
+function showMessage(text, type) {
+    const messageDiv = document.getElementById('message');
+    messageDiv.textContent = text;
+    messageDiv.className = `message ${type}`;
+    messageDiv.style.display = 'block';
+
+    // Auto-hide después de 5 segundos
+    setTimeout(() => {
+        messageDiv.style.display = 'none';
+    }, 5000);
+}
+
+function getCSRFToken() {
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]');
+    return csrfToken ? csrfToken.value : '';
+}
@@ -0,0 +1,79 @@
+// Crear partículas
+window.addEventListener('load', function() {
+    const particlesContainer = document.getElementById('particles');
+    for (let i = 0; i < 30; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+        particle.style.width = Math.random() * 100 + 50 + 'px';
+        particle.style.height = particle.style.width;
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 20 + 's';
+        particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+        particlesContainer.appendChild(particle);
+    }
+});
+
+document.getElementById('registerForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const password = document.getElementById('password').value;
+    const confirmPassword = document.getElementById('confirm_password').value;
+
+    if (password !== confirmPassword) {
+        showMessage('❌ Las contraseñas no coinciden', 'error');
+        return;
+    }
+
+    const formData = {
+        full_name: document.getElementById('full_name').value,
+        email: document.getElementById('email').value,
+        password: password
+    };
+
+    const messageDiv = document.getElementById('message');
+    messageDiv.style.display = 'none';
+
+    try {
+        const response = await fetch('/auth/api/register/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: JSON.stringify(formData)
+        });
+
+        const contentType = response.headers.get('content-type');
+        if (!contentType || !contentType.includes('application/json')) {
+            const textResponse = await response.text();
+            showMessage('❌ Error: El servidor no devolvió JSON. Revisa la configuración de URLs.', 'error');
+            return;
+        }
+
+        const data = await response.json();
+
+        if (response.ok) {
+            showMessage('✅ Cuenta creada exitosamente! Redirigiendo al login...', 'success');
+            setTimeout(() => {
+                window.location.href = '/auth/login/';
+            }, 2000);
+        } else {
+            showMessage('❌ ' + ('Error en el registro'), 'error');
+        }
+    } catch (error) {
+        showMessage('❌ Error de conexión: ' + error.message, 'error');
+    }
+});
+
+function showMessage(text, type) {
+    const messageDiv = document.getElementById('message');
+    messageDiv.textContent = text;
+    messageDiv.className = `message ${type}`;
+    messageDiv.style.display = 'block';
+}
+
+function getCSRFToken() {
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]');
+    return csrfToken ? csrfToken.value : '';
+}
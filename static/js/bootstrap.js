@@ -0,0 +1,28 @@
+// Datos iniciales que el servidor incrusta en la página (ver estetica_frontend/bootstrap.py)
+const BOOTSTRAP = (function() {
+    const el = document.getElementById('bootstrap-data');
+    if (!el) {
+        return {};
+    }
+    try {
+        return JSON.parse(el.textContent) || {};
+    } catch (error) {
+        return {};
+    }
+})();
+
+// Devuelve el dato y lo consume: las recargas posteriores van al servidor
+function takeBootstrap(key) {
+    if (!(key in BOOTSTRAP)) {
+        return undefined;
+    }
+    const value = BOOTSTRAP[key];
+    delete BOOTSTRAP[key];
+    return value;
+}
+
+// Usuario actual sin consumirlo (varias funciones de la página lo consultan).
+// undefined: el servidor no lo resolvió; null: no hay sesión.
+function bootstrapUser() {
+    return BOOTSTRAP.user;
+}
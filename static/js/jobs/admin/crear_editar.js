@@ -0,0 +1,186 @@
+// Crear partículas
+window.addEventListener('load', function() {
+    const particlesContainer = document.getElementById('particles');
+    for (let i = 0; i < 30; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+        particle.style.width = Math.random() * 100 + 50 + 'px';
+        particle.style.height = particle.style.width;
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 20 + 's';
+        particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+        particlesContainer.appendChild(particle);
+    }
+});
+
+// Mostrar mensajes después de cargar
+document.addEventListener('DOMContentLoaded', function() {
+    const messages = document.querySelectorAll('.message');
+    messages.forEach(msg => {
+        setTimeout(() => {
+            msg.style.opacity = '0';
+            setTimeout(() => msg.remove(), 300);
+        }, 5000);
+    });
+
+    // Inicializar contador de caracteres
+    updateCharCount();
+});
+
+let selectedFiles = [];
+
+// Drag and drop functionality
+const uploadArea = document.getElementById('uploadArea');
+
+uploadArea.addEventListener('dragover', function(e) {
+    e.preventDefault();
+    uploadArea.classList.add('drag-over');
+});
+
+uploadArea.addEventListener('dragleave', function() {
+    uploadArea.classList.remove('drag-over');
+});
+
+uploadArea.addEventListener('drop', function(e) {
+    e.preventDefault();
+    uploadArea.classList.remove('drag-over');
+    const files = e.dataTransfer.files;
+    handleFiles(files);
+});
+
+function handleFiles(files) {
+    selectedFiles = Array.from(files).slice(0, 10);
+    previewImages({ target: { files: selectedFiles } });
+}
+
+function previewImages(event) {
+    const files = Array.from(event.target.files || selectedFiles);
+    selectedFiles = files.slice(0, 10);
+
+    const previewContainer = document.getElementById('imagePreview');
+
+    if (selectedFiles.length === 0) {
+        previewContainer.style.display = 'none';
+        return;
+    }
+
+    previewContainer.innerHTML = '';
+    previewContainer.style.display = 'grid';
+
+    selectedFiles.forEach((file, index) => {
+        const reader = new FileReader();
+        reader.onload = function(e) {
+            const preview = document.createElement('div');
+            preview.className = 'image-preview';
+            preview.innerHTML = `
+                <img src="${e.target.result}" alt="Preview ${index + 1}">
+                <button type="button" class="image-remove" onclick="removePreviewImage(${index})">×</button>
+            `;
+            previewContainer.appendChild(preview);
+        };
+        reader.readAsDataURL(file);
+    });
+}
+
+function removePreviewImage(index) {
+    selectedFiles.splice(index, 1);
+    const input = document.getElementById('imagenes');
+
+    const dt = new DataTransfer();
+    selectedFiles.forEach(file => dt.items.add(file));
+    input.files = dt.files;
+
+    previewImages({ target: input });
+}
+
+function removeExistingImage(imageIndex) {
+    if (confirm('¿Estás seguro de que quieres eliminar esta imagen?')) {
+        const trabajoId = JSON.parse(document.getElementById('trabajo-id').textContent);
+
+        fetch(`/jobs/admin/trabajo/${trabajoId}/imagen/${imageIndex}/eliminar/`, {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': getCSRFToken(),
+                'Content-Type': 'application/json'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                location.reload();
+            } else {
+                alert('Error al eliminar la imagen');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error de conexión');
+        });
+    }
+}
+
+// Validación del formulario
+document.getElementById('trabajoForm').addEventListener('submit', function(e) {
+    const titulo = document.getElementById('titulo').value.trim();
+    const categoria = document.getElementById('categoria').value;
+    const submitBtn = document.getElementById('submitBtn');
+
+    if (!titulo) {
+        e.preventDefault();
+        alert('❌ Por favor, ingresa un título para el trabajo');
+        document.getElementById('titulo').focus();
+        return;
+    }
+
+    if (titulo.length < 3) {
+        e.preventDefault();
+        alert('❌ El título debe tener al menos 3 caracteres');
+        document.getElementById('titulo').focus();
+        return;
+    }
+
+    if (titulo.length > 200) {
+        e.preventDefault();
+        alert('❌ El título no puede exceder los 200 caracteres');
+        document.getElementById('titulo').focus();
+        return;
+    }
+
+    if (!categoria) {
+        e.preventDefault();
+        alert('❌ Por favor, selecciona una categoría');
+        document.getElementById('categoria').focus();
+        return;
+    }
+
+    // Mostrar loading
+    submitBtn.innerHTML = '⏳ Guardando...';
+    submitBtn.disabled = true;
+});
+
+// Contador de caracteres para descripción
+const descripcionInput = document.getElementById('descripcion');
+const charCount = document.getElementById('charCount');
+
+function updateCharCount() {
+    const length = descripcionInput.value.length;
+    charCount.textContent = length;
+    if (length > 2000) {
+        charCount.style.color = '#ef4444';
+        charCount.style.fontWeight = 'bold';
+    } else if (length > 1800) {
+        charCount.style.color = '#f59e0b';
+        charCount.style.fontWeight = '600';
+    } else {
+        charCount.style.color = '#6b7280';
+        charCount.style.fontWeight = 'normal';
+    }
+}
+
+descripcionInput.addEventListener('input', updateCharCount);
+
+function getCSRFToken() {
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]');
+    return csrfToken ? csrfToken.value : '';
+}
@@ -0,0 +1,338 @@
+// Función para obtener el CSRF token de las cookies
+function getCSRFToken() {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, 10) === 'csrftoken=') {
+                cookieValue = decodeURIComponent(cookie.substring(10));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Crear partículas
+window.addEventListener('load', function() {
+    const particlesContainer = document.getElementById('particles');
+    for (let i = 0; i < 30; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+        particle.style.width = Math.random() * 100 + 50 + 'px';
+        particle.style.height = particle.style.width;
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 20 + 's';
+        particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+        particlesContainer.appendChild(particle);
+    }
+});
+
+// Toggle destacado
+async function toggleFeatured(trabajoId, currentlyFeatured) {
+    const newStatus = !currentlyFeatured;
+    const csrfToken = getCSRFToken();
+
+    if (!csrfToken) {
+        alert('Error: No se encontró el token CSRF. Por favor recarga la página.');
+        return;
+    }
+
+    try {
+        const response = await fetch(`/jobs/admin/trabajo/${trabajoId}/toggle-destacado/`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken
+            },
+            body: JSON.stringify({
+                destacar: newStatus
+            })
+        });
+
+        if (response.ok) {
+            location.reload();
+        } else {
+            const data = await response.json().catch(() => ({}));
+            alert('Error al actualizar el trabajo: ' + (data.error || 'Error desconocido'));
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        alert('Error de conexión al actualizar el trabajo');
+    }
+}
+
+// Confirmar eliminación
+function confirmDelete(trabajoId, trabajoTitle) {
+    if (confirm(`¿Estás seguro de que quieres eliminar el trabajo "${trabajoTitle}"? Esta acción no se puede deshacer.`)) {
+        const csrfToken = getCSRFToken();
+
+        if (!csrfToken) {
+            alert('Error: No se encontró el token CSRF. Por favor recarga la página.');
+            return;
+        }
+
+        const form = document.createElement('form');
+        form.method = 'POST';
+        form.action = `/jobs/admin/eliminar/${trabajoId}/`;
+
+        const csrfInput = document.createElement('input');
+        csrfInput.type = 'hidden';
+        csrfInput.name = 'csrfmiddlewaretoken';
+        csrfInput.value = csrfToken;
+
+        form.appendChild(csrfInput);
+        document.body.appendChild(form);
+        form.submit();
+    }
+}
+
+// Verificar estado de admin
+async function checkAdminStatus() {
+    try {
+        const response = await fetch('/auth/api/me/');
+        if (response.ok) {
+            const userData = await response.json();
+            const isAdmin = userData.is_admin === true;
+
+            if (!isAdmin) {
+                window.location.href = JSON.parse(document.getElementById('galeria-url').textContent);
+            }
+        } else {
+            // Si hay error de autenticación, podrías redirigir al login
+            console.warn('Error verificando autenticación');
+        }
+    } catch (error) {
+        console.error('Error verificando estado de admin:', error);
+    }
+}
+
+// Progreso de las subidas de imágenes en segundo plano
+const UPLOAD_STATES = {
+    pendiente: '⏳ En cola',
+    en_curso: '📤 Subiendo',
+    subida: '✅ Subida',
+    duplicada: '♻️ Ya estaba subida',
+    fallida: '❌ Fallida'
+};
+
+async function pollUploads() {
+    const data = document.getElementById('subidas-pendientes');
+    const panel = document.getElementById('uploadsPanel');
+    if (!data || !panel) {
+        return;
+    }
+
+    let pending = JSON.parse(data.textContent);
+    const render = (status) => {
+        let box = document.getElementById(`upload-${status.id}`);
+        if (!box) {
+            box = document.createElement('div');
+            box.id = `upload-${status.id}`;
+            box.className = 'upload-status';
+            panel.appendChild(box);
+        }
+        const done = status.estado !== 'pendiente';
+        box.classList.toggle('success', status.estado === 'completada');
+        box.classList.toggle('error', status.estado === 'con_errores');
+        box.classList.toggle('warning', !done);
+
+        const title = document.createElement('div');
+        title.textContent = `Imágenes: ${status.subidas}/${status.total} subidas` +
+            (status.duplicadas ? `, ${status.duplicadas} duplicadas` : '') +
+            (status.fallidas ? `, ${status.fallidas} fallidas` : '');
+        if (status.bytes_originales) {
+            const kb = (bytes) => `${Math.round(bytes / 1024)} KB`;
+            title.textContent += ` · ${kb(status.bytes_originales)} → ${kb(status.bytes_finales)}`;
+        }
+        const list = document.createElement('ul');
+        list.className = 'upload-files';
+        status.archivos.forEach(file => {
+            const item = document.createElement('li');
+            const retry = file.estado === 'pendiente' && file.intentos > 0 ? ` (reintento ${file.intentos})` : '';
+            item.textContent = `${UPLOAD_STATES[file.estado] || file.estado}${retry} · ${file.nombre}`;
+            list.appendChild(item);
+        });
+        box.replaceChildren(title, list);
+        return done;
+    };
+
+    while (pending.length > 0) {
+        const stillPending = [];
+        for (const id of pending) {
+            try {
+                const response = await fetch(`/jobs/admin/subidas/${id}/`);
+                if (!response.ok) {
+                    continue;
+                }
+                if (!render(await response.json())) {
+                    stillPending.push(id);
+                }
+            } catch (error) {
+                console.error('Error consultando subida:', error);
+                stillPending.push(id);
+            }
+        }
+        pending = stillPending;
+        if (pending.length > 0) {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+        }
+    }
+}
+
+// Acciones masivas sobre los trabajos seleccionados
+const BULK_LABELS = {
+    eliminar: 'eliminados',
+    destacar: 'destacados',
+    quitar_destacado: 'sin destacar',
+    categoria: 'cambiados de categoría'
+};
+
+function selectedWorks() {
+    return Array.from(document.querySelectorAll('.bulk-select:checked')).map(box => box.value);
+}
+
+function updateBulkBar() {
+    const selected = selectedWorks();
+    const action = document.getElementById('bulkAction');
+    document.getElementById('bulkCount').textContent = `${selected.length} seleccionados`;
+    document.getElementById('bulkApply').disabled = selected.length === 0 || !action.value;
+    document.getElementById('bulkCategory').hidden = action.value !== 'categoria';
+    document.querySelectorAll('.bulk-select').forEach(box => {
+        box.closest('.table-row').classList.toggle('selected', box.checked);
+    });
+}
+
+function applyBulkResult(action, result, categoryLabel) {
+    const row = document.querySelector(`.table-row[data-trabajo-id="${CSS.escape(result.id)}"]`);
+    if (!row) {
+        return;
+    }
+    if (action === 'eliminar') {
+        row.remove();
+        return;
+    }
+    row.querySelector('.bulk-select').checked = false;
+    if (action === 'categoria') {
+        row.querySelector('.work-category').textContent = categoryLabel;
+        row.querySelector('.row-category').textContent = categoryLabel;
+    } else {
+        const featured = action === 'destacar';
+        const badge = row.querySelector('.status-badge');
+        badge.textContent = featured ? 'Destacado' : 'Normal';
+        badge.classList.toggle('status-featured', featured);
+        badge.classList.toggle('status-normal', !featured);
+        const button = row.querySelector('.btn-featured');
+        button.textContent = featured ? '🌟' : '⭐';
+        button.onclick = () => toggleFeatured(result.id, featured);
+    }
+}
+
+function showBulkReport(data) {
+    const report = document.getElementById('bulkReport');
+    const box = document.createElement('div');
+    box.className = `message ${data.fallidos ? 'error' : 'success'}`;
+
+    const title = document.createElement('div');
+    title.textContent = `${data.correctos} de ${data.total} trabajos ${BULK_LABELS[data.accion]}`;
+    box.appendChild(title);
+
+    const failed = data.resultados.filter(result => !result.ok);
+    if (failed.length > 0) {
+        const list = document.createElement('ul');
+        list.className = 'upload-files';
+        failed.forEach(result => {
+            const item = document.createElement('li');
+            item.textContent = `❌ ${result.id}: ${result.error}`;
+            list.appendChild(item);
+        });
+        box.appendChild(list);
+    }
+    report.replaceChildren(box);
+}
+
+async function applyBulkAction() {
+    const ids = selectedWorks();
+    const action = document.getElementById('bulkAction').value;
+    const categorySelect = document.getElementById('bulkCategory');
+    if (ids.length === 0 || !action) {
+        return;
+    }
+    if (action === 'eliminar' &&
+        !confirm(`¿Estás seguro de que quieres eliminar ${ids.length} trabajos? Esta acción no se puede deshacer.`)) {
+        return;
+    }
+
+    const csrfToken = getCSRFToken();
+    if (!csrfToken) {
+        alert('Error: No se encontró el token CSRF. Por favor recarga la página.');
+        return;
+    }
+
+    const button = document.getElementById('bulkApply');
+    button.disabled = true;
+    try {
+        const response = await fetch('/jobs/admin/masivo/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken
+            },
+            body: JSON.stringify({
+                accion: action,
+                ids: ids,
+                categoria: action === 'categoria' ? categorySelect.value : ''
+            })
+        });
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            alert('Error en la operación masiva: ' + (data.error || 'Error desconocido'));
+            return;
+        }
+
+        const categoryLabel = categorySelect.selectedOptions.length ? categorySelect.selectedOptions[0].textContent : '';
+        data.resultados.filter(result => result.ok).forEach(result => applyBulkResult(action, result, categoryLabel));
+        showBulkReport(data);
+    } catch (error) {
+        console.error('Error:', error);
+        alert('Error de conexión en la operación masiva');
+    } finally {
+        updateBulkBar();
+    }
+}
+
+function initBulkActions() {
+    const selectAll = document.getElementById('bulkSelectAll');
+    if (!selectAll) {
+        return;
+    }
+    selectAll.addEventListener('change', () => {
+        document.querySelectorAll('.bulk-select').forEach(box => {
+            box.checked = selectAll.checked;
+        });
+        updateBulkBar();
+    });
+    document.querySelectorAll('.bulk-select').forEach(box => box.addEventListener('change', updateBulkBar));
+    document.getElementById('bulkAction').addEventListener('change', updateBulkBar);
+    document.getElementById('bulkApply').addEventListener('click', applyBulkAction);
+    updateBulkBar();
+}
+
+// Ejecutar cuando cargue la página
+document.addEventListener('DOMContentLoaded', function() {
+    checkAdminStatus();
+    pollUploads();
+    initBulkActions();
+
+    // Auto-ocultar mensajes después de 5 segundos
+    const messages = document.querySelectorAll('.message');
+    messages.forEach(msg => {
+        setTimeout(() => {
+            msg.style.opacity = '0';
+            msg.style.transition = 'opacity 0.3s ease';
+            setTimeout(() => msg.remove(), 300);
+        }, 5000);
+    });
+});
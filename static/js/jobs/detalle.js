@@ -0,0 +1,145 @@
+// Crear partículas
+window.addEventListener('load', async function() {
+    await checkAdminStatus();
+    const particlesContainer = document.getElementById('particles');
+    for (let i = 0; i < 30; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+        particle.style.width = Math.random() * 100 + 50 + 'px';
+        particle.style.height = particle.style.width;
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 20 + 's';
+        particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+        particlesContainer.appendChild(particle);
+    }
+});
+
+// Galería de imágenes
+let currentImageIndex = 0;
+const images = JSON.parse(document.getElementById('trabajo-imagenes').textContent) || [];
+
+function showImage(index) {
+    if (index >= 0 && index < images.length) {
+        currentImageIndex = index;
+        document.getElementById('mainImage').src = `data:image/jpeg;base64,${images[index]}`;
+        document.getElementById('currentImage').textContent = index + 1;
+
+        // Actualizar thumbnails activos
+        document.querySelectorAll('.thumbnail').forEach((thumb, i) => {
+            thumb.classList.toggle('active', i === index);
+        });
+    }
+}
+
+function changeImage(direction) {
+    let newIndex = currentImageIndex + direction;
+    if (newIndex < 0) newIndex = images.length - 1;
+    if (newIndex >= images.length) newIndex = 0;
+    showImage(newIndex);
+}
+
+// Visor de imagen completa
+function openImageViewer() {
+    if (images.length > 0) {
+        const viewer = document.getElementById('imageViewer');
+        const viewerImg = document.getElementById('viewerImage');
+
+        viewerImg.src = `data:image/jpeg;base64,${images[currentImageIndex]}`;
+        viewerImg.alt = JSON.parse(document.getElementById('trabajo-titulo').textContent);
+        viewerImg.classList.remove('zoomed');
+
+        if (document.getElementById('viewerCurrentImage')) {
+            document.getElementById('viewerCurrentImage').textContent = currentImageIndex + 1;
+        }
+
+        viewer.style.display = 'block';
+        document.body.style.overflow = 'hidden';
+    }
+}
+
+function closeImageViewer(event) {
+    if (event) {
+        event.stopPropagation();
+    }
+    const viewer = document.getElementById('imageViewer');
+    const viewerImg = document.getElementById('viewerImage');
+    viewerImg.classList.remove('zoomed');
+    viewer.style.display = 'none';
+    document.body.style.overflow = 'auto';
+}
+
+function toggleZoom(event) {
+    event.stopPropagation();
+    const img = event.target;
+    img.classList.toggle('zoomed');
+}
+
+function changeViewerImage(event, direction) {
+    event.stopPropagation();
+
+    let newIndex = currentImageIndex + direction;
+    if (newIndex < 0) newIndex = images.length - 1;
+    if (newIndex >= images.length) newIndex = 0;
+
+    currentImageIndex = newIndex;
+
+    const viewerImg = document.getElementById('viewerImage');
+    viewerImg.src = `data:image/jpeg;base64,${images[currentImageIndex]}`;
+    viewerImg.classList.remove('zoomed');
+
+    if (document.getElementById('viewerCurrentImage')) {
+        document.getElementById('viewerCurrentImage').textContent = currentImageIndex + 1;
+    }
+
+    // Actualizar también la imagen principal y thumbnails
+    document.getElementById('mainImage').src = `data:image/jpeg;base64,${images[currentImageIndex]}`;
+    document.getElementById('currentImage').textContent = currentImageIndex + 1;
+
+    document.querySelectorAll('.thumbnail').forEach((thumb, i) => {
+        thumb.classList.toggle('active', i === currentImageIndex);
+    });
+}
+
+// Navegación con teclado
+document.addEventListener('keydown', function(e) {
+    const viewer = document.getElementById('imageViewer');
+    const isViewerOpen = viewer.style.display === 'block';
+
+    if (images.length > 1) {
+        if (e.key === 'ArrowLeft') {
+            if (isViewerOpen) {
+                changeViewerImage(e, -1);
+            } else {
+                changeImage(-1);
+            }
+        }
+        if (e.key === 'ArrowRight') {
+            if (isViewerOpen) {
+                changeViewerImage(e, 1);
+            } else {
+                changeImage(1);
+            }
+        }
+    }
+
+    if (e.key === 'Escape' && isViewerOpen) {
+        closeImageViewer(e);
+    }
+});
+
+async function checkAdminStatus() {
+    try {
+        const response = await fetch('/auth/api/me/');
+        if (response.ok) {
+            const userData = await response.json();
+            const isAdmin = userData.is_admin === true;
+
+            if (isAdmin) {
+                document.getElementById('adminBadge').style.display = 'inline-flex';
+            }
+        }
+    } catch (error) {
+        console.error('Error verificando estado de admin:', error);
+    }
+}
@@ -0,0 +1,50 @@
+// Crear partículas
+window.addEventListener('load', async function() {
+    await checkAdminStatus();
+    const particlesContainer = document.getElementById('particles');
+    for (let i = 0; i < 30; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+        particle.style.width = Math.random() * 100 + 50 + 'px';
+        particle.style.height = particle.style.width;
+        particle.style.left = Math.random() * 100 + '%';
+        particle.style.top = Math.random() * 100 + '%';
+        particle.style.animationDelay = Math.random() * 20 + 's';
+        particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+        particlesContainer.appendChild(particle);
+    }
+});
+
+function resetFilters() {
+    window.location.href = JSON.parse(document.getElementById('galeria-url').textContent);
+}
+
+// Auto-submit al cambiar categoría si hay otros filtros activos
+document.querySelector('select[name="categoria"]').addEventListener('change', function() {
+    if (this.value || document.querySelector('input[name="search"]').value) {
+        document.getElementById('filterForm').submit();
+    }
+});
+
+async function checkAdminStatus() {
+    try {
+        let userData = bootstrapUser();
+        if (userData === undefined) {
+            const response = await fetch('/auth/api/me/');
+            userData = response.ok ? await response.json() : null;
+        }
+        if (userData) {
+            const isAdmin = userData.is_admin === true;
+
+            if (isAdmin) {
+                document.getElementById('adminBadge').style.display = 'inline-flex';
+                const adminJobsBtn = document.getElementById('adminJobsBtn');
+                if (adminJobsBtn) {
+                    adminJobsBtn.style.display = 'inline-flex';
+                }
+            }
+        }
+    } catch (error) {
+        console.error('Error verificando estado de admin:', error);
+    }
+}
@@ -0,0 +1,556 @@
+let allProducts = [];
+let isAdmin = false;
+let editingProductId = null;
+let viewingProductId = null;
+let selectedFiles = [];
+let currentImages = [];
+let currentImageIndex = 0;
+// Peticiones en curso: una nueva búsqueda o detalle cancela la anterior
+let productsController = null;
+let detailController = null;
+
+window.addEventListener('load', async function() {
+    await checkAdminStatus();
+    await loadProducts();
+    createParticles();
+
+
+    document.getElementById('searchInput').addEventListener('input', function(e) {
+        if (e.target.value.length > 2 || e.target.value.length === 0) {
+            searchProducts();
+        }
+    });
+
+    document.getElementById('searchInput').addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            searchProducts();
+        }
+    });
+
+    document.getElementById('productForm').addEventListener('submit', handleFormSubmit);
+});
+
+function createParticles() {
+        const particlesContainer = document.getElementById('particles');
+        for (let i = 0; i < 30; i++) {
+            const particle = document.createElement('div');
+            particle.className = 'particle';
+            particle.style.width = Math.random() * 100 + 50 + 'px';
+            particle.style.height = particle.style.width;
+            particle.style.left = Math.random() * 100 + '%';
+            particle.style.top = Math.random() * 100 + '%';
+            particle.style.animationDelay = Math.random() * 20 + 's';
+            particle.style.animationDuration = (Math.random() * 10 + 15) + 's';
+            particlesContainer.appendChild(particle);
+        }
+    }
+
+async function checkAdminStatus() {
+    try {
+        let userData = bootstrapUser();
+        if (userData === undefined) {
+            const response = await fetch('/auth/api/me/');
+            userData = response.ok ? await response.json() : null;
+        }
+        if (userData) {
+            isAdmin = userData.is_admin === true;
+
+            if (isAdmin) {
+                document.getElementById('adminBadge').style.display = 'inline-flex';
+                document.getElementById('btnCreateProduct').style.display = 'inline-flex';
+            }
+        }
+    } catch (error) {
+        console.error('Error verificando estado de admin:', error);
+    }
+}
+
+// fresco: tras crear, editar o borrar; ni el service worker ni la caché HTTP deben dar la copia vieja
+async function loadProducts(fresco = false) {
+    if (productsController) {
+        productsController.abort();
+    }
+    const controller = new AbortController();
+    productsController = controller;
+
+    try {
+        const availableOnly = document.getElementById('availableOnly').checked;
+        const searchTerm = document.getElementById('searchInput').value;
+
+        // Primera carga: el servidor ya incrustó los productos en la página
+        const initialProducts = takeBootstrap('products');
+        if (initialProducts !== undefined && !availableOnly && !searchTerm) {
+            allProducts = initialProducts;
+            renderProducts(allProducts);
+            updateStats(allProducts);
+            return;
+        }
+
+        let url = '/products/api/?limit=100';
+
+        if (availableOnly) {
+            url += '&available_only=true';
+        }
+
+        if (searchTerm) {
+            url += '&search=' + encodeURIComponent(searchTerm);
+        }
+
+        const response = await fetch(url, {
+            signal: controller.signal,
+            cache: fresco ? 'no-store' : 'default',
+        });
+
+        if (!response.ok) {
+            throw new Error('Error al cargar productos');
+        }
+
+        allProducts = await response.json();
+        renderProducts(allProducts);
+        updateStats(allProducts);
+
+    } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
+        console.error('Error:', error);
+        showMessage('Error al cargar los productos. Por favor, intenta de nuevo.', 'error');
+        document.getElementById('productsContainer').innerHTML = `
+            <div class="empty-state">
+                <h3>Error al cargar productos</h3>
+                <p>No se pudo conectar con el servidor</p>
+            </div>
+        `;
+    }
+}
+
+function searchProducts() {
+    loadProducts();
+}
+
+function clearSearch() {
+    document.getElementById('searchInput').value = '';
+    document.getElementById('availableOnly').checked = false;
+    loadProducts();
+}
+
+function renderProducts(products) {
+    const container = document.getElementById('productsContainer');
+
+    if (!products || products.length === 0) {
+        container.innerHTML = `
+            <div class="empty-state">
+                <h3>No se encontraron productos</h3>
+                <p>Intenta ajustar los filtros de búsqueda</p>
+            </div>
+        `;
+        return;
+    }
+
+    container.innerHTML = products.map(product => {
+        const stockStatus = getStockStatus(product.cantidad_disponible);
+        const imageUrl = product.imagenes && product.imagenes.length > 0 
+            ? `data:image/jpeg;base64,${product.imagenes[0]}` 
+            : '';
+
+        const adminActions = isAdmin ? `
+            <div class="admin-actions">
+                <button class="btn btn-primary btn-small" onclick="event.stopPropagation(); openEditModal('${product.id}')">
+                    Editar
+                </button>
+                <button class="btn btn-danger btn-small" onclick="event.stopPropagation(); confirmDelete('${product.id}', '${product.nombre.replace(/'/g, "\\'")}')">
+                    Eliminar
+                </button>
+            </div>
+        ` : '';
+
+        return `
+            <div class="product-card" onclick="openDetailModal('${product.id}')">
+                ${imageUrl ? `<img src="${imageUrl}" alt="${product.nombre}" class="product-image">` : '<div class="product-image"></div>'}
+                <div class="product-header">
+                    <div>
+                        <div class="product-name">${product.nombre}</div>
+                        <div class="product-id">ID: ${product.id}</div>
+                    </div>
+                    <span class="stock-badge ${stockStatus.class}">${stockStatus.text}</span>
+                </div>
+
+                <div class="product-info">
+                    <div class="info-row">
+                        <span class="info-label">Precio</span>
+                        <span class="info-value price-value">${product.precio.toFixed(2)}</span>
+                    </div>
+                    <div class="info-row">
+                        <span class="info-label">Stock disponible</span>
+                        <span class="info-value">${product.cantidad_disponible} unidades</span>
+                    </div>
+                </div>
+                ${adminActions}
+            </div>
+        `;
+    }).join('');
+}
+
+async function openDetailModal(productId) {
+    if (detailController) {
+        detailController.abort();
+    }
+    const controller = new AbortController();
+    detailController = controller;
+
+    try {
+        viewingProductId = productId;
+        const response = await fetch(`/products/api/${productId}/`, { signal: controller.signal });
+
+        if (!response.ok) {
+            throw new Error('Error al cargar detalles del producto');
+        }
+
+        const product = await response.json();
+
+        document.getElementById('detailName').textContent = product.nombre;
+        document.getElementById('detailDescription').textContent = product.descripcion || 'Sin descripción';
+        document.getElementById('detailPrice').textContent = `${product.precio.toFixed(2)}`;
+        document.getElementById('detailStock').textContent = `${product.cantidad_disponible} unidades`;
+
+        const stockStatus = getStockStatus(product.cantidad_disponible);
+        document.getElementById('detailStatus').innerHTML = `<span class="stock-badge ${stockStatus.class}">${stockStatus.text}</span>`;
+
+        const imageUrl = product.imagenes && product.imagenes.length > 0 
+            ? `data:image/jpeg;base64,${product.imagenes[0]}` 
+            : '';
+        document.getElementById('detailImage').src = imageUrl;
+        document.getElementById('detailImage').alt = product.nombre;
+
+        if (isAdmin) {
+            document.getElementById('detailAdminActions').style.display = 'block';
+        }
+
+        document.getElementById('detailModal').style.display = 'block';
+
+    } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
+        console.error('Error:', error);
+        showMessage('Error al cargar los detalles del producto', 'error');
+    }
+}
+
+function closeDetailModal() {
+    if (detailController) {
+        detailController.abort();
+    }
+    document.getElementById('detailModal').style.display = 'none';
+    viewingProductId = null;
+}
+
+function previewImages(event) {
+    const files = Array.from(event.target.files);
+    selectedFiles = files.slice(0, 5); // Máximo 5 imágenes
+
+    console.log('Archivos seleccionados en preview:', selectedFiles.length);
+
+    if (selectedFiles.length === 0) {
+        document.getElementById('imagePreview').style.display = 'none';
+        return;
+    }
+
+    const previewGrid = document.getElementById('previewGrid');
+    previewGrid.innerHTML = '';
+    document.getElementById('imagePreview').style.display = 'block';
+
+    selectedFiles.forEach((file, index) => {
+        const reader = new FileReader();
+        reader.onload = function(e) {
+            const container = document.createElement('div');
+            container.className = 'preview-img-container';
+            container.innerHTML = `
+                <img src="${e.target.result}" alt="Preview ${index + 1}">
+                <button class="preview-img-remove" onclick="removePreviewImage(${index})" type="button">&times;</button>
+            `;
+            previewGrid.appendChild(container);
+        };
+        reader.readAsDataURL(file);
+    });
+}
+
+function removePreviewImage(index) {
+    selectedFiles.splice(index, 1);
+    const input = document.getElementById('productImage');
+
+    // Recrear el evento para actualizar el preview
+    const dt = new DataTransfer();
+    selectedFiles.forEach(file => dt.items.add(file));
+    input.files = dt.files;
+
+    previewImages({ target: input });
+}
+
+function openZoom() {
+    const mainImage = document.getElementById('detailImage');
+    if (mainImage.src) {
+        document.getElementById('zoomImage').src = mainImage.src;
+        document.getElementById('zoomOverlay').style.display = 'block';
+        document.body.style.overflow = 'hidden';
+    }
+}
+
+function closeZoom() {
+    document.getElementById('zoomOverlay').style.display = 'none';
+    document.body.style.overflow = 'auto';
+}
+
+function editFromDetail() {
+    closeDetailModal();
+    openEditModal(viewingProductId);
+}
+
+function deleteFromDetail() {
+    const productName = document.getElementById('detailName').textContent;
+    closeDetailModal();
+    confirmDelete(viewingProductId, productName);
+}
+
+function openCreateModal() {
+    editingProductId = null;
+    document.getElementById('modalTitle').textContent = 'Nuevo Producto';
+    document.getElementById('productForm').reset();
+    document.getElementById('productModal').style.display = 'block';
+}
+
+function openEditModal(productId) {
+    editingProductId = productId;
+    const product = allProducts.find(p => p.id === productId);
+
+    if (product) {
+        document.getElementById('modalTitle').textContent = 'Editar Producto';
+        document.getElementById('productName').value = product.nombre;
+        document.getElementById('productDescription').value = product.descripcion || '';
+        document.getElementById('productPrice').value = product.precio;
+        document.getElementById('productStock').value = product.cantidad_disponible;
+        document.getElementById('productModal').style.display = 'block';
+    }
+}
+
+function closeProductModal() {
+    document.getElementById('productModal').style.display = 'none';
+    document.getElementById('productForm').reset();
+    document.getElementById('imagePreview').style.display = 'none';
+    document.getElementById('previewGrid').innerHTML = '';
+    selectedFiles = [];
+    editingProductId = null;
+}
+
+async function handleFormSubmit(e) {
+    e.preventDefault();
+
+    const formData = {
+        nombre: document.getElementById('productName').value,
+        descripcion: document.getElementById('productDescription').value || null,
+        precio: parseFloat(document.getElementById('productPrice').value),
+        cantidad_disponible: parseInt(document.getElementById('productStock').value)
+    };
+
+    console.log('Archivos seleccionados:', selectedFiles.length);
+
+    try {
+        let url, method;
+
+        if (editingProductId) {
+            url = `/products/api/${editingProductId}/update/`;
+            method = 'PUT';
+        } else {
+            url = '/products/api/create/';
+            method = 'POST';
+        }
+
+        const response = await fetch(url, {
+            method: method,
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: JSON.stringify(formData)
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            const productId = data.id;
+            console.log('Producto guardado, ID:', productId);
+
+            // Si hay imágenes seleccionadas, subirlas
+            if (selectedFiles && selectedFiles.length > 0) {
+                console.log('Subiendo', selectedFiles.length, 'imágenes...');
+                try {
+                    await uploadImages(productId);
+                    showMessage(
+                        editingProductId ? 'Producto e imágenes actualizados exitosamente' : 'Producto e imágenes creados exitosamente',
+                        'success'
+                    );
+                } catch (imgError) {
+                    console.error('Error subiendo imágenes:', imgError);
+                    showMessage(
+                        'Producto guardado pero hubo un error al subir las imágenes: ' + imgError.message,
+                        'error'
+                    );
+                }
+            } else {
+                showMessage(
+                    editingProductId ? 'Producto actualizado exitosamente' : 'Producto creado exitosamente',
+                    'success'
+                );
+            }
+
+            closeProductModal();
+            await loadProducts(true);
+        } else {
+            showMessage(data.detail || 'Error al guardar el producto', 'error');
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        showMessage('Error de conexión con el servidor', 'error');
+    }
+}
+
+async function uploadImages(productId) {
+    if (!selectedFiles || selectedFiles.length === 0) {
+        console.log('No hay archivos para subir');
+        return;
+    }
+
+    console.log('Preparando FormData con', selectedFiles.length, 'archivos');
+
+    try {
+        const formData = new FormData();
+        selectedFiles.forEach((file, index) => {
+            console.log(`Agregando archivo ${index}:`, file.name, file.type, file.size);
+            formData.append('images', file);
+        });
+
+        console.log('Enviando petición a:', `/products/api/${productId}/upload-images/`);
+
+        const response = await fetch(`/products/api/${productId}/upload-images/`, {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': getCSRFToken()
+            },
+            body: formData
+        });
+
+        console.log('Respuesta del servidor:', response.status);
+
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Error al subir imágenes');
+        }
+
+        const result = await response.json();
+        console.log('Imágenes subidas exitosamente:', result);
+
+    } catch (error) {
+        console.error('Error en uploadImages:', error);
+        throw error;
+    }
+}
+
+function confirmDelete(productId, productName) {
+    if (confirm(`¿Estás seguro de que deseas eliminar "${productName}"?`)) {
+        deleteProduct(productId);
+    }
+}
+
+async function deleteProduct(productId) {
+    try {
+        const response = await fetch(`/products/api/${productId}/delete/`, {
+            method: 'DELETE',
+            headers: {
+                'X-CSRFToken': getCSRFToken()
+            }
+        });
+
+        if (response.ok) {
+            showMessage('Producto eliminado exitosamente', 'success');
+            await loadProducts(true);
+        } else {
+            const data = await response.json();
+            showMessage(data.detail || 'Error al eliminar el producto', 'error');
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        showMessage('Error de conexión con el servidor', 'error');
+    }
+}
+
+function getStockStatus(cantidad) {
+    if (cantidad === 0) {
+        return { class: 'stock-out', text: 'Sin stock' };
+    } else if (cantidad <= 5) {
+        return { class: 'stock-low', text: 'Stock bajo' };
+    } else {
+        return { class: 'stock-available', text: 'Disponible' };
+    }
+}
+
+function updateStats(products) {
+    const total = products.length;
+    const available = products.filter(p => p.cantidad_disponible > 0).length;
+    const outOfStock = products.filter(p => p.cantidad_disponible === 0).length;
+
+    document.getElementById('totalProducts').textContent = total;
+    document.getElementById('availableProducts').textContent = available;
+    document.getElementById('outOfStock').textContent = outOfStock;
+}
+
+function formatDate(dateString) {
+    const date = new Date(dateString);
+    return date.toLocaleDateString('es-ES', { 
+        year: 'numeric', 
+        month: 'short', 
+        day: 'numeric' 
+    });
+}
+
+function showMessage(text, type) {
+    const messageDiv = document.getElementById('message');
+    messageDiv.textContent = text;
+    messageDiv.className = `message ${type}`;
+    messageDiv.style.display = 'block';
+
+    setTimeout(() => {
+        messageDiv.style.display = 'none';
+    }, 5000);
+}
+
+function getCSRFToken() {
+    let csrfToken = document.querySelector('[name=csrfmiddlewaretoken]');
+    if (csrfToken) {
+        return csrfToken.value;
+    }
+
+    const name = 'csrftoken';
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue || '';
+}
+
+window.onclick = function(event) {
+    const productModal = document.getElementById('productModal');
+    const detailModal = document.getElementById('detailModal');
+    if (event.target === productModal) {
+        closeProductModal();
+    }
+    if (event.target === detailModal) {
+        closeDetailModal();
+    }
+}
@@ -0,0 +1,8 @@
+// Registra el service worker (ver estetica_frontend/service_worker.py)
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register('/sw.js').catch(function(error) {
+            console.warn('No se pudo registrar el service worker:', error);
+        });
+    });
+}
@@ -0,0 +1,138 @@
+// Generado por estetica_frontend/service_worker.py; no se sirve desde /static/
+const MANIFEST = {{ manifest_json|safe }};
+const ACTIVO = {{ activo|yesno:"true,false" }};
+
+const PREFIJO = 'estetica-';
+const CACHES = {
+    estaticos: `${PREFIJO}estaticos-${MANIFEST.version}`,
+    imagenes: `${PREFIJO}imagenes-${MANIFEST.version}`,
+    datos: `${PREFIJO}datos-${MANIFEST.version}`,
+};
+
+async function borrarCaches(conservar) {
+    const nombres = await caches.keys();
+    await Promise.all(
+        nombres
+            .filter(nombre => nombre.startsWith(PREFIJO) && !conservar.includes(nombre))
+            .map(nombre => caches.delete(nombre))
+    );
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        if (ACTIVO) {
+            const cache = await caches.open(CACHES.estaticos);
+            await cache.addAll(MANIFEST.precache);
+        }
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        if (!ACTIVO) {
+            await borrarCaches([]);
+            await self.registration.unregister();
+            return;
+        }
+        // Despliegue nuevo: fuera las cachés de versiones anteriores
+        await borrarCaches(Object.values(CACHES));
+        await self.clients.claim();
+    })());
+});
+
+// Lo que depende de la sesión (Vary: Cookie) o pide no guardarse no entra en caché
+function esCacheable(response) {
+    if (!response || !response.ok || response.type !== 'basic') {
+        return false;
+    }
+    const vary = (response.headers.get('Vary') || '').toLowerCase();
+    const control = (response.headers.get('Cache-Control') || '').toLowerCase();
+    return !vary.includes('cookie') && !control.includes('no-store') && !control.includes('private');
+}
+
+// Límite de entradas: se borran las más antiguas (keys() respeta el orden de inserción)
+async function recortar(cache, maximo) {
+    const claves = await cache.keys();
+    const sobrantes = claves.length - maximo;
+    for (let i = 0; i < sobrantes; i++) {
+        await cache.delete(claves[i]);
+    }
+}
+
+async function guardar(nombre, maximo, request, response) {
+    const cache = await caches.open(nombre);
+    await cache.put(request, response);
+    await recortar(cache, maximo);
+}
+
+async function cacheFirst(event, nombre, maximo) {
+    const guardada = await caches.match(event.request);
+    if (guardada) {
+        return guardada;
+    }
+    const response = await fetch(event.request);
+    if (esCacheable(response)) {
+        event.waitUntil(guardar(nombre, maximo, event.request, response.clone()));
+    }
+    return response;
+}
+
+// La página pidió explícitamente datos frescos: red y se actualiza la copia guardada
+async function redYActualizar(event, nombre, maximo) {
+    const response = await fetch(event.request);
+    if (esCacheable(response)) {
+        event.waitUntil(guardar(nombre, maximo, event.request, response.clone()));
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, nombre, maximo) {
+    const cache = await caches.open(nombre);
+    const guardada = await cache.match(event.request);
+    const red = fetch(event.request).then(response => {
+        if (esCacheable(response)) {
+            event.waitUntil(guardar(nombre, maximo, event.request, response.clone()));
+        }
+        return response;
+    });
+    if (guardada) {
+        // La copia guardada ya, la de la red para la próxima visita
+        event.waitUntil(red.catch(() => undefined));
+        return guardada;
+    }
+    return red;
+}
+
+self.addEventListener('fetch', event => {
+    if (!ACTIVO) {
+        return;
+    }
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) {
+        return;
+    }
+    const ruta = url.pathname;
+    if (MANIFEST.excluir.some(prefijo => ruta.startsWith(prefijo))) {
+        return;
+    }
+
+    if (request.destination === 'image') {
+        event.respondWith(cacheFirst(event, CACHES.imagenes, MANIFEST.max_entradas.imagenes));
+    } else if (ruta.startsWith(MANIFEST.static_url)) {
+        event.respondWith(cacheFirst(event, CACHES.estaticos, MANIFEST.max_entradas.estaticos));
+    } else if (
+        MANIFEST.stale_while_revalidate.some(prefijo => ruta.startsWith(prefijo))
+        || MANIFEST.stale_while_revalidate_exactas.includes(ruta)
+    ) {
+        if (request.cache === 'no-store' || request.cache === 'reload') {
+            event.respondWith(redYActualizar(event, CACHES.datos, MANIFEST.max_entradas.datos));
+        } else {
+            event.respondWith(staleWhileRevalidate(event, CACHES.datos, MANIFEST.max_entradas.datos));
+        }
+    }
+});